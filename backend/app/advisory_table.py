@@ -0,0 +1,61 @@
+"""
+Flight Track API - Advisory Table Module
+
+This module compiles the travel advisory data into a read-only lookup table once per
+data version, with normalized country keys and advisory severities as small integers.
+
+Key Features:
+- Keys normalized to lowercase ISO alpha-2 codes
+- Severity levels from 0 (no advisory) to 3 (against all travel); -1 when unknown
+- Entries built once and shared read-only between requests
+
+Core Classes:
+- AdvisoryTable: Read-only ISO code → advisory lookup
+"""
+
+from typing import Iterable, Optional
+
+SEVERITY_LEVELS = {
+    "No advisory": 0,
+    "Advisory against travel to certain areas": 1,
+    "Advisory against non-essential travel": 2,
+    "Advisory against all travel": 3,
+}
+UNKNOWN_LEVEL = -1
+
+
+def normalize_code(country_code) -> str:
+    return country_code.strip().lower()
+
+
+class AdvisoryTable:
+    """
+    Read-only advisory lookup keyed by normalized ISO code. Entries must not be mutated.
+    """
+
+    def __init__(self, data: dict):
+        self._entries = {}
+        for country_code, advisory in data.items():
+            entry = dict(advisory)
+            entry["level"] = SEVERITY_LEVELS.get(advisory.get("advice"), UNKNOWN_LEVEL)
+            self._entries[normalize_code(country_code)] = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, country_code):
+        return bool(country_code) and normalize_code(country_code) in self._entries
+
+    def get(self, country_code) -> Optional[dict]:
+        if not country_code:
+            return None
+        return self._entries.get(normalize_code(country_code))
+
+    def subset(self, country_codes: Optional[Iterable[str]] = None) -> dict:
+        """
+        Return {code: advisory} for the given codes (all when None), skipping unknown codes.
+        """
+        if country_codes is None:
+            return dict(self._entries)
+        codes = dict.fromkeys(normalize_code(code) for code in country_codes)
+        return {code: self._entries[code] for code in codes if code in self._entries}
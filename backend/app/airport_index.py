@@ -0,0 +1,162 @@
+"""
+Flight Track API - Airport Spatial Index Module
+
+This module answers geographic queries over airport coordinates (nearest airports, all
+airports within a radius, grouping by area) without looping over every airport in Python.
+
+Key Features:
+- Coordinates bucketed once into a fixed latitude/longitude grid, stored cell by cell in
+  contiguous NumPy arrays, so a cell's airports are one slice
+- Radius queries read only the cells overlapping the circle's bounding box, handling the
+  antimeridian and circles that contain a pole
+- k-nearest queries widen the search radius until k airports are inside it
+- Vectorized haversine great-circle distances in kilometres
+
+Core Classes:
+- AirportIndex: Grid index over IATA codes and coordinates
+
+Core Functions:
+- haversine_km: Great-circle distance between coordinate arrays
+"""
+
+import math
+from typing import Iterable, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+CELL_DEGREES = 2.0
+NEAREST_START_KM = 250.0
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """
+    Great-circle distance in km from (latitude, longitude) to each point, all in degrees.
+    """
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class AirportIndex:
+    """
+    Grid index over airports; query results are positions into codes/latitudes/longitudes.
+    """
+
+    def __init__(self, points: Iterable[Tuple[str, float, float]], cell_degrees=CELL_DEGREES):
+        points = [(code, latitude, longitude) for code, latitude, longitude in points
+                  if latitude is not None and longitude is not None]
+        codes = np.array([code for code, _, _ in points], dtype=object)
+        latitudes = np.array([latitude for _, latitude, _ in points], dtype=np.float64)
+        longitudes = np.array([longitude for _, _, longitude in points], dtype=np.float64)
+
+        self.cell_degrees = cell_degrees
+        self.rows = math.ceil(180 / cell_degrees)
+        self.columns = math.ceil(360 / cell_degrees)
+        cells = self._row(latitudes) * self.columns + self._column(longitudes)
+
+        # Stored in cell order: cell c holds positions cell_starts[c]:cell_starts[c + 1]
+        order = np.argsort(cells, kind="stable")
+        self.codes = codes[order]
+        self.latitudes = latitudes[order]
+        self.longitudes = longitudes[order]
+        self.cell_starts = np.searchsorted(cells[order], np.arange(self.rows * self.columns + 1)).tolist()
+        self._lat_radians = np.radians(self.latitudes)
+        self._lon_radians = np.radians(self.longitudes)
+        self._cos_lat = np.cos(self._lat_radians)
+
+    @classmethod
+    def from_airports(cls, airports, cell_degrees=CELL_DEGREES):
+        return cls(((airport.iata, airport.latitude, airport.longitude) for airport in airports), cell_degrees)
+
+    def __len__(self):
+        return self.codes.shape[0]
+
+    def _row(self, latitudes):
+        return np.clip(((np.asarray(latitudes) + 90) // self.cell_degrees).astype(np.int64), 0, self.rows - 1)
+
+    def _column(self, longitudes):
+        return np.clip(((np.asarray(longitudes) + 180) // self.cell_degrees).astype(np.int64), 0, self.columns - 1)
+
+    def _row_of(self, latitude):
+        return min(max(int((latitude + 90) // self.cell_degrees), 0), self.rows - 1)
+
+    def _column_of(self, longitude):
+        return min(max(int((longitude + 180) // self.cell_degrees), 0), self.columns - 1)
+
+    def _distances(self, latitude, longitude, positions):
+        # haversine_km with the airports' radians and cosines precomputed
+        lat, lon = math.radians(latitude), math.radians(longitude)
+        a = (np.sin((self._lat_radians[positions] - lat) / 2) ** 2
+             + math.cos(lat) * self._cos_lat[positions] * np.sin((self._lon_radians[positions] - lon) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def _candidates(self, latitude, longitude, radius_km) -> np.ndarray:
+        angle = radius_km / EARTH_RADIUS_KM
+        if angle >= math.pi:
+            return np.arange(len(self))
+
+        # Bounding box of the spherical cap; it spans all longitudes when it contains a pole
+        lat_lo, lat_hi = latitude - math.degrees(angle), latitude + math.degrees(angle)
+        spread = math.sin(angle) / math.cos(math.radians(latitude)) if abs(latitude) < 90 else 2.0
+        if lat_lo <= -90 or lat_hi >= 90 or spread >= 1:
+            column_ranges = [(0, self.columns - 1)]
+        else:
+            delta = math.degrees(math.asin(spread))
+            first, last = self._column_of(longitude - delta), self._column_of(longitude + delta)
+            if longitude - delta < -180:
+                first = self._column_of(longitude - delta + 360)
+            if longitude + delta >= 180:
+                last = self._column_of(longitude + delta - 360)
+            column_ranges = [(first, last)] if first <= last else [(first, self.columns - 1), (0, last)]
+
+        slices = []
+        for row in range(self._row_of(lat_lo), self._row_of(lat_hi) + 1):
+            base = row * self.columns
+            for first, last in column_ranges:
+                start, end = self.cell_starts[base + first], self.cell_starts[base + last + 1]
+                if start < end:
+                    slices.append(np.arange(start, end))
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def within(self, latitude, longitude, radius_km) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (positions, distances_km) of airports within radius_km, nearest first.
+        """
+        candidates = self._candidates(latitude, longitude, radius_km)
+        distances = self._distances(latitude, longitude, candidates)
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
+
+    def nearest(self, latitude, longitude, k) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (positions, distances_km) of the k airports nearest to the point, nearest first.
+        """
+        k = min(k, len(self))
+        radius = NEAREST_START_KM
+        while True:
+            # Every airport within radius is found, so once k are inside the k nearest are too
+            candidates = self._candidates(latitude, longitude, radius)
+            distances = self._distances(latitude, longitude, candidates)
+            if np.count_nonzero(distances <= radius) >= k or radius >= MAX_DISTANCE_KM:
+                break
+            radius *= 2
+        order = np.argsort(distances, kind="stable")[:k]
+        return candidates[order], distances[order]
+
+    def groups(self, cell_degrees) -> dict:
+        """
+        Return {(row, column): positions} grouping airports into cells of cell_degrees.
+        """
+        column_count = math.ceil(360 / cell_degrees)
+        rows = ((self.latitudes + 90) // cell_degrees).astype(np.int64)
+        columns = ((self.longitudes + 180) // cell_degrees).astype(np.int64) % column_count
+        keys = rows * column_count + columns
+        order = np.argsort(keys, kind="stable")
+        unique, starts = np.unique(keys[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        return {divmod(int(key), column_count): order[start:end] for key, start, end in zip(unique, starts, ends)}
@@ -0,0 +1,126 @@
+"""
+Flight Track API - Airport Resolver Module
+
+This module resolves IATA airport codes to coordinates and location details from
+tables that are built once per process, replacing per-call DataFrame scans and
+pycountry lookups.
+
+Key Features:
+- Single dict keyed by IATA code holding compact airport records
+- Records read from a local SQLite artifact, with no network I/O at startup
+- Country names precomputed per airport when the artifact is built
+- Batch resolution of many codes in one call
+
+Core Classes:
+- AirportInfo: Immutable record with the location details for one airport
+- AirportResolver: IATA lookup tables built from a sequence of AirportInfo
+
+Core Functions:
+- read_airport_db: Load every AirportInfo row from the SQLite artifact
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+
+EMPTY_LOCATION_INFO = {"city_name": None, "country_name": None, "iso_code": None}
+
+AIRPORT_DB_SCHEMA = """
+CREATE TABLE airports (
+    iata TEXT PRIMARY KEY,
+    city_name TEXT,
+    country_name TEXT,
+    iso_code TEXT,
+    latitude REAL,
+    longitude REAL
+) WITHOUT ROWID
+"""
+
+
+class AirportInfo(NamedTuple):
+    """
+    Location details for a single airport.
+    """
+    iata: str
+    city_name: Optional[str]
+    country_name: Optional[str]
+    iso_code: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+    def to_location_info(self):
+        """
+        Build a fresh dict in the shape returned by the API's destination_info.
+        """
+        return {
+            "city_name": self.city_name,
+            "country_name": self.country_name,
+            "iso_code": self.iso_code,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+        }
+
+
+def read_airport_db(db_path) -> list[AirportInfo]:
+    """
+    Read every airport row from the SQLite artifact, opened read-only.
+    """
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro&immutable=1"
+    connection = sqlite3.connect(uri, uri=True)
+    try:
+        rows = connection.execute(
+            "SELECT iata, city_name, country_name, iso_code, latitude, longitude FROM airports"
+        ).fetchall()
+    finally:
+        connection.close()
+    return [AirportInfo(*row) for row in rows]
+
+
+class AirportResolver:
+    """
+    IATA code lookups backed by a dict built once from the airport records.
+    """
+
+    def __init__(self, records: Iterable[AirportInfo]):
+        self._airports = {record.iata: record for record in records}
+
+    @classmethod
+    def from_db(cls, db_path):
+        return cls(read_airport_db(db_path))
+
+    def __len__(self):
+        return len(self._airports)
+
+    def __iter__(self):
+        return iter(self._airports.values())
+
+    def get(self, iata_code) -> Optional[AirportInfo]:
+        if not iata_code:
+            return None
+        return self._airports.get(iata_code.upper())
+
+    def coords(self, iata_code) -> Optional[tuple[float, float]]:
+        airport = self.get(iata_code)
+        if airport is None or airport.latitude is None or airport.longitude is None:
+            return None
+        return airport.latitude, airport.longitude
+
+    def iso_code(self, iata_code) -> Optional[str]:
+        airport = self.get(iata_code)
+        return airport.iso_code if airport else None
+
+    def location_info(self, iata_code):
+        """
+        Return a fresh destination_info dict for one IATA code.
+        """
+        airport = self.get(iata_code)
+        if airport is None or airport.iso_code is None:
+            return dict(EMPTY_LOCATION_INFO)
+        return airport.to_location_info()
+
+    def resolve_many(self, codes: Iterable[str]):
+        """
+        Return {code: destination_info dict} for every distinct code in codes.
+        """
+        return {code: self.location_info(code) for code in set(codes)}
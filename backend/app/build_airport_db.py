@@ -0,0 +1,107 @@
+"""
+Flight Track API - Airport Database Build Step
+
+This module turns the airportsdata package and the OpenFlights airport table into the
+local SQLite artifact read by the airport resolver, so the API itself never downloads
+or parses airport sources at startup.
+
+Usage:
+    python -m app.build_airport_db
+    python -m app.build_airport_db --openflights path/to/airports.dat
+    python -m app.build_airport_db --skip-openflights
+
+Coordinates come from OpenFlights when available and fall back to airportsdata.
+"""
+
+import argparse
+import os
+import sqlite3
+
+from .airport_resolver import AIRPORT_DB_SCHEMA, AirportInfo
+
+AIRPORTS_URL = "https://raw.githubusercontent.com/jpatokal/openflights/master/data/airports.dat"
+AIRPORTS_COLUMNS = [
+    "ID", "Name", "City", "Country", "IATA", "ICAO", "Latitude", "Longitude",
+    "Altitude", "Timezone", "DST", "TZ_DB", "Type", "Source"
+]
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "airports.sqlite")
+
+
+def load_openflights_coords(source=AIRPORTS_URL):
+    """
+    Map IATA code to (latitude, longitude), keeping the first row per code.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(source, names=AIRPORTS_COLUMNS, header=None)
+    coords = {}
+    for iata, latitude, longitude in zip(df["IATA"], df["Latitude"], df["Longitude"]):
+        if isinstance(iata, str) and iata != "\\N" and iata not in coords:
+            coords[iata] = (float(latitude), float(longitude))
+    return coords
+
+
+def build_records(airports, coordinates):
+    """
+    Merge airportsdata entries and OpenFlights coordinates into AirportInfo records.
+    """
+    import pycountry
+
+    country_names = {}
+
+    def country_name(iso_code):
+        if iso_code not in country_names:
+            country = pycountry.countries.get(alpha_2=iso_code) if iso_code else None
+            country_names[iso_code] = country.name if country else None
+        return country_names[iso_code]
+
+    records = {}
+    for iata, airport in airports.items():
+        iso_code = airport.get("country") or None
+        latitude, longitude = coordinates.get(iata, (airport.get("lat"), airport.get("lon")))
+        records[iata] = AirportInfo(
+            iata, airport.get("city"), country_name(iso_code), iso_code, latitude, longitude
+        )
+    for iata, (latitude, longitude) in coordinates.items():
+        if iata not in records:
+            records[iata] = AirportInfo(iata, None, None, None, latitude, longitude)
+    return [records[iata] for iata in sorted(records)]
+
+
+def write_airport_db(records, db_path=DEFAULT_DB_PATH):
+    """
+    Write the records to a fresh SQLite file, replacing any existing artifact atomically.
+    """
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.execute(AIRPORT_DB_SCHEMA)
+        connection.executemany("INSERT INTO airports VALUES (?, ?, ?, ?, ?, ?)", records)
+        connection.commit()
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+    os.replace(tmp_path, db_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the local airport database artifact.")
+    parser.add_argument("--output", default=DEFAULT_DB_PATH, help="Path of the SQLite file to write")
+    parser.add_argument("--openflights", default=AIRPORTS_URL, help="URL or path of OpenFlights airports.dat")
+    parser.add_argument("--skip-openflights", action="store_true",
+                        help="Use airportsdata coordinates only (no download)")
+    args = parser.parse_args(argv)
+
+    import airportsdata
+
+    coordinates = {} if args.skip_openflights else load_openflights_coords(args.openflights)
+    records = build_records(airportsdata.load("IATA"), coordinates)
+    write_airport_db(records, args.output)
+    print(f"Wrote {len(records)} airports to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Flight Track API - Climate Cache Module
+
+This module keeps daily Open-Meteo climate series on local disk so weather endpoints
+can be answered from stored slices instead of upstream requests.
+
+Key Features:
+- One tile per location, keyed by latitude/longitude rounded to 0.01 degrees
+- Columnar storage: one contiguous float32 row per climate variable
+- Coverage mask per day, so partially fetched ranges are never served as complete; they
+  can be read explicitly as a degraded fallback
+- Tiles loaded once per process and merged in place as new ranges arrive; misses are not
+  cached, and a loaded tile is reloaded when its file changed before a range is reported
+  missing, so tiles written by other processes are seen. sync() drops every loaded tile
+  when another process has written tiles
+- Atomic tile writes through a unique temporary file + rename; the tile on disk is re-read
+  and merged before each write, so processes sharing the directory keep each other's days
+- Batched writes: put_many() reads and writes each tile once per batch of series
+
+Core Classes:
+- ClimateCache: Directory of per-location .npz tiles with an in-memory tile cache
+"""
+
+import os
+import tempfile
+import threading
+from datetime import date
+from typing import Optional
+
+import numpy as np
+
+COORD_DECIMALS = 2
+
+
+def _ordinal(iso_date):
+    return date.fromisoformat(iso_date).toordinal()
+
+
+class _Tile:
+    __slots__ = ("start", "values", "known", "mtime")
+
+    def __init__(self, start, values, known, mtime=None):
+        self.start = start
+        self.values = values
+        self.known = known
+        # mtime of the tile file this was read from or written to
+        self.mtime = mtime
+
+    @property
+    def end(self):
+        return self.start + self.known.shape[0]
+
+
+class ClimateCache:
+    """
+    Persistent per-location daily climate series, stored as (variables, days) arrays.
+    """
+
+    def __init__(self, directory, variable_count):
+        self.directory = directory
+        self.variable_count = variable_count
+        self._tiles = {}
+        self._lock = threading.Lock()
+        # Incremented on every put and sync, so consumers can tell cheaply whether anything new arrived
+        self.generation = 0
+        self._directory_mtime = self._directory_version()
+
+    def _directory_version(self):
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def sync(self) -> bool:
+        """
+        Drop the in-memory tiles if tiles were written in the directory since the last sync
+        (by another process, as tile writes rename into it); returns whether they were dropped.
+        """
+        version = self._directory_version()
+        if version == self._directory_mtime:
+            return False
+        with self._lock:
+            self._directory_mtime = version
+            self._tiles = {}
+            self.generation += 1
+        return True
+
+    @staticmethod
+    def key(latitude, longitude):
+        return round(float(latitude), COORD_DECIMALS), round(float(longitude), COORD_DECIMALS)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key[0]:+.2f}_{key[1]:+.2f}.npz")
+
+    def _file_mtime(self, key):
+        try:
+            return os.stat(self._path(key)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load(self, key) -> Optional[_Tile]:
+        mtime = self._file_mtime(key)
+        if mtime is None:
+            return None
+        try:
+            with np.load(self._path(key)) as data:
+                return _Tile(int(data["start"]), data["values"], data["known"], mtime)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _tile(self, key, recheck=False) -> Optional[_Tile]:
+        """
+        Return the location's tile, loading it on first use. Misses are not cached, and with
+        recheck a cached tile is reloaded if its file changed, so tiles that other processes
+        write later are seen without waiting for sync().
+        """
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = self._load(key)
+            if tile is not None:
+                self._tiles[key] = tile
+        elif recheck and tile.mtime != self._file_mtime(key):
+            loaded = self._load(key)
+            if loaded is not None:
+                with self._lock:
+                    self._tiles[key], tile = loaded, loaded
+                    self.generation += 1
+        return tile
+
+    def _merge(self, tile, other) -> Optional[_Tile]:
+        """
+        Return a tile covering both, with other's known days written over tile's.
+        """
+        if tile is None or other is None:
+            return other if tile is None else tile
+        start, end = min(tile.start, other.start), max(tile.end, other.end)
+        merged = _Tile(start, np.full((self.variable_count, end - start), np.nan, dtype=np.float32),
+                       np.zeros(end - start, dtype=bool))
+        for part in (tile, other):
+            offset = part.start - start
+            days = np.flatnonzero(part.known)
+            merged.values[:, offset + days] = part.values[:, days]
+            merged.known[offset + days] = True
+        return merged
+
+    def get(self, latitude, longitude, start_date, end_date) -> Optional[np.ndarray]:
+        """
+        Return the (variables, days) series for [start_date, end_date], or None unless fully cached.
+        """
+        key = self.key(latitude, longitude)
+        tile = self._tile(key)
+        series = self._series(tile, start_date, end_date)
+        if series is None and tile is not None:
+            # Another process may have cached the range since the tile was loaded
+            series = self._series(self._tile(key, recheck=True), start_date, end_date)
+        return series
+
+    @staticmethod
+    def _series(tile, start_date, end_date) -> Optional[np.ndarray]:
+        if tile is None:
+            return None
+        lo = _ordinal(start_date) - tile.start
+        hi = _ordinal(end_date) - tile.start + 1
+        if lo < 0 or hi > tile.known.shape[0] or hi <= lo or not tile.known[lo:hi].all():
+            return None
+        return tile.values[:, lo:hi]
+
+    def get_partial(self, latitude, longitude, start_date, end_date) -> Optional[np.ndarray]:
+        """
+        Return the cached days of [start_date, end_date] as a (variables, known days) series,
+        or None when none are cached. A fallback for when the full range cannot be fetched.
+        """
+        tile = self._tile(self.key(latitude, longitude), recheck=True)
+        if tile is None:
+            return None
+        lo = max(_ordinal(start_date) - tile.start, 0)
+        hi = min(_ordinal(end_date) - tile.start + 1, tile.known.shape[0])
+        if hi <= lo or not tile.known[lo:hi].any():
+            return None
+        return tile.values[:, lo:hi][:, tile.known[lo:hi]]
+
+    def put(self, latitude, longitude, start_date, values):
+        """
+        Merge a (variables, days) series starting at start_date into the location's tile.
+        """
+        self.put_many([(latitude, longitude, start_date, values)])
+
+    def put_many(self, series):
+        """
+        Merge (latitude, longitude, start_date, values) series into their tiles, reading and
+        writing each tile once. Blocks on disk I/O, so async callers run it in a thread.
+        """
+        new = {}
+        for latitude, longitude, start_date, values in series:
+            values = np.asarray(values, dtype=np.float32)
+            if values.ndim != 2 or values.shape[0] != self.variable_count or values.shape[1] == 0:
+                continue
+            key = self.key(latitude, longitude)
+            tile = _Tile(_ordinal(start_date), values.copy(), np.ones(values.shape[1], dtype=bool))
+            new[key] = self._merge(new.get(key), tile)
+
+        for key, tile in new.items():
+            with self._lock:
+                # Another process may have written the tile since this one loaded it
+                merged = self._merge(self._merge(self._tile(key), self._load(key)), tile)
+                self._write(key, merged)
+                self._tiles[key] = merged
+                self.generation += 1
+
+    def _write(self, key, tile):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp.npz", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.savez(file, start=np.int64(tile.start), values=tile.values, known=tile.known)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        tile.mtime = self._file_mtime(key)
@@ -0,0 +1,277 @@
+"""
+Flight Track API - Columnar Data Module
+
+This module converts the flight, visa and weather datasets to and from Apache Arrow
+tables, for compact on-disk copies of the JSON data files and for binary API responses.
+
+Key Features:
+- Repeating strings (codes, record types, visa categories) stored dictionary-encoded
+- Dates stored as date32 and day counts as small integers instead of text
+- Arrow IPC files beside the JSON sources (data/<name>.arrow), read through a memory map
+  so column buffers are used in place without copying
+- Arrow IPC stream encoding for API responses (application/vnd.apache.arrow.stream)
+- Atomic file writes (temporary file + rename)
+
+pyarrow is imported on first use, keeping it off the startup path.
+
+Usage:
+    python -m app.columnar export
+
+Core Functions:
+- columnar_path: Path of the Arrow copy of a JSON data file
+- write_table / read_table: Write an Arrow IPC file, memory-map one back
+- stream_bytes: Encode a table as an Arrow IPC stream
+- flight_table / flight_records: FlightRecords to a table and back
+- visa_table / visa_data: Passport → destination requirements to a table and back
+- visa_matrix: VisaMatrix built from a visa table's dictionary codes
+- climate_table: A (variables, days) climate series as a table with a date column
+"""
+
+import argparse
+import json
+import os
+from datetime import date, timedelta
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .flight_store import FlightRecord
+from .visa_matrix import VisaMatrix
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_SUFFIX = ".arrow"
+
+
+def columnar_path(json_path):
+    return os.path.splitext(json_path)[0] + ARROW_SUFFIX
+
+
+def _dictionary(values):
+    import pyarrow as pa
+
+    encoded = pa.array(values, type=pa.string()).dictionary_encode()
+    # Narrowest index type for the number of distinct values
+    for index_type in (pa.int8(), pa.int16()):
+        if len(encoded.dictionary) <= np.iinfo(index_type.to_pandas_dtype()).max + 1:
+            return encoded.cast(pa.dictionary(index_type, pa.string()))
+    return encoded
+
+
+def _codes(column) -> Tuple[list, np.ndarray]:
+    """
+    Return (distinct values, per-row index into them, -1 for null) of a dictionary column.
+    """
+    column = column.unify_dictionaries()
+    if not column.num_chunks:
+        return [], np.empty(0, dtype=np.int64)
+    labels = column.chunk(0).dictionary.to_pylist()
+    codes = np.concatenate([chunk.indices.fill_null(-1).to_numpy().astype(np.int64) for chunk in column.chunks])
+    return labels, codes
+
+
+def _strings(column) -> list:
+    """
+    Return a string column as a list; dictionary columns are decoded once per distinct value
+    instead of once per row.
+    """
+    import pyarrow as pa
+
+    if not pa.types.is_dictionary(column.type):
+        return column.to_pylist()
+    labels, codes = _codes(column)
+    labels.append(None)
+    return [labels[code] for code in codes.tolist()]
+
+
+def write_table(table, path):
+    """
+    Write table as an uncompressed Arrow IPC file, so it can be memory-mapped back.
+    """
+    import pyarrow as pa
+
+    temp_path = path + ".tmp"
+    with pa.OSFile(temp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(temp_path, path)
+
+
+def read_table(path):
+    """
+    Read an Arrow IPC file through a memory map; column buffers point into the mapping.
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def stream_bytes(table) -> bytes:
+    """
+    Encode table as an Arrow IPC stream.
+    """
+    import pyarrow as pa
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def flight_table(records: Sequence[FlightRecord]):
+    """
+    Build a table with one row per FlightRecord. Prices stay strings so records round-trip
+    exactly; analytics can cast price_total to a decimal.
+    """
+    import pyarrow as pa
+
+    columns = list(zip(*records)) if records else [()] * len(FlightRecord._fields)
+    fields = dict(zip(FlightRecord._fields, columns))
+    return pa.table({
+        "type": _dictionary(fields["type"]),
+        "origin": _dictionary(fields["origin"]),
+        "destination": _dictionary(fields["destination"]),
+        "departure_date": pa.array([date.fromisoformat(day) for day in fields["departure_date"]], pa.date32()),
+        "return_date": pa.array([date.fromisoformat(day) for day in fields["return_date"]], pa.date32()),
+        "price_total": pa.array(fields["price_total"], pa.string()),
+        "flight_dates_link": pa.array(fields["flight_dates_link"], pa.string()),
+        "flight_offers_link": pa.array(fields["flight_offers_link"], pa.string()),
+        "travel_days": pa.array(fields["travel_days"], pa.int16()),
+    })
+
+
+def _iso_dates(column) -> List[str]:
+    # date32 is days since 1970-01-01; interning ISO strings per distinct day is far cheaper than per row
+    days = column.to_numpy(zero_copy_only=False).astype("datetime64[D]").astype(np.int64)
+    unique, inverse = np.unique(days, return_inverse=True)
+    epoch = date(1970, 1, 1)
+    labels = [(epoch + timedelta(days=int(day))).isoformat() for day in unique]
+    return [labels[i] for i in inverse.tolist()]
+
+
+def flight_records(table) -> List[FlightRecord]:
+    """
+    Rebuild FlightRecords from a flight table.
+    """
+    columns = [
+        _strings(table.column("type")),
+        _strings(table.column("origin")),
+        _strings(table.column("destination")),
+        _iso_dates(table.column("departure_date")),
+        _iso_dates(table.column("return_date")),
+        table.column("price_total").to_pylist(),
+        table.column("flight_dates_link").to_pylist(),
+        table.column("flight_offers_link").to_pylist(),
+        table.column("travel_days").to_pylist(),
+    ]
+    return [FlightRecord(*row) for row in zip(*columns)]
+
+
+def visa_table(data: Dict[str, dict]):
+    """
+    Build a (passport, destination) table from visa-countries.json data. Stays given in days
+    go to the days column, with requirement left null.
+    """
+    import pyarrow as pa
+
+    passports, destinations, requirements, days = [], [], [], []
+    for passport, entries in data.items():
+        for destination, value in entries.items():
+            passports.append(passport)
+            destinations.append(destination)
+            is_days = isinstance(value, int)
+            requirements.append(None if is_days else value)
+            days.append(value if is_days else None)
+    return pa.table({
+        "passport": _dictionary(passports),
+        "destination": _dictionary(destinations),
+        "requirement": _dictionary(requirements),
+        "days": pa.array(days, pa.int16()),
+    })
+
+
+def visa_codes(table):
+    """
+    Return (passports, passport codes, destinations, destination codes, values, value codes)
+    for a visa table: the distinct values of each column and every row's index into them.
+    Requirement values are the category strings followed by the distinct day counts.
+    """
+    passports, passport_codes = _codes(table.column("passport"))
+    destinations, destination_codes = _codes(table.column("destination"))
+    requirements, value_codes = _codes(table.column("requirement"))
+    has_days = table.column("days").is_valid().to_numpy(zero_copy_only=False)
+    days, day_codes = np.unique(table.column("days").fill_null(0).to_numpy()[has_days], return_inverse=True)
+    value_codes[has_days] = len(requirements) + day_codes
+    return passports, passport_codes, destinations, destination_codes, requirements + days.tolist(), value_codes
+
+
+def visa_data(table) -> Dict[str, dict]:
+    """
+    Rebuild the nested {passport: {destination: requirement}} dict from a visa table.
+    """
+    passports, passport_codes, destinations, destination_codes, values, value_codes = visa_codes(table)
+    data = {}
+    for passport, destination, value in zip(passport_codes.tolist(), destination_codes.tolist(),
+                                            value_codes.tolist()):
+        entries = data.get(passports[passport])
+        if entries is None:
+            entries = data[passports[passport]] = {}
+        entries[destinations[destination]] = values[value]
+    return data
+
+
+def visa_matrix(table) -> VisaMatrix:
+    """
+    Build the VisaMatrix straight from a visa table's codes, without the nested dict.
+    """
+    return VisaMatrix.from_codes(*visa_codes(table))
+
+
+def climate_table(series, start_date, variables: Sequence[str]):
+    """
+    Build a table with a date column and one float32 column per variable from a
+    (variables, days) series.
+    """
+    import pyarrow as pa
+
+    start = np.datetime64(start_date, "D")
+    columns = {"date": pa.array(start + np.arange(series.shape[1]), pa.date32())}
+    for name, values in zip(variables, series):
+        columns[name] = pa.array(values)
+    return pa.table(columns)
+
+
+def export_data_files(flight_path, visa_path):
+    """
+    Write Arrow copies of the flight and visa JSON data files beside them; returns their paths.
+    """
+    from .flight_store import read_flight_file
+
+    paths = []
+    if os.path.exists(flight_path):
+        paths.append(columnar_path(flight_path))
+        write_table(flight_table(read_flight_file(flight_path)), paths[-1])
+    if os.path.exists(visa_path):
+        with open(visa_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        paths.append(columnar_path(visa_path))
+        write_table(visa_table(data), paths[-1])
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the JSON data files to Arrow IPC files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("export", help="Write data/<name>.arrow beside the flight and visa JSON files")
+    parser.parse_args(argv)
+
+    from .flight_service import FLIGHT_DATA_PATH, VISA_DATA_PATH
+
+    for path in export_data_files(FLIGHT_DATA_PATH, VISA_DATA_PATH):
+        json_path = os.path.splitext(path)[0] + ".json"
+        print(f"{os.path.basename(path)}: {os.path.getsize(path)} bytes "
+              f"({os.path.getsize(json_path)} bytes as JSON)")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,68 +11,182 @@ Key Features:
 - Visa requirement lookups by country
 - Weather forecast data for airports
 - Destination-specific travel advisories
+- Nearest-airport, radius and region queries backed by a spatial index
+- Precomputed great-circle route geometry for drawing arcs on the globe
+- Fare calendar over a date range from a precomputed minimum-price grid
 
 Endpoints:
 - /flights/forlondon: Retrieve and filter flight data
+- /flights/search: Cheapest flights by date, price and trip length ranges
 - /advisory/{country_code}: Get travel advisory for specific countries
+- /advisories: Get travel advisories for all or selected countries in one response
 - /visa/{country_code}: Access visa requirements
 - /destinations/travel-advisory: Get consolidated travel advisories
+- /airports/nearest: Airports nearest to a point
+- /destinations/nearby: Destinations within a radius of a point
+- /destinations/regions: Destinations grouped by latitude/longitude cell
+- /routes: Great-circle distance, bearing and path of every route
+- /calendar: Lowest price and trip length per destination and departure date over a range
 - /weather/{iata_code}: Fetch weather forecasts for airports
+- /dashboard: Flights, weather, advisories and visa requirements for the PCP view in one call
+- /pcp: Materialized PCP dimensions per destination for a departure date, with visa joined
 
 The module integrates with external services including Open-Meteo API for weather data
-and uses caching mechanisms to optimize API performance.
+and serves climate series from a local on-disk cache before going upstream. Data-only
+responses are pre-encoded with orjson and revalidated through ETags. Flight, visa and
+weather endpoints also answer with Arrow IPC streams (Accept:
+application/vnd.apache.arrow.stream or format=arrow) for bulk consumers.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from .flight_service import load_flight_data, load_advisory_data, load_visa_data, iata_to_iso, get_airport_coords, iata_to_location_info
-import requests_cache
-import openmeteo_requests
-from retry_requests import retry
-import numpy as np
-from datetime import datetime
+import asyncio
+from bisect import bisect_left
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from .flight_service import get_flight_snapshot, get_flight_views, iter_flight_views, search_flights, load_advisory_table, load_visa_data, load_visa_matrix, iata_to_iso, get_airport_coords, resolve_many, nearest_airports, destinations_within, destination_regions, get_destination_prices, get_route_geometry, get_price_calendar, pcp_cube, refresh_pcp_cube, advisory_file, visa_file
+from .advisory_table import SEVERITY_LEVELS, normalize_code
+from .metrics import count, span
+from .columnar import climate_table, flight_table, visa_table
+from .responses import arrow_response, cached_arrow_response, cached_json_response, encode, json_response, ndjson_response, payload_cache, wants_arrow, wants_ndjson
+from .weather_client import WeatherClientError
+from .weather_service import DAILY_VARIABLES, cached_climate_series, get_climate_series, weather_governor
+from .weather_summary import summarize, summarize_many
 
 router = APIRouter()
 
 
 
+def _flight_list_entry(snapshot, filters, positions, start, end):
+    """
+    Payload cache (key, version, build) for a page of the enriched flight list.
+    """
+    def build():
+        views = get_flight_views(snapshot)
+        return [views[position] for position in positions[start:end]]
+
+    return ("flights",) + filters + (start, end), snapshot.version, build
+
+
 """
 @endpoint: GET /api/flights/forlondon
 @description: Get flights data with optional origin and destination filters
 @parameters:
     - origin (optional): IATA code of origin airport
     - destination (optional): IATA code of destination airport
+    - format (optional): 'ndjson' to stream one flight per line (or send Accept: application/x-ndjson),
+      'arrow' for an Arrow IPC stream of the flight records (or send Accept: application/vnd.apache.arrow.stream)
+    - limit (optional): Maximum number of flights to return
+    - cursor (optional): Value of a previous response's X-Next-Cursor header, to fetch the next page
 @usage: 
     - All flights: curl http://localhost:8000/api/flights/forlondon
     - Filtered: curl http://localhost:8000/api/flights/forlondon?origin=LHR&destination=JFK
+    - Streamed pages: curl http://localhost:8000/api/flights/forlondon?format=ndjson&limit=500
+    - Arrow: curl -H 'Accept: application/vnd.apache.arrow.stream' http://localhost:8000/api/flights/forlondon
 """
 @router.get("/flights/forlondon")
-async def get_flights_by_origin(origin: str = None, destination: str = None, departure_date: str = None):
+async def get_flights_by_origin(
+        request: Request,
+        origin: str = None,
+        destination: str = None,
+        departure_date: str = None,
+        response_format: str = Query(None, alias="format"),
+        limit: int = Query(None, ge=1),
+        cursor: int = Query(None, ge=0)
+):
     """
     Get flights data. Optionally filter by origin and destination.
     """
 
-    flights = load_flight_data()
-    if not flights:
+    snapshot = get_flight_snapshot()
+    if not snapshot:
         raise HTTPException(status_code=404, detail="No flight data found")
 
-    if origin:
-        flights = [f for f in flights if f["origin"] == origin]
-    if destination:
-        flights = [f for f in flights if f["destination"] == destination]
-    if departure_date:
-        flights = [f for f in flights if f["departureDate"] == departure_date]
+    filters = (origin or None, destination or None, departure_date or None)
 
-    for flight in flights:
-        location_info = iata_to_location_info(flight["destination"])
+    # Positions are in file order, so a cursor is simply the next record position to return
+    positions = snapshot.query_positions(*filters)
+    start = bisect_left(positions, cursor) if cursor else 0
+    end = len(positions) if limit is None else min(start + limit, len(positions))
+    headers = {"X-Next-Cursor": str(positions[end])} if end < len(positions) else {}
+
+    if wants_arrow(request, response_format):
+        def build_table():
+            return flight_table([snapshot.records[position] for position in positions[start:end]])
+
+        return cached_arrow_response(request, ("flights",) + filters + (start, end), snapshot.version, build_table,
+                                     headers=headers)
+
+    if wants_ndjson(request, response_format):
+        return ndjson_response(iter_flight_views(snapshot, positions[start:end]), headers=headers)
+
+    return cached_json_response(request, *_flight_list_entry(snapshot, filters, positions, start, end), headers=headers)
 
-        departure = datetime.strptime(flight["departureDate"], "%Y-%m-%d")
-        return_date = datetime.strptime(flight["returnDate"], "%Y-%m-%d")
-        travel_days = (return_date - departure).days
 
-        location_info["travel_days"] = travel_days
-        flight["destination_info"] = location_info
+def _parse_date(value, name, required=False):
+    if not value:
+        if required:
+            raise HTTPException(status_code=400, detail=f"Missing {name}, expected YYYY-MM-DD")
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} '{value}', expected YYYY-MM-DD")
+
+
+"""
+@endpoint: GET /api/flights/search
+@description: Search flights by date, price and trip length ranges, returning the cheapest first
+@parameters:
+    - origin (optional): Comma-separated origin IATA codes (default: every London airport)
+    - destination (optional): Comma-separated destination IATA codes
+    - departure_from / departure_to (optional): Departure date range, inclusive (YYYY-MM-DD)
+    - min_price / max_price (optional): Price range, inclusive
+    - min_days / max_days (optional): Trip length range in days, inclusive
+    - limit (optional): Number of flights to return (default 20)
+    - group_by (optional): 'destination' to return only the cheapest flight per destination
+@usage:
+    - Cheapest 10 under 100: curl "http://localhost:8000/api/flights/search?max_price=100&limit=10"
+    - Cheapest per destination: curl "http://localhost:8000/api/flights/search?departure_from=2025-03-11&departure_to=2025-03-15&min_days=3&max_days=5&group_by=destination"
+"""
+@router.get("/flights/search")
+async def search_flights_by_price(
+        request: Request,
+        origin: str = None,
+        destination: str = None,
+        departure_from: str = None,
+        departure_to: str = None,
+        min_price: float = None,
+        max_price: float = None,
+        min_days: int = None,
+        max_days: int = None,
+        limit: int = Query(20, ge=1, le=1000),
+        group_by: str = Query(None, pattern="^destination$")
+):
+    """
+    Get the cheapest flights matching range predicates, optionally one per destination.
+    """
+    snapshot = get_flight_snapshot()
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="No flight data found")
+
+    for low, high, names in ((min_price, max_price, "min_price/max_price"), (min_days, max_days, "min_days/max_days")):
+        if low is not None and high is not None and low > high:
+            raise HTTPException(status_code=400, detail=f"Invalid range {names}: {low} > {high}")
+
+    origins = tuple(code.strip().upper() for code in origin.split(",")) if origin else None
+    destinations = tuple(code.strip().upper() for code in destination.split(",")) if destination else None
+    criteria = (origins, destinations, _parse_date(departure_from, "departure_from"),
+                _parse_date(departure_to, "departure_to"), min_price, max_price, min_days, max_days)
+
+    def build():
+        positions, total = search_flights(snapshot, *criteria, limit=limit, group_by=group_by)
+        views = get_flight_views(snapshot)
+        return {
+            "flights": [views[position] for position in positions],
+            "total_matches": total,
+            "group_by": group_by
+        }
 
-    return flights
+    return cached_json_response(request, ("search",) + criteria + (limit, group_by), snapshot.version, build)
 
 
 """
@@ -83,23 +197,91 @@ async def get_flights_by_origin(origin: str = None, destination: str = None, dep
 @usage: curl http://localhost:8000/api/advisory/us
 """
 @router.get("/advisory/{country_code}")
-async def get_advisory(country_code: str):
+async def get_advisory(request: Request, country_code: str):
     """
     Get travel advisory for a specific country.
     """
-    advisories = load_advisory_data()
+    advisories = load_advisory_table()
     if not advisories:
         raise HTTPException(status_code=404, detail="Advisory data not found")
 
-    advisory = advisories.get(country_code.lower())
+    advisory = advisories.get(country_code)
     if not advisory:
         raise HTTPException(status_code=404, detail=f"No advisory found for country code {country_code}")
 
-    return advisory
+    key = ("advisory", normalize_code(country_code))
+    return cached_json_response(request, key, advisory_file.version(), lambda: advisory)
+
+
+"""
+@endpoint: GET /api/advisories
+@description: Get travel advisories for every country, or for a requested subset, in one response
+@parameters:
+    - country_codes (optional): Comma-separated list of ISO country codes (e.g., 'us,gb')
+@usage:
+    - All countries: curl http://localhost:8000/api/advisories
+    - Subset: curl http://localhost:8000/api/advisories?country_codes=us,gb
+"""
+@router.get("/advisories")
+async def get_advisories(request: Request, country_codes: str = None):
+    """
+    Get travel advisories keyed by lowercase ISO code, with severity levels.
+    """
+    advisories = load_advisory_table()
+    if not advisories:
+        raise HTTPException(status_code=404, detail="Advisory data not found")
+
+    codes = tuple(dict.fromkeys(normalize_code(code) for code in country_codes.split(","))) if country_codes else None
+
+    def build():
+        selected = advisories.subset(codes)
+        return {
+            "advisories": selected,
+            "levels": SEVERITY_LEVELS,
+            "total": len(selected)
+        }
+
+    return cached_json_response(request, ("advisories", codes), advisory_file.version(), build)
+
+def _pcp_visa_entry(snapshot, visa_matrix, passports, departure_date):
+    """
+    Payload cache (key, version, build) for the /pcpvisa response.
+    """
+    def build():
+        records = snapshot.query(departure_date=departure_date or None)
+        destinations = list(dict.fromkeys(record.destination for record in records))
+        if not passports:
+            destinations = []
+
+        locations = resolve_many(destinations)
+        destination_isos = [locations[destination]["iso_code"] for destination in destinations]
+
+        # One (passports, destinations) lookup instead of a dict walk per flight and passport
+        requirements = visa_matrix.lookup(passports, destination_isos)
+        destination_visa_map = {
+            destination: {passport: row[column] for passport, row in zip(passports, requirements)}
+            for column, destination in enumerate(destinations)
+        }
+        best_passport = {
+            destination: {"passport": passport, "requirement": requirement}
+            for destination, (passport, requirement) in zip(destinations, visa_matrix.best(passports, destination_isos))
+        }
+
+        return {
+            "destination_requirements": destination_visa_map,
+            "best_passport": best_passport,
+            "total_destinations": len(destination_visa_map),
+            "departure_date": departure_date
+        }
+
+    key = ("pcpvisa", tuple(passports), departure_date or None)
+    return key, (visa_file.version(), snapshot.version), build
+
 
 """
 @endpoint: GET /api/pcpvisa
 @description: Get visa requirements for multiple countries with optional departure date filter
+    and the passport in the group with the easiest entry per destination
 @parameters:
     - country_codes: Comma-separated list of ISO country codes (uppercase, e.g., 'US,GB,FR')
     - departure_date: Optional date filter (YYYY-MM-DD)
@@ -109,50 +291,24 @@ async def get_advisory(country_code: str):
 """
 @router.get("/pcpvisa")
 async def get_visa_requirements(
+        request: Request,
         country_codes: str = Query(..., description="Comma-separated list of country codes"),
         departure_date: str = Query(None, description="Optional departure date filter (YYYY-MM-DD)")
 ):
     """
     Get visa requirements for multiple countries.
     """
-    visa_data = load_visa_data()
-    if not visa_data:
+    visa_matrix = load_visa_matrix()
+    if not visa_matrix:
         raise HTTPException(status_code=404, detail="Visa data not found")
 
-    flights = load_flight_data()
-    if not flights:
+    snapshot = get_flight_snapshot()
+    if not snapshot:
         raise HTTPException(status_code=404, detail="No flight data found")
 
-    if departure_date:
-        flights = [f for f in flights if f["departureDate"] == departure_date]
-
-    destination_visa_map = {}
-    for flight in flights:
-        location_info = iata_to_location_info(flight["destination"])
-
-        departure = datetime.strptime(flight["departureDate"], "%Y-%m-%d")
-        return_date = datetime.strptime(flight["returnDate"], "%Y-%m-%d")
-        travel_days = (return_date - departure).days
-
-        location_info["travel_days"] = travel_days
-        flight["destination_info"] = location_info
-
-        destination_iso = location_info["iso_code"]
-
-        destination_requirements = {}
-        for origin_country in country_codes.split(','):
-            origin_country = origin_country.strip().upper()
-            if origin_country in visa_data:
-                destination_requirements[origin_country] = visa_data[origin_country].get(destination_iso, "Unknown")
-
-        if destination_requirements: 
-            destination_visa_map[flight["destination"]] = destination_requirements
+    passports = visa_matrix.known_passports(country_codes.split(','))
 
-    return {
-        "destination_requirements": destination_visa_map,
-        "total_destinations": len(destination_visa_map),
-        "departure_date": departure_date
-    }
+    return cached_json_response(request, *_pcp_visa_entry(snapshot, visa_matrix, passports, departure_date))
 
 
 """
@@ -160,12 +316,15 @@ async def get_visa_requirements(
 @description: Get visa requirements for multiple countries
 @parameters:
     - country_codes: Comma-separated list of ISO country codes (uppercase, e.g., 'US,GB,FR')
+    - format (optional): 'arrow' for an Arrow IPC stream of (passport, destination, requirement, days)
+      rows (or send Accept: application/vnd.apache.arrow.stream)
 @usage: curl http://localhost:8000/api/visa?country_codes=US,GB,FR
 """
 
 
 @router.get("/visa")
-async def get_visa_requirements(country_codes: str = Query(..., description="Comma-separated list of country codes")):
+async def get_visa_requirements(request: Request, country_codes: str = Query(..., description="Comma-separated list of country codes"),
+                                 response_format: str = Query(None, alias="format")):
     """
     Get visa requirements for multiple countries.
     """
@@ -175,19 +334,59 @@ async def get_visa_requirements(country_codes: str = Query(..., description="Com
 
     codes = [code.strip().upper() for code in country_codes.split(",")]
 
-    requirements = {}
-    for code in codes:
-        requirement = visa_data.get(code)
-        if requirement:
-            requirements[code] = requirement
-        else:
-            requirements[code] = None
+    if wants_arrow(request, response_format):
+        def build_table():
+            return visa_table({code: visa_data[code] for code in dict.fromkeys(codes) if visa_data.get(code)})
+
+        return cached_arrow_response(request, ("visa",) + tuple(codes), visa_file.version(), build_table)
+
+    def build():
+        requirements = {}
+        for code in codes:
+            requirement = visa_data.get(code)
+            if requirement:
+                requirements[code] = requirement
+            else:
+                requirements[code] = None
+
+        return {
+            "requirements": requirements,
+            "total_requested": len(codes),
+            "found": len([r for r in requirements.values() if r is not None])
+        }
+
+    return cached_json_response(request, ("visa",) + tuple(codes), visa_file.version(), build)
+
+
+def _travel_advisory_entry(snapshot, advisories):
+    """
+    Payload cache (key, version, build) for the /destinations/travel-advisory response.
+    """
+    def build():
+        destinations = set(snapshot.by_destination)
+
+        destination_advisories = {}
+        unmatched = []
+
+        for iata in destinations:
+            country_code = iata_to_iso(iata)
+            if country_code in advisories:
+                destination_advisories[iata] = {
+                    "iata": iata,
+                    "iso": country_code.lower(), 
+                    "advisory": advisories.get(country_code)
+                }
+            else:
+                unmatched.append(iata)
+
+        return {
+            "advisories": destination_advisories,
+            "unmatched": unmatched,
+            "total_destinations": len(destinations),
+            "matched_destinations": len(destination_advisories)
+        }
 
-    return {
-        "requirements": requirements,
-        "total_requested": len(codes),
-        "found": len([r for r in requirements.values() if r is not None])
-    }
+    return ("travel-advisory",), (snapshot.version, advisory_file.version()), build
 
 
 """
@@ -196,45 +395,216 @@ async def get_visa_requirements(country_codes: str = Query(..., description="Com
 @usage: curl http://localhost:8000/api/destinations/travel-advisory
 """
 @router.get("/destinations/travel-advisory")
-async def get_travel_advisory():
+async def get_travel_advisory(request: Request):
     """
     Get travel advisories for destinations in Lon-other.json
     """
-    flights_data = load_flight_data()
-    if not flights_data:
+    snapshot = get_flight_snapshot()
+    if not snapshot:
         raise HTTPException(status_code=404, detail="Flight data not found")
 
-    advisories = load_advisory_data()
+    advisories = load_advisory_table()
     if not advisories:
         raise HTTPException(status_code=404, detail="Advisory data not found")
 
-    destinations = {flight["destination"] for flight in flights_data}
+    return cached_json_response(request, *_travel_advisory_entry(snapshot, advisories))
 
-    destination_advisories = {}
-    unmatched = []
 
-    for iata in destinations:
-        country_code = iata_to_iso(iata)
-        if country_code and country_code.lower() in advisories:
-            destination_advisories[iata] = {
-                "iata": iata,
-                "iso": country_code.lower(), 
-                "advisory": advisories[country_code.lower()]
-            }
-        else:
-            unmatched.append(iata)
+def _resolve_point(iata_code, lat, lon):
+    """
+    Coordinates of the query point, from an airport code or explicit lat/lon.
+    """
+    if iata_code:
+        coords = get_airport_coords(iata_code)
+        if not coords:
+            raise HTTPException(status_code=404, detail=f"Airport with IATA code {iata_code} not found")
+        return coords
+    if lat is None or lon is None:
+        raise HTTPException(status_code=400, detail="Provide either iata or both lat and lon")
+    return lat, lon
+
+
+def _airport_match(airport, distance_km):
+    return {"iata": airport.iata, **airport.to_location_info(), "distance_km": distance_km}
+
 
-    return {
-        "advisories": destination_advisories,
-        "unmatched": unmatched,
-        "total_destinations": len(destinations),
-        "matched_destinations": len(destination_advisories)
-    }
+"""
+@endpoint: GET /api/airports/nearest
+@description: Get the airports nearest to a point, nearest first
+@parameters:
+    - iata (optional): IATA code of the airport to search around
+    - lat, lon (optional): Coordinates to search around, instead of iata
+    - k (optional): Number of airports to return (default 5, at most 100)
+@usage: curl http://localhost:8000/api/airports/nearest?lat=51.5&lon=-0.12&k=5
+"""
+@router.get("/airports/nearest")
+async def get_nearest_airports(
+        iata: str = None,
+        lat: float = Query(None, ge=-90, le=90),
+        lon: float = Query(None, ge=-180, le=180),
+        k: int = Query(5, ge=1, le=100)
+):
+    """
+    Get the k airports nearest to a point, with their great-circle distance in km.
+    """
+    latitude, longitude = _resolve_point(iata, lat, lon)
+    airports = nearest_airports(latitude, longitude, k)
+    return json_response({
+        "airports": [_airport_match(airport, distance) for airport, distance in airports],
+        "total": len(airports)
+    })
+
+
+"""
+@endpoint: GET /api/destinations/nearby
+@description: Get flight destinations within a radius of a point, nearest first, with their
+    cheapest fare and number of flights
+@parameters:
+    - iata (optional): IATA code of the airport to search around (e.g., 'LHR')
+    - lat, lon (optional): Coordinates to search around, instead of iata
+    - radius_km (optional): Search radius in km (default 2000)
+@usage: curl http://localhost:8000/api/destinations/nearby?iata=LHR&radius_km=2000
+"""
+@router.get("/destinations/nearby")
+async def get_nearby_destinations(
+        iata: str = None,
+        lat: float = Query(None, ge=-90, le=90),
+        lon: float = Query(None, ge=-180, le=180),
+        radius_km: float = Query(2000, gt=0, le=20040)
+):
+    """
+    Get destinations with flights within radius_km of a point.
+    """
+    snapshot = get_flight_snapshot()
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="No flight data found")
 
+    latitude, longitude = _resolve_point(iata, lat, lon)
+    prices = get_destination_prices(snapshot)
+    destinations = [
+        dict(_airport_match(airport, distance), cheapest_price=prices.get(airport.iata),
+             flight_count=len(snapshot.by_destination[airport.iata]))
+        for airport, distance in destinations_within(snapshot, latitude, longitude, radius_km)
+    ]
+    return json_response({
+        "center": {"latitude": latitude, "longitude": longitude},
+        "radius_km": radius_km,
+        "destinations": destinations,
+        "total": len(destinations)
+    })
+
+
+"""
+@endpoint: GET /api/destinations/regions
+@description: Group flight destinations into latitude/longitude cells, e.g. for clustering
+    markers on the globe
+@parameters:
+    - cell_degrees (optional): Cell size in degrees (default 10)
+@usage: curl http://localhost:8000/api/destinations/regions?cell_degrees=10
+"""
+@router.get("/destinations/regions")
+async def get_destination_regions(request: Request, cell_degrees: float = Query(10, ge=0.5, le=90)):
+    """
+    Get destination groups per grid cell, largest first, with the mean position of each group.
+    """
+    snapshot = get_flight_snapshot()
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="No flight data found")
+
+    def build():
+        regions = [
+            {"latitude": latitude, "longitude": longitude, "destinations": codes, "count": len(codes)}
+            for latitude, longitude, codes in destination_regions(snapshot, cell_degrees)
+        ]
+        return {"cell_degrees": cell_degrees, "regions": regions, "total": len(regions)}
+
+    return cached_json_response(request, ("regions", cell_degrees), snapshot.version, build)
+
+
+"""
+@endpoint: GET /api/routes
+@description: Get the great-circle geometry of every (origin, destination) route in the flight
+    data in one compact response, for drawing all arcs on the globe at once
+@parameters:
+    - origin (optional): Comma-separated list of origin IATA codes (e.g., 'LHR,LGW')
+    - destination (optional): Comma-separated list of destination IATA codes
+    - precision (optional): Decimal places of path coordinates (default 2, about 1 km)
+@usage:
+    - All routes: curl http://localhost:8000/api/routes
+    - From Heathrow: curl http://localhost:8000/api/routes?origin=LHR
+"""
+@router.get("/routes")
+async def get_routes(request: Request, origin: str = None, destination: str = None,
+                     precision: int = Query(2, ge=0, le=6)):
+    """
+    Get routes as parallel columns; path[i] is route i's flat [lat, lon, lat, lon, ...] polyline.
+    """
+    snapshot = get_flight_snapshot()
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="No flight data found")
+
+    origins = tuple(sorted({code.strip().upper() for code in origin.split(",")})) if origin else None
+    destinations = tuple(sorted({code.strip().upper() for code in destination.split(",")})) if destination else None
+
+    def build():
+        geometry = get_route_geometry(snapshot)
+        positions = [i for i in range(len(geometry))
+                     if (origins is None or geometry.origins[i] in origins)
+                     and (destinations is None or geometry.destinations[i] in destinations)]
+        return {
+            "routes": geometry.payload(positions, precision),
+            "tolerance_km": geometry.tolerance_km,
+            "total": len(positions)
+        }
+
+    return cached_json_response(request, ("routes", origins, destinations, precision), snapshot.version, build)
+
+
+CALENDAR_MAX_DAYS = 366
+
+"""
+@endpoint: GET /api/calendar
+@description: Get a fare calendar: the lowest price and its trip length for every destination and
+    departure date in a date range, in one response instead of one flight list per day
+@parameters:
+    - start_date: First departure date (YYYY-MM-DD)
+    - end_date: Last departure date, inclusive (YYYY-MM-DD); at most 366 days after start_date
+    - destination (optional): Comma-separated list of destination IATA codes
+    - min_days / max_days (optional): Trip length range in days; matched to whole trip-length
+      buckets (see trip_buckets in the response), widened to the buckets containing the bounds
+@usage:
+    - March: curl "http://localhost:8000/api/calendar?start_date=2025-03-01&end_date=2025-03-31"
+    - Short trips to Dublin: curl "http://localhost:8000/api/calendar?start_date=2025-03-01&end_date=2025-03-31&destination=DUB&max_days=4"
+"""
+@router.get("/calendar")
+async def get_price_calendar_grid(request: Request, start_date: str = Query(...), end_date: str = Query(...),
+                                  destination: str = None, min_days: int = Query(None, ge=0),
+                                  max_days: int = Query(None, ge=0)):
+    """
+    Get price[i][j] / travel_days[i][j] for destinations[i] departing on dates[j], null where
+    there is no flight. Only destinations with a flight in the range are listed.
+    """
+    snapshot = get_flight_snapshot()
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="No flight data found")
+
+    start = _parse_date(start_date, "start_date", required=True)
+    end = _parse_date(end_date, "end_date", required=True)
+    if end < start:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if min_days is not None and max_days is not None and min_days > max_days:
+        raise HTTPException(status_code=400, detail=f"Invalid range min_days/max_days: {min_days} > {max_days}")
+    if (end - start).days >= CALENDAR_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {CALENDAR_MAX_DAYS} days")
+    destinations = tuple(sorted({code.strip().upper() for code in destination.split(",")})) if destination else None
+
+    def build():
+        with span("calendar.query"):
+            return get_price_calendar(snapshot).query(start, end, destinations, min_days, max_days)
+
+    key = ("calendar", start, end, destinations, min_days, max_days)
+    return cached_json_response(request, key, snapshot.version, build)
 
-cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
-retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
-openmeteo = openmeteo_requests.Client(session=retry_session)
 
 """
 @endpoint: GET /api/weather/{iata_code}
@@ -243,10 +613,16 @@ openmeteo = openmeteo_requests.Client(session=retry_session)
     - iata_code: Airport IATA code
     - departure_date: Start date (YYYY-MM-DD)
     - return_date: End date (YYYY-MM-DD)
+    - format (optional): 'arrow' for the daily climate series as an Arrow IPC stream, one row per
+      day (or send Accept: application/vnd.apache.arrow.stream)
+@notes: When Open-Meteo is rate limited or failing, the JSON summary is built from the cached
+    days of the range and marked "partial": true; with nothing cached the response is 503 with
+    a Retry-After header
 @usage: curl http://localhost:8000/api/weather/LHR?departure_date=2024-01-01&return_date=2024-01-07
 """
 @router.get("/weather/{iata_code}")
-async def get_weather(iata_code: str, departure_date: str = Query(...), return_date: str = Query(...)):
+async def get_weather(request: Request, iata_code: str, departure_date: str = Query(...), return_date: str = Query(...),
+                      response_format: str = Query(None, alias="format")):
     """
     Get weather forecast for an airport by IATA code.
     """
@@ -254,84 +630,102 @@ async def get_weather(iata_code: str, departure_date: str = Query(...), return_d
     if not coords:
         raise HTTPException(status_code=404, detail=f"Airport with IATA code {iata_code} not found")
 
-    latitude, longitude = coords
-
-    url = "https://climate-api.open-meteo.com/v1/climate"
-    params = {
-        "latitude": latitude,
-        "longitude": longitude,
-        "start_date": departure_date,
-        "end_date": return_date,
-        "daily": ["temperature_2m_mean", "cloud_cover_mean", "shortwave_radiation_sum", "rain_sum", "snowfall_sum"]
-    }
-    responses = openmeteo.weather_api(url, params=params)
-
-    if not responses:
-        raise HTTPException(status_code=500, detail="Failed to fetch weather data")
-
-    response = responses[0]
-    daily = response.Daily()
-    daily_temperature_2m_mean = daily.Variables(0).ValuesAsNumpy()
-    daily_cloud_cover_mean = daily.Variables(1).ValuesAsNumpy()
-    daily_shortwave_radiation_sum = daily.Variables(2).ValuesAsNumpy()
-    daily_rain_sum = daily.Variables(3).ValuesAsNumpy()
-    daily_snowfall_sum = daily.Variables(4).ValuesAsNumpy()
-
-    def safe_float(value):
-        if np.isnan(value) or np.isinf(value):
-            return None
-        return float(value)
-
-    average_temperature = safe_float(np.mean(daily_temperature_2m_mean))
-    avg_cloud_cover = safe_float(np.mean(daily_cloud_cover_mean))
-    avg_radiation = safe_float(np.mean(daily_shortwave_radiation_sum))
-    avg_rain = safe_float(np.mean(daily_rain_sum))
-    avg_snow = safe_float(np.mean(daily_snowfall_sum))
-
-    rainy_days = safe_float(np.sum(daily_rain_sum > 1.0))
-    snowy_days = safe_float(np.sum(daily_snowfall_sum > 0.1))
-    sunny_days = safe_float(np.sum((daily_cloud_cover_mean < 20) & (daily_shortwave_radiation_sum > 15)))
-    cloudy_days = safe_float(np.sum(daily_cloud_cover_mean > 50))
-    partly_cloudy_days = safe_float(np.sum((daily_cloud_cover_mean >= 20) & (daily_cloud_cover_mean <= 50)))
-
-    weather_conditions = {
-        "Rainy": rainy_days or 0, 
-        "Snowy": snowy_days or 0,
-        "Sunny": sunny_days or 0,
-        "Cloudy": cloudy_days or 0,
-        "Partly Clouded": partly_cloudy_days or 0
-    }
-
-    dominant_weather = max(weather_conditions.items(), key=lambda x: x[1])
-    weather_summary = dominant_weather[0]
-
-    def safe_list(arr):
-        return [safe_float(x) or 0 for x in arr] 
-
-    daily_temperature_2m_mean = safe_list(daily_temperature_2m_mean)
-    daily_cloud_cover_mean = safe_list(daily_cloud_cover_mean)
-    daily_shortwave_radiation_sum = safe_list(daily_shortwave_radiation_sum)
-    daily_rain_sum = safe_list(daily_rain_sum)
-    daily_snowfall_sum = safe_list(daily_snowfall_sum)
-
-    total_days = float(len(daily_temperature_2m_mean))
-    weather_data = {
-        "average_temperature": round(average_temperature or 0, 1), 
-        "dominant_climate": weather_summary,
-        "daily_temperature": daily_temperature_2m_mean,
-        "daily_cloud_cover": daily_cloud_cover_mean,
-        "daily_radiation_sum": daily_shortwave_radiation_sum,
-        "daily_rain_sum": daily_rain_sum,
-        "daily_snowfall_sum": daily_snowfall_sum,
-        "weather_breakdown": {
-            condition: {
-                "days": int(days),
-                "percentage": round((days / total_days * 100) if days and total_days else 0, 1)
-            } for condition, days in weather_conditions.items() if days > 0
-        }
-    }
+    start = _parse_date(departure_date, "departure_date", required=True)
+    end = _parse_date(return_date, "return_date", required=True)
+    if end < start:
+        raise HTTPException(status_code=400, detail="return_date must not be before departure_date")
+    departure_date, return_date = start.isoformat(), end.isoformat()
+    days = (end - start).days + 1
+
+    try:
+        with span("weather.fetch"):
+            series = await get_climate_series([coords], departure_date, return_date, partial=True)
+    except WeatherClientError:
+        series = None
+
+    # Arrow rows are positional days, so only a complete series can be sent
+    arrow = wants_arrow(request, response_format)
+    if not series or series[0] is None or (arrow and series[0].shape[1] < days):
+        raise HTTPException(status_code=503, detail="Weather data temporarily unavailable",
+                            headers={"Retry-After": str(max(1, round(weather_governor.retry_after())))})
+
+    if arrow:
+        return arrow_response(climate_table(series[0], departure_date, DAILY_VARIABLES))
 
-    return weather_data
+    with span("weather.summarize"):
+        summary = summarize(series[0])
+    if series[0].shape[1] < days:
+        summary["partial"] = True
+    return json_response(summary)
+
+
+WEATHER_MAX_CONCURRENCY = 8
+WEATHER_BATCH_SIZE = 10
+WEATHER_TIMEOUT_SECONDS = 15
+
+
+async def _destination_weather(snapshot, departure_date):
+    """
+    Weather summary per destination with a flight on departure_date, keyed by IATA code.
+    """
+    flights = snapshot.query(departure_date=departure_date or None)
+
+    # First flight per destination decides its return date, as before
+    trips = {}
+    for flight in flights:
+        if flight.destination not in trips:
+            trips[flight.destination] = flight.return_date
+
+    # Serve cached series directly; one request per (return date, batch of misses), run concurrently
+    destination_series = {}
+    batches = {}
+    for destination, return_date in trips.items():
+        coords = get_airport_coords(destination)
+        if not coords:
+            continue
+        series = cached_climate_series(coords, departure_date, return_date)
+        if series is None:
+            batches.setdefault(return_date, {})[destination] = coords
+        else:
+            destination_series[destination] = series
+
+    jobs = []
+    for return_date, destinations in batches.items():
+        items = list(destinations.items())
+        for i in range(0, len(items), WEATHER_BATCH_SIZE):
+            jobs.append((return_date, items[i:i + WEATHER_BATCH_SIZE]))
+
+    semaphore = asyncio.Semaphore(WEATHER_MAX_CONCURRENCY)
+
+    async def fetch(return_date, items):
+        async with semaphore:
+            try:
+                with span("weather.fetch_batch"):
+                    fetched = await asyncio.wait_for(
+                        get_climate_series([coords for _, coords in items], departure_date, return_date,
+                                           WEATHER_TIMEOUT_SECONDS, partial=True),
+                        timeout=WEATHER_TIMEOUT_SECONDS,
+                    )
+            except Exception:
+                count("weather.batch_failures")
+                return {}
+        return {destination: series for (destination, _), series in zip(items, fetched or []) if series is not None}
+
+    for fetched in await asyncio.gather(*(fetch(return_date, items) for return_date, items in jobs)):
+        destination_series.update(fetched)
+
+    # Series served from a partially cached range (upstream shed or failing) cover fewer days
+    partial = set()
+    for destination, series in destination_series.items():
+        days = date.fromisoformat(trips[destination]).toordinal() - date.fromisoformat(departure_date).toordinal() + 1
+        if series.shape[1] < days:
+            partial.add(destination)
+
+    with span("weather.summarize"):
+        summaries = dict(zip(destination_series, summarize_many(list(destination_series.values()))))
+    for destination in partial:
+        summaries[destination]["partial"] = True
+    return summaries
 
 
 """
@@ -346,106 +740,137 @@ async def get_weather(departure_date: str = Query(...)):
     """
     Get weather forecast for all destinations with flights on the specified departure date.
     """
-    flights = load_flight_data()
-    if not flights:
+    snapshot = get_flight_snapshot()
+    if not snapshot:
         raise HTTPException(status_code=404, detail="No flight data found")
 
-    if departure_date:
-        flights = [f for f in flights if f["departureDate"] == departure_date]
+    destination_weather_map = await _destination_weather(snapshot, departure_date)
 
-    destination_weather_map = {}
+    return json_response({
+        "departure_date": departure_date,
+        "destinations": destination_weather_map,
+        "total_destinations": len(destination_weather_map)
+    })
 
-    for flight in flights:
-        destination = flight["destination"]
 
-        if destination in destination_weather_map:
-            continue
+"""
+@endpoint: GET /api/dashboard
+@description: Get everything the PCP view needs for one departure date in a single response:
+    the enriched flight list, destination weather, travel advisories and visa requirements
+@parameters:
+    - departure_date: Departure date (YYYY-MM-DD)
+    - passports (optional): Comma-separated list of passport ISO country codes (e.g., 'US,GB')
+@usage: curl http://localhost:8000/api/dashboard?departure_date=2025-03-11&passports=US,GB
+"""
+@router.get("/dashboard")
+async def get_dashboard(
+        departure_date: str = Query(...),
+        passports: str = Query("", description="Comma-separated list of passport country codes")
+):
+    """
+    Get flights, weather, advisories and visa requirements for a departure date in one payload.
+    """
+    snapshot = get_flight_snapshot()
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="No flight data found")
 
-        coords = get_airport_coords(destination)
-        if not coords:
-            continue 
-
-        latitude, longitude = coords
-        return_date = flight["returnDate"]
-
-        url = "https://climate-api.open-meteo.com/v1/climate"
-        params = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "start_date": departure_date,
-            "end_date": return_date,
-            "daily": ["temperature_2m_mean", "cloud_cover_mean", "shortwave_radiation_sum", "rain_sum", "snowfall_sum"]
-        }
+    advisories = load_advisory_table()
+    visa_matrix = load_visa_matrix()
+    if not advisories or not visa_matrix:
+        raise HTTPException(status_code=404, detail="Advisory or visa data not found")
 
-        try:
-            responses = openmeteo.weather_api(url, params=params)
-
-            if not responses:
-                continue 
-
-            response = responses[0]
-            daily = response.Daily()
-            daily_temperature_2m_mean = daily.Variables(0).ValuesAsNumpy()
-            daily_cloud_cover_mean = daily.Variables(1).ValuesAsNumpy()
-            daily_shortwave_radiation_sum = daily.Variables(2).ValuesAsNumpy()
-            daily_rain_sum = daily.Variables(3).ValuesAsNumpy()
-            daily_snowfall_sum = daily.Variables(4).ValuesAsNumpy()
-
-            def safe_float(value):
-                if np.isnan(value) or np.isinf(value):
-                    return None
-                return float(value)
-
-            average_temperature = safe_float(np.mean(daily_temperature_2m_mean))
-
-            rainy_days = safe_float(np.sum(daily_rain_sum > 1.0))
-            snowy_days = safe_float(np.sum(daily_snowfall_sum > 0.1))
-            sunny_days = safe_float(np.sum((daily_cloud_cover_mean < 20) & (daily_shortwave_radiation_sum > 15)))
-            cloudy_days = safe_float(np.sum(daily_cloud_cover_mean > 50))
-            partly_cloudy_days = safe_float(np.sum((daily_cloud_cover_mean >= 20) & (daily_cloud_cover_mean <= 50)))
-
-            weather_conditions = {
-                "Rainy": rainy_days or 0,
-                "Snowy": snowy_days or 0,
-                "Sunny": sunny_days or 0,
-                "Cloudy": cloudy_days or 0,
-                "Partly Clouded": partly_cloudy_days or 0
-            }
-
-            dominant_weather = max(weather_conditions.items(), key=lambda x: x[1])
-            weather_summary = dominant_weather[0]
-
-            def safe_list(arr):
-                return [safe_float(x) or 0 for x in arr]
-
-            daily_temperature_2m_mean = safe_list(daily_temperature_2m_mean)
-            daily_cloud_cover_mean = safe_list(daily_cloud_cover_mean)
-            daily_shortwave_radiation_sum = safe_list(daily_shortwave_radiation_sum)
-            daily_rain_sum = safe_list(daily_rain_sum)
-            daily_snowfall_sum = safe_list(daily_snowfall_sum)
-
-            total_days = float(len(daily_temperature_2m_mean))
-
-            destination_weather_map[destination] = {
-                "average_temperature": round(average_temperature or 0, 1),
-                "dominant_climate": weather_summary,
-                "daily_temperature": daily_temperature_2m_mean,
-                "daily_cloud_cover": daily_cloud_cover_mean,
-                "daily_radiation_sum": daily_shortwave_radiation_sum,
-                "daily_rain_sum": daily_rain_sum,
-                "daily_snowfall_sum": daily_snowfall_sum,
-                "weather_breakdown": {
-                    condition: {
-                        "days": int(days),
-                        "percentage": round((days / total_days * 100) if days and total_days else 0, 1)
-                    } for condition, days in weather_conditions.items() if days > 0
-                }
-            }
-        except Exception as e:
-            continue
+    # Weather is the only part that may wait on the network; build the rest while it runs
+    weather = asyncio.create_task(_destination_weather(snapshot, departure_date))
+    await asyncio.sleep(0)
 
-    return {
+    filters = (None, None, departure_date)
+    positions = snapshot.query_positions(*filters)
+    passport_codes = visa_matrix.known_passports(passports.split(",")) if passports else []
+
+    # Sections reuse the pre-encoded payloads of the individual endpoints
+    flights = payload_cache.get(*_flight_list_entry(snapshot, filters, positions, 0, len(positions)))
+    advisory = payload_cache.get(*_travel_advisory_entry(snapshot, advisories))
+    visa = payload_cache.get(*_pcp_visa_entry(snapshot, visa_matrix, passport_codes, departure_date))
+
+    destination_weather_map = await weather
+    weather_body = encode({
         "departure_date": departure_date,
         "destinations": destination_weather_map,
         "total_destinations": len(destination_weather_map)
-    }
+    })
+
+    body = b"".join([
+        b'{"departure_date":', encode(departure_date),
+        b',"flights":', flights.body,
+        b',"weather":', weather_body,
+        b',"advisories":', advisory.body,
+        b',"visa":', visa.body,
+        b"}",
+    ])
+    return Response(content=body, media_type="application/json")
+
+
+"""
+@endpoint: GET /api/pcp
+@description: Get the parallel-coordinates dimensions for a departure date, one row per destination
+    (its cheapest flight): price, travel days, temperature, dominant climate, advisory and flight
+    count, read from the precomputed PCP cube, plus visa requirements for the given passports
+@parameters:
+    - departure_date: Departure date (YYYY-MM-DD)
+    - passports (optional): Comma-separated list of passport ISO country codes (e.g., 'US,GB')
+    - format (optional): 'arrow' for an Arrow IPC stream (or send Accept: application/vnd.apache.arrow.stream)
+@notes: Rows whose climate series is not cached yet have null temperature and climate and are
+    counted in missing_climate; the background materializer fetches them
+@usage: curl http://localhost:8000/api/pcp?departure_date=2025-03-11&passports=US,GB
+"""
+@router.get("/pcp")
+async def get_pcp(
+        request: Request,
+        departure_date: str = Query(...),
+        passports: str = Query("", description="Comma-separated list of passport country codes"),
+        response_format: str = Query(None, alias="format")
+):
+    """
+    Get the PCP rows of a departure date as columns; visa[i] lists row i's requirement per passport.
+    """
+    visa_matrix = load_visa_matrix()
+    if not visa_matrix:
+        raise HTTPException(status_code=404, detail="Visa data not found")
+    departure_date = _parse_date(departure_date, "departure_date", required=True).isoformat()
+    snapshot = get_flight_snapshot()
+    if departure_date not in snapshot.by_departure_date:
+        raise HTTPException(status_code=404, detail=f"No flights departing on {departure_date}")
+
+    # Only picks up changed inputs (e.g. climate cached since); never waits for upstream
+    refresh_pcp_cube([departure_date])
+    block = pcp_cube.get(departure_date)
+    passport_codes = visa_matrix.known_passports(passports.split(",")) if passports else []
+    key = ("pcp", departure_date, tuple(passport_codes))
+    version = (block.version, visa_file.version())
+
+    if wants_arrow(request, response_format):
+        def build_table():
+            table = pcp_cube.table([departure_date])
+            requirements, _ = block.visa(visa_matrix, passport_codes)
+            for i, passport in enumerate(passport_codes):
+                # Stays in days as strings, so each column has one type
+                table = table.append_column(f"visa_{passport}", [[str(row[i]) for row in requirements]])
+            return table
+
+        return cached_arrow_response(request, key, version, build_table)
+
+    def build():
+        requirements, best = block.visa(visa_matrix, passport_codes)
+        columns = block.columns()
+        columns["visa"] = requirements
+        columns["best_passport"] = [entry[0] if entry else None for entry in best]
+        columns["best_visa"] = [entry[1] if entry else None for entry in best]
+        return {
+            "departure_date": departure_date,
+            "passports": passport_codes,
+            "columns": columns,
+            "missing_climate": block.missing_climate,
+            "total": len(block)
+        }
+
+    return cached_json_response(request, key, version, build)
@@ -0,0 +1,322 @@
+"""
+Flight Track API - Flight Feed Ingestion Module
+
+This module ingests Amadeus flight-destination feeds dropped into a directory into the
+live flight store, without re-reading the base data file or restarting the API.
+
+Key Features:
+- Incremental JSON parsing: feed entries are streamed one at a time from the "data"
+  array through a bounded buffer, so a feed file is never held in memory as a whole
+- Records normalized to the compact FlightRecord form, with codes and dates interned
+- Deduplication on (origin, destination, departureDate, returnDate); the newest wins
+- Deltas merged into the store's live indexes in one atomic snapshot swap
+- Only new or modified feed files are read on each scan
+- A marker file records each applied delta, so other worker processes can follow the
+  process that scans with one stat instead of scanning the directory themselves
+- Optional download of feeds from the Amadeus API into the feed directory
+
+Usage:
+    python -m app.flight_ingest scan
+    python -m app.flight_ingest fetch --origin PAR --origin MAD
+
+Core Classes:
+- FeedFormatError: A feed file is not a valid flight-destination document
+- FeedIngestor: Scans a feed directory and applies new records to a FlightStore
+
+Core Functions:
+- iter_feed_entries: Stream the entries of a feed file
+- read_feed_records: Stream normalized FlightRecords from a feed file
+- fetch_feed: Download a flight-destination feed from Amadeus into the feed directory
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+from datetime import date
+from typing import Dict, Iterator, Tuple
+
+from .flight_store import DeltaStats, FlightRecord
+from .metrics import count, span
+
+FEED_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "feeds")
+MARKER_NAME = ".ingested"
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9eE.+-]*")
+_decoder = json.JSONDecoder()
+
+
+class FeedFormatError(ValueError):
+    """
+    Raised when a feed file is not a flight-destination document.
+    """
+
+
+class _JsonStream:
+    """
+    Reads JSON values one at a time from a text file through a bounded buffer.
+    """
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size):
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Skip whitespace and return the next character, or "" at the end of the file.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise FeedFormatError(f"Expected {char!r}, found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Incomplete value: read more, doubling so large values are not re-parsed many times
+                if self._fill(max(self.chunk_size, len(self.buffer))):
+                    continue
+                raise FeedFormatError(str(e)) from None
+            # A number cut off by the end of the buffer ("-3." of "-3.5") continues in the next chunk
+            if (isinstance(value, (int, float)) and not self.eof
+                    and _NUMBER_TAIL.match(self.buffer, end).end() == len(self.buffer)
+                    and self._fill(self.chunk_size)):
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise FeedFormatError(f"Expected ',' or ']', found {separator or 'end of file'!r}")
+
+
+def iter_feed_entries(file, chunk_size=CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Yield the entries of a feed's "data" array (or of a top-level array) one at a time.
+    Other top-level members, such as "dictionaries" and "meta", are parsed and skipped.
+    """
+    stream = _JsonStream(file, chunk_size)
+    if stream.peek() == "[":
+        yield from stream.array_items()
+        return
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key == "data" and stream.peek() == "[":
+            yield from stream.array_items()
+        else:
+            stream.value()
+        if stream.peek() != ",":
+            stream.expect("}")
+            return
+        stream.pos += 1
+
+
+def normalize_record(entry) -> FlightRecord:
+    """
+    Build a FlightRecord from a feed entry with upper-case codes, validated ISO dates and
+    interned repeating strings.
+    """
+    record = FlightRecord.from_dict(entry)
+    return record._replace(
+        origin=sys.intern(record.origin.strip().upper()),
+        destination=sys.intern(record.destination.strip().upper()),
+        departure_date=sys.intern(date.fromisoformat(record.departure_date).isoformat()),
+        return_date=sys.intern(date.fromisoformat(record.return_date).isoformat()),
+        type=sys.intern(record.type),
+    )
+
+
+def read_feed_records(path, chunk_size=CHUNK_SIZE) -> Tuple[Dict[tuple, FlightRecord], int]:
+    """
+    Stream a feed file into {record key: FlightRecord}, keeping the last entry per key.
+    Returns the records and the number of entries skipped as invalid.
+    """
+    records = {}
+    invalid = 0
+    with open(path, "r", encoding="utf-8") as file:
+        for entry in iter_feed_entries(file, chunk_size):
+            try:
+                record = normalize_record(entry)
+            except (KeyError, TypeError, ValueError, AttributeError):
+                invalid += 1
+                continue
+            records[record.key] = record
+    return records, invalid
+
+
+class FeedIngestor:
+    """
+    Applies new and modified feed files from a directory to a FlightStore.
+    """
+
+    def __init__(self, store, directory=FEED_DIR):
+        self.store = store
+        self.directory = directory
+        self._seen = {}
+        self._lock = threading.Lock()
+        self._marker_mtime = None
+
+    @property
+    def marker_path(self):
+        return os.path.join(self.directory, MARKER_NAME)
+
+    def _marker(self):
+        try:
+            return os.stat(self.marker_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _publish(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.marker_path, "a"):
+            pass
+        os.utime(self.marker_path)
+
+    def pending(self):
+        """
+        Return paths of .json feeds that are new or changed since they were last ingested.
+        """
+        try:
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return []
+        paths = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if not name.endswith(".json") or not os.path.isfile(path):
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # Removed since the listing
+                continue
+            if self._seen.get(path) != (stat.st_size, stat.st_mtime_ns):
+                paths.append(path)
+        return paths
+
+    def follow(self) -> DeltaStats:
+        """
+        Scan only if another process published a delta since the last follow(). Workers that
+        do not poll the directory themselves use this to pick up the feeds it applied.
+        """
+        marker = self._marker()
+        if marker is None or marker == self._marker_mtime:
+            return DeltaStats(0, 0, 0)
+        self._marker_mtime = marker
+        return self.scan()
+
+    def scan(self, publish=False) -> DeltaStats:
+        """
+        Ingest every pending feed, in name order, as one delta; returns the combined stats.
+        With publish, a delta that changed records also touches the marker file for follow().
+        """
+        with self._lock:
+            records = {}
+            versions = {}
+            for path in self.pending():
+                try:
+                    stat = os.stat(path)
+                    with span("ingest.parse"):
+                        feed_records, invalid = read_feed_records(path)
+                except (OSError, UnicodeDecodeError, FeedFormatError) as e:
+                    print(f"Skipping feed {os.path.basename(path)}: {e}")
+                    count("ingest.failed_files")
+                    continue
+                count("ingest.files")
+                count("ingest.invalid_records", invalid)
+                records.update(feed_records)
+                versions[path] = (stat.st_size, stat.st_mtime_ns)
+
+            stats = self.store.apply(records.values()) if records else DeltaStats(0, 0, 0)
+            self._seen.update(versions)
+            count("ingest.records_added", stats.added)
+            count("ingest.records_updated", stats.updated)
+            if publish and (stats.added or stats.updated):
+                self._publish()
+            return stats
+
+
+def fetch_feed(origin, directory=FEED_DIR, **params):
+    """
+    Download the Amadeus flight-destination feed for origin into directory; returns its path.
+    Credentials are read by the Amadeus client from AMADEUS_CLIENT_ID and AMADEUS_CLIENT_SECRET.
+    """
+    from amadeus import Client
+
+    response = Client().shopping.flight_destinations.get(origin=origin, **params)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{origin.upper()}-{date.today().isoformat()}.json")
+    # Write beside the target and rename, so a scan never reads a half-written feed
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(response.result, file)
+    os.replace(temp_path, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest Amadeus flight-destination feeds.")
+    parser.add_argument("--dir", default=FEED_DIR, help="Feed directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("scan", help="Parse every feed in the directory and report what it adds")
+    fetch = commands.add_parser("fetch", help="Download feeds from the Amadeus API into the directory")
+    fetch.add_argument("--origin", action="append", required=True, help="Origin IATA code (repeatable)")
+    args = parser.parse_args(argv)
+
+    if args.command == "fetch":
+        for origin in args.origin:
+            print(f"Saved {fetch_feed(origin, args.dir)}")
+        return
+
+    from .flight_service import flight_store
+
+    before = len(flight_store.snapshot())
+    stats = FeedIngestor(flight_store, args.dir).scan()
+    print(f"{before} records in the base data; feeds add {stats.added}, update {stats.updated}, "
+          f"repeat {stats.unchanged}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Flight Track API - Flight Search Module
+
+This module answers range and top-k price queries over a flight snapshot using columnar
+NumPy arrays built once per snapshot, instead of filtering dicts record by record.
+
+Key Features:
+- Price parsed to float once; dates stored as day ordinals; trip length precomputed
+- Origin and destination stored as small integer codes
+- Columns stored in price order, so price ranges are two binary searches
+- Date, trip length and airport predicates applied as vectorized masks
+- Top-k cheapest and cheapest flight per destination read straight off the price order
+
+Core Classes:
+- FlightColumns: Columnar view of a FlightSnapshot with search operations
+"""
+
+from datetime import date
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+def _parse_price(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _codes(values):
+    labels = sorted(set(values))
+    index = {label: i for i, label in enumerate(labels)}
+    return np.array([index[value] for value in values], dtype=np.int32), index
+
+
+class FlightColumns:
+    """
+    Columnar arrays over a snapshot's records, stored in ascending price order.
+    """
+
+    def __init__(self, snapshot):
+        records = snapshot.records
+        price = np.array([_parse_price(record.price_total) for record in records], dtype=np.float64)
+
+        # Sorted price index: every column is laid out cheapest first (ties by record position,
+        # unparsable prices last), so any filtered selection is already in price order
+        self.position = np.lexsort((np.arange(len(records)), price)).astype(np.int64)
+        self.price = price[self.position]
+        # Rows before this index have a parsable price; a price bound never matches the rest
+        self.priced = int(np.searchsorted(self.price, np.inf, "right"))
+
+        departure = np.array([date.fromisoformat(record.departure_date).toordinal() for record in records],
+                             dtype=np.int32)
+        travel_days = np.array([record.travel_days for record in records], dtype=np.int32)
+        origin, self.origin_index = _codes([record.origin for record in records])
+        destination, self.destination_index = _codes([record.destination for record in records])
+        self.departure = departure[self.position]
+        self.travel_days = travel_days[self.position]
+        self.origin = origin[self.position]
+        self.destination = destination[self.position]
+
+    def __len__(self):
+        return self.price.shape[0]
+
+    @staticmethod
+    def _allowed(index, labels):
+        allowed = np.zeros(len(index), dtype=bool)
+        allowed[[index[label] for label in labels if label in index]] = True
+        return allowed
+
+    def search(self, origins: Optional[Sequence[str]] = None, destinations: Optional[Sequence[str]] = None,
+               departure_from: Optional[date] = None, departure_to: Optional[date] = None,
+               min_price=None, max_price=None, min_days=None, max_days=None) -> np.ndarray:
+        """
+        Return price-order indexes of rows matching every given predicate (ranges inclusive).
+        """
+        # Price bounds are a contiguous slice of the price-ordered columns
+        lo = np.searchsorted(self.price, min_price, "left") if min_price is not None else 0
+        if max_price is not None:
+            hi = np.searchsorted(self.price, max_price, "right")
+        else:
+            hi = self.priced if min_price is not None else len(self)
+        hi = max(hi, lo)
+
+        mask = np.ones(hi - lo, dtype=bool)
+        if origins:
+            mask &= self._allowed(self.origin_index, origins)[self.origin[lo:hi]]
+        if destinations:
+            mask &= self._allowed(self.destination_index, destinations)[self.destination[lo:hi]]
+        if departure_from:
+            mask &= self.departure[lo:hi] >= departure_from.toordinal()
+        if departure_to:
+            mask &= self.departure[lo:hi] <= departure_to.toordinal()
+        if min_days is not None:
+            mask &= self.travel_days[lo:hi] >= min_days
+        if max_days is not None:
+            mask &= self.travel_days[lo:hi] <= max_days
+        return np.flatnonzero(mask) + lo
+
+    def cheapest(self, rows: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+        """
+        Return record positions of the k cheapest rows, cheapest first.
+        """
+        return self.position[rows[:k]]
+
+    def min_price_by_destination(self) -> dict:
+        """
+        Return {destination IATA code: lowest parsable price}.
+        """
+        codes, first = np.unique(self.destination, return_index=True)
+        labels = {code: label for label, code in self.destination_index.items()}
+        return {labels[code]: float(self.price[row]) for code, row in zip(codes.tolist(), first.tolist())
+                if not np.isnan(self.price[row])}
+
+    def cheapest_per_destination(self, rows: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+        """
+        Return record positions of the cheapest row per destination, cheapest destinations first.
+        """
+        # Rows are in price order, so the first row seen per destination is its cheapest
+        first = np.full(len(self.destination_index), rows.shape[0], dtype=np.int64)
+        np.minimum.at(first, self.destination[rows], np.arange(rows.shape[0]))
+        first = np.sort(first[first < rows.shape[0]])
+        return self.position[rows[first][:k]]
@@ -13,119 +13,534 @@ Key Features:
 
 Core Functions:
 - iata_to_location_info: Converts IATA codes to location details
+- resolve_many: Converts a batch of IATA codes to location details
 - load_advisory_data: Retrieves travel advisory information
+- load_advisory_table: Retrieves travel advisories as a normalized lookup table
 - load_visa_data: Fetches visa requirement data
+- load_visa_matrix: Fetches visa requirements as a dense lookup matrix
+- JsonDataFile: JSON data file re-parsed only when its modification time changes, read
+  from a memory-mapped Arrow copy when one is present
 - load_flight_data: Loads flight route information
+- get_flight_snapshot: Returns the indexed in-memory flight dataset
+- ingest_feeds: Applies new feed files from data/feeds to the live flight dataset
+- warm_flight_snapshot: Builds every derived view of a snapshot ahead of requests
+- get_flight_views: Returns prebuilt per-flight response dicts for a snapshot
+- iter_flight_views: Lazily builds per-flight response dicts for streaming
+- search_flights: Range, top-k and per-destination price queries over the flight data
 - iata_to_iso: Converts IATA airport codes to ISO country codes
 - get_airport_coords: Retrieves airport geographical coordinates
+- nearest_airports / airports_within: k-nearest and radius queries over all airports
+- destinations_within / destination_regions: Radius and grid-cell queries over flight destinations
+- get_route_geometry: Great-circle distance, bearing and path for every route of a snapshot
+- get_price_calendar: Minimum-price grid by destination, departure date and trip length,
+  patched from the previous snapshot's grid when a delta is ingested
+- refresh_pcp_cube: Brings the materialized PCP rows up to date with flights, advisories and
+  cached climate
+- fill_pcp_climate: Fetches the climate series missing from a departure date's PCP rows
+- preload: Builds every reference dataset up front
 
 Data Sources:
-- Local JSON files for flight data, advisories, and visa information
-- OpenFlights airport database for coordinate mapping
-- Airportsdata library for IATA code resolution
+- Local JSON files for flight data, advisories, and visa information, or Arrow copies of
+  the flight and visa files written by app.columnar
+- Local airport database (data/airports.sqlite) built from OpenFlights and
+  airportsdata by app.build_airport_db
 """
 
+import asyncio
 import os
 import json
+import threading
 from typing import Optional
-import pandas as pd
-import airportsdata
-import pycountry
+from functools import lru_cache
+from .advisory_table import AdvisoryTable
+from .airport_index import AirportIndex
+from .airport_resolver import AirportResolver
+from .columnar import columnar_path, read_table, visa_data, visa_matrix
+from .flight_ingest import FeedIngestor
+from .flight_search import FlightColumns
+from .flight_store import FlightStore, file_mtime
+from .metrics import count, span
+from .pcp_cube import PcpCube, build_block, cheapest_per_destination
+from .price_calendar import PriceCalendar
+from .route_geometry import RouteGeometry
+from .visa_matrix import VisaMatrix
+from . import weather_service
+from .weather_client import WeatherClientError
 
 
+class JsonDataFile:
+    """
+    A JSON data file parsed once per modification time, optionally compiled by transform.
+    With columnar_reader, an Arrow copy of the file (see app.columnar) is read instead
+    whenever it is at least as new as the JSON file; columnar_reader builds the loaded
+    value, transform included, straight from its table.
+    """
 
-airports = airportsdata.load('IATA')
+    def __init__(self, file_path, transform=None, columnar_reader=None):
+        self.file_path = file_path
+        self.transform = transform
+        self.columnar_reader = columnar_reader
+        self.columnar_path = columnar_path(file_path) if columnar_reader else None
+        self._mtime = None
+        self._data = None
 
+    def _source(self):
+        mtime = file_mtime(self.file_path)
+        if self.columnar_path:
+            columnar_mtime = file_mtime(self.columnar_path)
+            if columnar_mtime is not None and (mtime is None or columnar_mtime >= mtime):
+                return self.columnar_path, columnar_mtime
+        return self.file_path, mtime
+
+    def version(self) -> Optional[int]:
+        return self._source()[1]
+
+    def _read(self, path):
+        if path == self.columnar_path:
+            return self.columnar_reader(read_table(path))
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        return data if self.transform is None else self.transform(data)
+
+    def load(self):
+        path, mtime = self._source()
+        if mtime is None:
+            return None
+        if mtime != self._mtime:
+            count("data_file.miss")
+            try:
+                with span("data_file.load"):
+                    data = self._read(path)
+            except (FileNotFoundError, ValueError):
+                data = None
+            self._data, self._mtime = data, mtime
+        else:
+            count("data_file.hit")
+        return self._data
+
+
+ADVISORY_DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "countries-advisory.json")
+
+advisory_file = JsonDataFile(ADVISORY_DATA_PATH)
+advisory_table_file = JsonDataFile(ADVISORY_DATA_PATH, transform=AdvisoryTable)
+VISA_DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "visa-countries.json")
+
+visa_file = JsonDataFile(VISA_DATA_PATH, columnar_reader=visa_data)
+visa_matrix_file = JsonDataFile(VISA_DATA_PATH, transform=VisaMatrix, columnar_reader=visa_matrix)
 
-def iata_to_location_info(iata_code):
-    """
-    Get location information (city, country, ISO code) from IATA code.
-    """
-    if not iata_code:
-        return {"city_name": None, "country_name": None, "iso_code": None}
-
-    coords = get_airport_coords(iata_code)
-    latitude, longitude = None, None
-    if coords:
-        latitude, longitude = coords
-
-    airport = airports.get(iata_code.upper()) 
-    if airport:
-        iso_code = airport.get("country")
-        country_name = pycountry.countries.get(alpha_2=iso_code).name if iso_code else None
-        city_name = airport.get("city")
-        return {
-            "city_name": city_name,
-            "country_name": country_name,
-            "iso_code": iso_code,
-            "latitude" : latitude,
-            "longitude" : longitude
-        }
-    return {"city_name": None, "country_name": None, "iso_code": None}
 
 def load_advisory_data():
     """
     Load travel advisory data from countries-advisory.json.
     """
-    try:
-        file_path = os.path.join(os.path.dirname(__file__), "..", "data", "countries-advisory.json")
-        with open(file_path, "r", encoding="utf-8") as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return None
+    return advisory_file.load()
+
+
+def load_advisory_table() -> Optional[AdvisoryTable]:
+    """
+    Load travel advisory data compiled into a read-only lookup table with severity levels.
+    """
+    return advisory_table_file.load()
 
 
 def load_visa_data():
     """
-    Load visa requirements data from visa-countries.json.
+    Load visa requirements data from visa-countries.json (or its Arrow copy).
     """
-    try:
-        file_path = os.path.join(os.path.dirname(__file__), "..", "data", "visa-countries.json")
-        with open(file_path, "r", encoding="utf-8") as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return None
+    return visa_file.load()
+
+
+def load_visa_matrix() -> Optional[VisaMatrix]:
+    """
+    Load visa requirements compiled into a passport × destination matrix.
+    """
+    return visa_matrix_file.load()
+
+
+FLIGHT_DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "Lon-other.json")
+
+flight_store = FlightStore(FLIGHT_DATA_PATH, columnar_path(FLIGHT_DATA_PATH))
+feed_ingestor = FeedIngestor(flight_store)
+
+
+def get_flight_snapshot():
+    """
+    Get the current indexed flight dataset, reloading it if the file changed.
+    """
+    return flight_store.snapshot()
+
+
+_warmed_version = None
+
+
+def warm_flight_snapshot(snapshot):
+    """
+    Build every derived view of a snapshot, so requests do not pay for it.
+    """
+    global _warmed_version
+    get_flight_views(snapshot)
+    get_flight_columns(snapshot)
+    get_destination_prices(snapshot)
+    get_destination_index(snapshot)
+    get_route_geometry(snapshot)
+    get_price_calendar(snapshot)
+    _warmed_version = snapshot.version
+
+
+def ingest_feeds(follow=False):
+    """
+    Apply new or modified feed files to the flight dataset, then build the views of the
+    current snapshot if it is new, whether from a delta or a reloaded data file. Returns the
+    DeltaStats. With follow, the feed directory is only scanned when the process running the
+    feed poller has applied a delta since.
+    """
+    stats = feed_ingestor.follow() if follow else feed_ingestor.scan(publish=True)
+    snapshot = flight_store.snapshot()
+    if snapshot.version != _warmed_version:
+        warm_flight_snapshot(snapshot)
+        refresh_pcp_cube()
+    return stats
+
+
+def _build_flight_views(snapshot):
+    locations = resolve_many(snapshot.by_destination)
+    views = []
+    for record in snapshot.records:
+        flight = record.to_dict()
+        flight["destination_info"] = dict(locations[record.destination], travel_days=record.travel_days)
+        views.append(flight)
+    return tuple(views)
+
+
+def iter_flight_views(snapshot, positions):
+    """
+    Yield freshly built response dicts for the given record positions, one at a time.
+    """
+    resolver = get_airport_resolver()
+    locations = {}
+    for position in positions:
+        record = snapshot.records[position]
+        location_info = locations.get(record.destination)
+        if location_info is None:
+            location_info = locations[record.destination] = resolver.location_info(record.destination)
+        flight = record.to_dict()
+        flight["destination_info"] = dict(location_info, travel_days=record.travel_days)
+        yield flight
+
+
+def get_flight_views(snapshot):
+    """
+    Get the response dict (with destination_info) for every record of the snapshot, built once
+    per snapshot. The dicts are shared across requests and must not be mutated.
+    """
+    with span("flight_views.get"):
+        return snapshot.derived("flight_views", _build_flight_views)
+
+
+def get_flight_columns(snapshot) -> FlightColumns:
+    """
+    Get the columnar search arrays for a snapshot, built once per snapshot.
+    """
+    return snapshot.derived("flight_columns", FlightColumns)
+
+
+def search_flights(snapshot, origins=None, destinations=None, departure_from=None, departure_to=None,
+                   min_price=None, max_price=None, min_days=None, max_days=None, limit=20, group_by=None):
+    """
+    Get positions of the cheapest matching flights, or of the cheapest flight per destination
+    when group_by is "destination", together with the total number of matches.
+    """
+    columns = get_flight_columns(snapshot)
+    with span("flights.search"):
+        return _search_columns(columns, origins, destinations, departure_from, departure_to,
+                               min_price, max_price, min_days, max_days, limit, group_by)
+
+
+def _search_columns(columns, origins, destinations, departure_from, departure_to,
+                    min_price, max_price, min_days, max_days, limit, group_by):
+    rows = columns.search(origins, destinations, departure_from, departure_to,
+                          min_price, max_price, min_days, max_days)
+    if group_by == "destination":
+        grouped = columns.cheapest_per_destination(rows)
+        return grouped[:limit].tolist(), len(grouped)
+    return columns.cheapest(rows, limit).tolist(), len(rows)
 
 
 def load_flight_data():
-    try:
-        file_path = os.path.join(os.path.dirname(__file__), "..", "data", "Lon-other.json")
-        print(f"Looking for file at: {file_path}")  
-        with open(file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)["data"]
-            if not data:
-                return None
-            return data
-    except FileNotFoundError:
-        print("File not found!")  
-        return None
-    except json.JSONDecodeError:
-        print("Invalid JSON file!")
+    """
+    Load flight route information as a list of dicts in the feed's original shape.
+    """
+    records = flight_store.snapshot().records
+    if not records:
         return None
+    return [record.to_dict() for record in records]
 
 
-airports = airportsdata.load('IATA')
+AIRPORT_DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "airports.sqlite")
 
 
-def iata_to_iso(iata_code):
-    airport = airports.get(iata_code.upper())  
-    return airport['country'] if airport else None  
+@lru_cache(maxsize=None)
+def get_airport_resolver():
+    """
+    Get the airport resolver, reading the local airport database on first use.
+    """
+    return AirportResolver.from_db(AIRPORT_DB_PATH)
 
 
-AIRPORTS_URL = "https://raw.githubusercontent.com/jpatokal/openflights/master/data/airports.dat"
-AIRPORTS_COLUMNS = [
-    "ID", "Name", "City", "Country", "IATA", "ICAO", "Latitude", "Longitude",
-    "Altitude", "Timezone", "DST", "TZ_DB", "Type", "Source"
-]
+def iata_to_location_info(iata_code):
+    """
+    Get location information (city, country, ISO code) from IATA code.
+    """
+    return get_airport_resolver().location_info(iata_code)
 
-airports_df = pd.read_csv(AIRPORTS_URL, names=AIRPORTS_COLUMNS, header=None)
+
+def resolve_many(codes):
+    """
+    Get location information for many IATA codes at once, keyed by code.
+    """
+    with span("airports.resolve_many"):
+        return get_airport_resolver().resolve_many(codes)
+
+
+def iata_to_iso(iata_code):
+    return get_airport_resolver().iso_code(iata_code)
 
 
 def get_airport_coords(iata_code: str) -> Optional[tuple[float, float]]:
     """
     Get latitude and longitude for an airport by IATA code.
     """
-    airport = airports_df[airports_df["IATA"] == iata_code]
-    if not airport.empty:
-        return float(airport.iloc[0]["Latitude"]), float(airport.iloc[0]["Longitude"])
-    return None
\ No newline at end of file
+    return get_airport_resolver().coords(iata_code)
+
+
+@lru_cache(maxsize=None)
+def get_airport_index() -> AirportIndex:
+    """
+    Get the spatial index over every airport's coordinates, built on first use.
+    """
+    return AirportIndex.from_airports(get_airport_resolver())
+
+
+def get_destination_prices(snapshot):
+    """
+    Get {destination: cheapest price} for a snapshot, built once per snapshot.
+    """
+    return snapshot.derived("destination_prices",
+                            lambda snapshot: get_flight_columns(snapshot).min_price_by_destination())
+
+
+def get_destination_index(snapshot) -> AirportIndex:
+    """
+    Get the spatial index over the snapshot's destinations, built once per snapshot.
+    """
+    def build(snapshot):
+        resolver = get_airport_resolver()
+        return AirportIndex(
+            (code,) + resolver.coords(code) for code in snapshot.by_destination if resolver.coords(code)
+        )
+
+    return snapshot.derived("destination_index", build)
+
+
+def _airport_matches(index, positions, distances):
+    resolver = get_airport_resolver()
+    return [(resolver.get(code), round(float(distance), 1))
+            for code, distance in zip(index.codes[positions], distances)]
+
+
+def nearest_airports(latitude, longitude, k):
+    """
+    Get [(AirportInfo, distance_km)] for the k airports nearest to a point, nearest first.
+    """
+    index = get_airport_index()
+    with span("airports.nearest"):
+        return _airport_matches(index, *index.nearest(latitude, longitude, k))
+
+
+def airports_within(latitude, longitude, radius_km):
+    """
+    Get [(AirportInfo, distance_km)] for every airport within radius_km of a point, nearest first.
+    """
+    index = get_airport_index()
+    with span("airports.within"):
+        return _airport_matches(index, *index.within(latitude, longitude, radius_km))
+
+
+def destinations_within(snapshot, latitude, longitude, radius_km):
+    """
+    Get [(AirportInfo, distance_km)] for the snapshot's destinations within radius_km, nearest first.
+    """
+    index = get_destination_index(snapshot)
+    with span("destinations.within"):
+        return _airport_matches(index, *index.within(latitude, longitude, radius_km))
+
+
+def destination_regions(snapshot, cell_degrees):
+    """
+    Group the snapshot's destinations into latitude/longitude cells of cell_degrees.
+    Returns [(center latitude, center longitude, [IATA codes])], largest groups first.
+    """
+    index = get_destination_index(snapshot)
+    regions = []
+    for positions in index.groups(cell_degrees).values():
+        regions.append((float(index.latitudes[positions].mean()), float(index.longitudes[positions].mean()),
+                        sorted(index.codes[positions].tolist())))
+    regions.sort(key=lambda region: (-len(region[2]), region[2][0]))
+    return regions
+
+
+def get_route_geometry(snapshot) -> RouteGeometry:
+    """
+    Get the geometry of every (origin, destination) route in a snapshot, built once per snapshot.
+    Routes with an airport missing from the airport database are left out.
+    """
+    def build(snapshot):
+        resolver = get_airport_resolver()
+        routes = []
+        for origin, destination in {(record.origin, record.destination) for record in snapshot.records}:
+            start, end = resolver.coords(origin), resolver.coords(destination)
+            if start and end:
+                routes.append((origin, destination) + start + end)
+        with span("routes.build"):
+            return RouteGeometry(routes)
+
+    return snapshot.derived("route_geometry", build)
+
+
+# Source (mtime, generation, records) and calendar of the newest snapshot built, for patching
+_price_calendar = (None, None)
+_price_calendar_lock = threading.Lock()
+
+
+def get_price_calendar(snapshot) -> PriceCalendar:
+    """
+    Get the minimum-price calendar of a snapshot, built once per snapshot. A snapshot that
+    only adds to or updates the previous one's records (an ingested delta) gets the previous
+    calendar with the touched cells rebuilt; a reloaded file gets a full build.
+    """
+    def build(snapshot):
+        global _price_calendar
+        # Only the hand-off is locked, so a slow build never holds up other snapshots' calendars
+        with _price_calendar_lock:
+            source, calendar = _price_calendar
+        if (source is not None and source[0] == snapshot.mtime and source[1] < snapshot.generation
+                and len(source[2]) <= len(snapshot.records)):
+            # apply() keeps unchanged records as the same objects, so identity finds the delta
+            records = source[2]
+            changed = [new for old, new in zip(records, snapshot.records) if old is not new]
+            changed.extend(snapshot.records[len(records):])
+            with span("price_calendar.update"):
+                calendar = calendar.updated(changed, lambda destination, departure_date: snapshot.query(
+                    destination=destination, departure_date=departure_date))
+            count("price_calendar.updated_records", len(changed))
+        elif source is None or source[:2] != (snapshot.mtime, snapshot.generation):
+            with span("price_calendar.build"):
+                calendar = PriceCalendar.build(get_flight_columns(snapshot))
+        with _price_calendar_lock:
+            # A build for an older snapshot that finishes last must not replace a newer source
+            newest = _price_calendar[0]
+            if newest is None or (newest[0] or 0, newest[1]) <= (snapshot.mtime or 0, snapshot.generation):
+                _price_calendar = ((snapshot.mtime, snapshot.generation, snapshot.records), calendar)
+        return calendar
+
+    return snapshot.derived("price_calendar", build)
+
+
+pcp_cube = PcpCube()
+PCP_CLIMATE_BATCH_SIZE = 10
+PCP_CLIMATE_TIMEOUT_SECONDS = 15
+
+
+def _pcp_rows(snapshot, departure_date):
+    return cheapest_per_destination(snapshot.query(departure_date=departure_date))
+
+
+def _pcp_climate(rows):
+    resolver = get_airport_resolver()
+    climate_cache = weather_service.climate_cache
+    series = []
+    for record in rows:
+        coords = resolver.coords(record.destination)
+        series.append(climate_cache.get(*coords, record.departure_date, record.return_date) if coords else None)
+    return series
+
+
+def refresh_pcp_cube(departure_dates=None) -> int:
+    """
+    Rebuild the PCP rows of departure dates (all in the flight data by default; dates without
+    flights are ignored) whose flights, advisories or cached climate changed, without network
+    I/O. Returns the number rebuilt.
+    """
+    snapshot = flight_store.snapshot()
+    advisories = load_advisory_table()
+    advisory_version = advisory_table_file.version()
+    climate_cache = weather_service.climate_cache
+    sources = (snapshot.version, advisory_version, id(climate_cache), climate_cache.generation)
+
+    def inputs(departure_date):
+        rows, counts = _pcp_rows(snapshot, departure_date)
+        known = tuple(series is not None for series in _pcp_climate(rows))
+        return rows, counts, advisory_version, known
+
+    def build(departure_date, current):
+        rows, counts, _, _ = current
+        return build_block(departure_date, rows, counts, resolve_many({record.destination for record in rows}),
+                           advisories, _pcp_climate(rows))
+
+    if departure_dates is None:
+        departure_dates = snapshot.departure_dates
+        pcp_cube.retain(departure_dates)
+    else:
+        # Blocks only for dates with flights, so arbitrary requested dates cannot grow the cube
+        departure_dates = [day for day in departure_dates if day in snapshot.by_departure_date]
+    rebuilt = 0
+    with span("pcp_cube.refresh"):
+        for departure_date in departure_dates:
+            rebuilt += pcp_cube.refresh(departure_date, sources, lambda: inputs(departure_date),
+                                        lambda current: build(departure_date, current))
+    count("pcp_cube.rebuilt_dates", rebuilt)
+    return rebuilt
+
+
+async def fill_pcp_climate(departure_date) -> int:
+    """
+    Fetch the climate series missing from a departure date's PCP rows into the climate cache,
+    then refresh that date. Returns the number of series still missing.
+    """
+    block = pcp_cube.get(departure_date)
+    if block is None or not block.missing_climate:
+        return 0
+
+    resolver = get_airport_resolver()
+    rows, _, _, known = block.inputs
+    batches = {}
+    for record, is_known in zip(rows, known):
+        coords = resolver.coords(record.destination)
+        if not is_known and coords:
+            batches.setdefault(record.return_date, []).append(coords)
+
+    for return_date, coords in batches.items():
+        for i in range(0, len(coords), PCP_CLIMATE_BATCH_SIZE):
+            try:
+                await weather_service.get_climate_series(coords[i:i + PCP_CLIMATE_BATCH_SIZE], departure_date,
+                                                         return_date, PCP_CLIMATE_TIMEOUT_SECONDS)
+            except (WeatherClientError, asyncio.TimeoutError):
+                count("pcp_cube.climate_failures")
+
+    refresh_pcp_cube([departure_date])
+    return pcp_cube.get(departure_date).missing_climate
+
+
+def preload():
+    """
+    Load and index every reference dataset, so later requests (and forked workers) find them built.
+    """
+    get_airport_resolver()
+    get_airport_index()
+    ingest_feeds()
+    warm_flight_snapshot(flight_store.snapshot())
+    load_visa_data()
+    load_visa_matrix()
+    load_advisory_data()
+    load_advisory_table()
+    refresh_pcp_cube()
@@ -0,0 +1,349 @@
+"""
+Flight Track API - Flight Store Module
+
+This module keeps the flight-destination dataset in memory for the lifetime of the
+process, so request handlers no longer re-open and re-parse the JSON file.
+
+Key Features:
+- Typed, compact flight records built once per file version
+- Hash indexes on origin, destination and departure date
+- Sorted list of departure dates for ordered/range access
+- Filters resolved as index intersections instead of linear scans
+- Atomic reload when the data file's modification time changes
+- Reads a memory-mapped Arrow copy of the data file (see app.columnar) instead of the
+  JSON file when the copy is at least as new
+- Deltas of new or updated records applied on top of the live indexes, deduplicated on
+  (origin, destination, departure date, return date), and kept across reloads until the
+  base file is rewritten after them with a record of the same key, which then wins
+- Per-snapshot cache of derived views, dropped together with the snapshot
+
+Core Classes:
+- FlightRecord: Immutable record for a single flight-destination entry
+- FlightSnapshot: One loaded version of the dataset together with its indexes
+- DeltaStats: Counts of records added, updated and unchanged by a delta
+- FlightStore: Process-wide holder that swaps snapshots when the file changes or a delta arrives
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import NamedTuple, Optional, Tuple
+
+from .metrics import span
+
+
+class FlightRecord(NamedTuple):
+    """
+    A single flight-destination entry as found in the Amadeus feed, plus its travel_days.
+    """
+    type: str
+    origin: str
+    destination: str
+    departure_date: str
+    return_date: str
+    price_total: str
+    flight_dates_link: str
+    flight_offers_link: str
+    travel_days: int
+
+    @classmethod
+    def from_dict(cls, item):
+        price = item.get("price") or {}
+        links = item.get("links") or {}
+        travel_days = (date.fromisoformat(item["returnDate"]) - date.fromisoformat(item["departureDate"])).days
+        return cls(
+            item.get("type", "flight-destination"),
+            item["origin"],
+            item["destination"],
+            item["departureDate"],
+            item["returnDate"],
+            price.get("total"),
+            links.get("flightDates"),
+            links.get("flightOffers"),
+            travel_days,
+        )
+
+    @property
+    def key(self):
+        """
+        Identity of a flight offer; a newer record with the same key replaces the older one.
+        """
+        return self.origin, self.destination, self.departure_date, self.return_date
+
+    def to_dict(self):
+        """
+        Build a fresh dict in the shape of the original feed entry.
+        """
+        return {
+            "type": self.type,
+            "origin": self.origin,
+            "destination": self.destination,
+            "departureDate": self.departure_date,
+            "returnDate": self.return_date,
+            "price": {"total": self.price_total},
+            "links": {
+                "flightDates": self.flight_dates_link,
+                "flightOffers": self.flight_offers_link,
+            },
+        }
+
+
+def _build_index(records, field):
+    index = {}
+    for position, record in enumerate(records):
+        index.setdefault(getattr(record, field), []).append(position)
+    return {key: tuple(positions) for key, positions in index.items()}
+
+
+class DeltaStats(NamedTuple):
+    """
+    Outcome of applying a batch of records to a snapshot.
+    """
+    added: int
+    updated: int
+    unchanged: int
+
+
+INDEXED_FIELDS = ("origin", "destination", "departure_date")
+
+
+class FlightSnapshot:
+    """
+    An immutable, fully indexed version of the flight dataset.
+    """
+    __slots__ = ("records", "by_origin", "by_destination", "by_departure_date", "departure_dates", "mtime",
+                 "generation", "_derived", "_derived_lock", "_derived_locks")
+
+    def __init__(self, records, mtime=None, generation=0, indexes=None):
+        self.records = tuple(records)
+        if indexes is None:
+            indexes = [_build_index(self.records, field) for field in INDEXED_FIELDS]
+        self.by_origin, self.by_destination, self.by_departure_date = indexes
+        self.departure_dates = sorted(self.by_departure_date)
+        self.mtime = mtime
+        self.generation = generation
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+        self._derived_locks = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def version(self):
+        """
+        Changes whenever the records do: on a file reload and on every applied delta.
+        """
+        return self.mtime, self.generation
+
+    def record_keys(self):
+        """
+        Return {record key: position}; with duplicate keys the last position wins.
+        """
+        return self.derived("record_keys", lambda snapshot: {
+            record.key: position for position, record in enumerate(snapshot.records)
+        })
+
+    def apply(self, records):
+        """
+        Return (snapshot, DeltaStats) with records merged in: a record whose key is already
+        present replaces it in place, a new one is appended. Indexes of the new snapshot are
+        extended from this one's rather than rebuilt; self is returned when nothing changed.
+        """
+        keys = dict(self.record_keys())
+        merged = list(self.records)
+        added, updated, unchanged = [], 0, 0
+        for record in records:
+            position = keys.get(record.key)
+            if position is None:
+                keys[record.key] = len(merged)
+                added.append(len(merged))
+                merged.append(record)
+            elif merged[position] != record:
+                merged[position] = record
+                updated += 1
+            else:
+                unchanged += 1
+
+        stats = DeltaStats(len(added), updated, unchanged)
+        if not added and not updated:
+            return self, stats
+
+        indexes = []
+        for field, index in zip(INDEXED_FIELDS, (self.by_origin, self.by_destination, self.by_departure_date)):
+            new_postings = {}
+            for position in added:
+                new_postings.setdefault(getattr(merged[position], field), []).append(position)
+            index = dict(index)
+            for value, positions in new_postings.items():
+                index[value] = index.get(value, ()) + tuple(positions)
+            indexes.append(index)
+
+        snapshot = FlightSnapshot(merged, self.mtime, self.generation + 1, indexes)
+        snapshot._derived["record_keys"] = keys
+        return snapshot, stats
+
+    def query(self, origin=None, destination=None, departure_date=None):
+        """
+        Return records matching every given filter, in file order.
+        """
+        return [self.records[position] for position in self.query_positions(origin, destination, departure_date)]
+
+    def query_positions(self, origin=None, destination=None, departure_date=None):
+        """
+        Return positions of records matching every given filter, in file order.
+        """
+        postings = []
+        for index, key in ((self.by_origin, origin), (self.by_destination, destination),
+                           (self.by_departure_date, departure_date)):
+            if key is None:
+                continue
+            positions = index.get(key)
+            if not positions:
+                return []
+            postings.append(positions)
+
+        if not postings:
+            return range(len(self.records))
+
+        postings.sort(key=len)
+        selected = postings[0]
+        for other in postings[1:]:
+            other = set(other)
+            selected = [position for position in selected if position in other]
+        return selected
+
+    def derived(self, name, factory):
+        """
+        Return factory(self), computed once per snapshot and cached under name. Each name has
+        its own lock, so a factory may use other derived values of the same snapshot.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                lock = self._derived_locks.setdefault(name, threading.Lock())
+            with lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = factory(self)
+                    self._derived[name] = value
+        return value
+
+    def dates_between(self, start=None, end=None):
+        """
+        Return the known departure dates within [start, end] (ISO strings, inclusive).
+        """
+        lo = bisect_left(self.departure_dates, start) if start else 0
+        hi = bisect_right(self.departure_dates, end) if end else len(self.departure_dates)
+        return self.departure_dates[lo:hi]
+
+
+EMPTY_SNAPSHOT = FlightSnapshot(())
+
+
+def file_mtime(path) -> Optional[int]:
+    """
+    Return path's modification time in nanoseconds, or None if it does not exist.
+    """
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def read_flight_file(file_path):
+    """
+    Parse a flight-destination JSON file, or its Arrow copy, into a list of FlightRecord.
+    """
+    if file_path.endswith(".arrow"):
+        from .columnar import flight_records, read_table
+
+        return flight_records(read_table(file_path))
+    with open(file_path, "r", encoding="utf-8") as file:
+        data = json.load(file).get("data") or []
+    return [FlightRecord.from_dict(item) for item in data]
+
+
+class FlightStore:
+    """
+    Process-wide flight dataset, reloaded atomically when the source file changes.
+    """
+
+    def __init__(self, file_path, columnar_path=None):
+        self.file_path = file_path
+        self.columnar_path = columnar_path
+        self._snapshot = None
+        self._lock = threading.Lock()
+        # Every record applied as a delta, by key, with the time it was applied (ns), so it
+        # survives reloads of the base file unless the file was rewritten with that key since
+        self._applied = {}
+
+    def _current_source(self) -> Tuple[str, Optional[int]]:
+        """
+        Return (path, mtime) of the file to load: the Arrow copy if it is at least as new as
+        the JSON file, so editing the JSON file takes over from a stale copy.
+        """
+        mtime = file_mtime(self.file_path)
+        if self.columnar_path:
+            columnar_mtime = file_mtime(self.columnar_path)
+            if columnar_mtime is not None and (mtime is None or columnar_mtime >= mtime):
+                return self.columnar_path, columnar_mtime
+        return self.file_path, mtime
+
+    def snapshot(self) -> FlightSnapshot:
+        """
+        Return the current snapshot, loading or reloading it if the file changed.
+        """
+        snapshot = self._snapshot
+        path, mtime = self._current_source()
+        if snapshot is not None and snapshot.mtime == mtime:
+            return snapshot
+
+        with self._lock:
+            return self._refresh(path, mtime)
+
+    def _refresh(self, path, mtime):
+        # Caller holds self._lock
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.mtime == mtime:
+            return snapshot
+        if mtime is None:
+            print("File not found!")
+            snapshot = EMPTY_SNAPSHOT
+        else:
+            try:
+                with span("flight_store.load"):
+                    snapshot = FlightSnapshot(read_flight_file(path), mtime)
+            except (json.JSONDecodeError, KeyError, AttributeError, ValueError):
+                print("Invalid JSON file!")
+                snapshot = FlightSnapshot((), mtime)
+        if self._applied:
+            # The Arrow copy is exported from the JSON file, so the JSON mtime dates the base data
+            base_mtime = file_mtime(self.file_path) or mtime or 0
+            keys = snapshot.record_keys()
+            self._applied = {key: (record, applied_at) for key, (record, applied_at) in self._applied.items()
+                             if key not in keys or applied_at >= base_mtime}
+            snapshot, _ = snapshot.apply(record for record, _ in self._applied.values())
+        self._snapshot = snapshot
+        return snapshot
+
+    def apply(self, records) -> DeltaStats:
+        """
+        Merge records into the live snapshot without reloading the file; readers holding the
+        previous snapshot keep a consistent view of it.
+        """
+        records = list(records)
+        with self._lock:
+            snapshot = self._refresh(*self._current_source())
+            with span("flight_store.apply"):
+                self._snapshot, stats = snapshot.apply(records)
+            applied_at = time.time_ns()
+            for record in records:
+                self._applied[record.key] = (record, applied_at)
+        return stats
+
+    def query(self, origin=None, destination=None, departure_date=None):
+        return self.snapshot().query(origin, destination, departure_date)
@@ -0,0 +1,215 @@
+"""
+Flight Track API - Metrics Module
+
+This module records where request time goes: per-endpoint latency, timed stages inside
+the services, cache hits and misses and upstream call counts. It also keeps an opt-in
+per-request stage breakdown.
+
+Key Features:
+- Fixed-bucket latency histograms with count, sum, max and percentile estimates
+- span() context manager timing a named stage, also from worker threads
+- Named counters, with hit ratios derived for every "<name>.hit"/"<name>.miss" pair
+- Gauges: callables registered by components and read when metrics are requested
+- ASGI middleware timing every request by route template
+- ?profile=1 returns the request's stage breakdown in a Server-Timing header
+
+Metrics are per process; with several workers each one reports its own.
+
+Core Classes:
+- Histogram: Latency histogram over fixed millisecond buckets
+- MetricsRegistry: Process-wide histograms and counters
+- MetricsMiddleware: ASGI middleware recording request latency and profiles
+
+Core Functions:
+- span: Time a block as a named stage
+- count: Increment a named counter
+- gauge: Register a callable reporting a component's current state
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+_profile: ContextVar[Optional[list]] = ContextVar("profile", default=None)
+
+
+class Histogram:
+    """
+    Latency histogram over BUCKETS_MS; percentiles are reported as bucket upper bounds.
+    """
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= rank:
+                return round(min(bound, self.max), 3)
+        return round(self.max, 3)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "max_ms": round(self.max, 3),
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): n
+                for bound, n in zip(BUCKETS_MS, self.counts) if n
+            },
+        }
+
+
+class MetricsRegistry:
+    """
+    Process-wide endpoint and stage histograms, named counters and registered gauges.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.gauges = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+            self.stages = {}
+            self.counters = {}
+
+    def observe(self, table, name, ms):
+        with self._lock:
+            histogram = table.get(name)
+            if histogram is None:
+                histogram = table[name] = Histogram()
+            histogram.observe(ms)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, read):
+        """
+        Register read() to report name's current value; reset() keeps registrations.
+        """
+        with self._lock:
+            self.gauges[name] = read
+
+    def snapshot(self):
+        with self._lock:
+            gauges = dict(self.gauges)
+        gauges = {name: read() for name, read in sorted(gauges.items())}
+        with self._lock:
+            counters = dict(self.counters)
+            ratios = {}
+            for name in counters:
+                if name.endswith(".hit"):
+                    base = name[:-len(".hit")]
+                    hits, misses = counters[name], counters.get(base + ".miss", 0)
+                    ratios[base] = round(hits / (hits + misses), 4) if hits + misses else None
+            return {
+                "endpoints": {name: h.to_dict() for name, h in sorted(self.endpoints.items())},
+                "stages": {name: h.to_dict() for name, h in sorted(self.stages.items())},
+                "counters": dict(sorted(counters.items())),
+                "cache_hit_ratios": dict(sorted(ratios.items())),
+                "gauges": gauges,
+            }
+
+
+metrics = MetricsRegistry()
+
+
+def count(name, n=1):
+    metrics.count(name, n)
+
+
+def gauge(name, read):
+    metrics.gauge(name, read)
+
+
+@contextmanager
+def span(name):
+    """
+    Time the enclosed block as stage name, adding it to the request profile when enabled.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        metrics.observe(metrics.stages, name, ms)
+        profile = _profile.get()
+        if profile is not None:
+            profile.append((name, ms))
+
+
+def _server_timing(profile, total_ms):
+    totals = {}
+    for name, ms in profile:
+        calls, spent = totals.get(name, (0, 0.0))
+        totals[name] = (calls + 1, spent + ms)
+    entries = [f'{name.replace(".", "-")};dur={spent:.3f};desc="{calls}x"' for name, (calls, spent) in totals.items()]
+    entries.append(f"total;dur={total_ms:.3f}")
+    return ", ".join(entries)
+
+
+class MetricsMiddleware:
+    """
+    Record latency per "METHOD /route/template"; with ?profile=1 attach a Server-Timing header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiling = b"profile=1" in scope.get("query_string", b"").split(b"&")
+        profile = [] if profiling else None
+        token = _profile.set(profile)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if profiling:
+                    total_ms = (time.perf_counter() - start) * 1000
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(profile, total_ms).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _profile.reset(token)
+            route = scope.get("route")
+            name = f'{scope["method"]} {route.path}' if route is not None else "unmatched"
+            metrics.observe(metrics.endpoints, name, (time.perf_counter() - start) * 1000)
+            if status >= 500:
+                metrics.count("http.errors")
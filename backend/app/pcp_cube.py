@@ -0,0 +1,220 @@
+"""
+Flight Track API - PCP Cube Module
+
+This module materializes the parallel-coordinates (PCP) view's dimensions ahead of
+requests: one row per (departure date, destination) with price, trip length, climate,
+advisory and flight count, so a request only slices a date and joins the visa column for
+its passports.
+
+Key Features:
+- One columnar block per departure date, with NumPy columns for the numeric dimensions
+- Each row describes the destination's cheapest flight on that date
+- Blocks rebuilt one date at a time and only when that date's inputs changed: its flights,
+  the advisory data version, or which of its climate series are cached
+- Cheap input versions checked first, so an unchanged date costs one tuple comparison
+- Visa requirements joined per request from the visa matrix, since they depend on passports
+- Whole cube exportable as one Arrow table
+
+Core Classes:
+- PcpBlock: Materialized rows of one departure date
+- PcpCube: Per-date blocks with incremental refresh
+
+Core Functions:
+- cheapest_per_destination: The cheapest flight per destination among records
+- build_block: Materialize one departure date's rows
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .advisory_table import UNKNOWN_LEVEL
+from .weather_summary import CONDITIONS, climate_stats
+
+UNKNOWN_CLIMATE = -1
+
+
+def _price(record):
+    try:
+        return float(record.price_total)
+    except (TypeError, ValueError):
+        return np.inf
+
+
+def cheapest_per_destination(records) -> Tuple[Tuple, Tuple[int, ...]]:
+    """
+    Return ((cheapest record per destination, sorted by destination), flight counts) for records.
+    Ties keep the earliest record.
+    """
+    cheapest, counts = {}, {}
+    for record in records:
+        counts[record.destination] = counts.get(record.destination, 0) + 1
+        best = cheapest.get(record.destination)
+        if best is None or _price(record) < _price(best):
+            cheapest[record.destination] = record
+    destinations = sorted(cheapest)
+    return tuple(cheapest[destination] for destination in destinations), tuple(counts[d] for d in destinations)
+
+
+class PcpBlock:
+    """
+    Materialized PCP rows of one departure date, one per destination, sorted by destination.
+    """
+
+    __slots__ = ("departure_date", "sources", "inputs", "version", "destinations", "iso_codes", "price",
+                 "travel_days", "return_dates", "flight_count", "temperature", "climate", "advisory_level",
+                 "advisory")
+
+    def __len__(self):
+        return len(self.destinations)
+
+    @property
+    def missing_climate(self) -> int:
+        return int(np.count_nonzero(self.climate == UNKNOWN_CLIMATE))
+
+    def columns(self) -> dict:
+        """
+        Return the passport-independent columns as JSON-ready lists; unknown climate and
+        temperature are None.
+        """
+        known = self.climate != UNKNOWN_CLIMATE
+        temperature = np.round(self.temperature.astype(np.float64), 1).tolist()
+        return {
+            "destination": self.destinations,
+            "iso_code": self.iso_codes,
+            "price": self.price.tolist(),
+            "travel_days": self.travel_days.tolist(),
+            "return_date": self.return_dates,
+            "flight_count": self.flight_count.tolist(),
+            "temperature": [value if is_known else None for value, is_known in zip(temperature, known.tolist())],
+            "climate": [CONDITIONS[code] if code != UNKNOWN_CLIMATE else None for code in self.climate.tolist()],
+            "advisory": self.advisory,
+            "advisory_level": self.advisory_level.tolist(),
+        }
+
+    def visa(self, visa_matrix, passports: Sequence[str]):
+        """
+        Join the visa column for passports: (requirements as [row][passport], best passport per
+        row as (passport, requirement) or None).
+        """
+        if not passports:
+            return [[] for _ in self.destinations], [None] * len(self.destinations)
+        requirements = visa_matrix.lookup(passports, self.iso_codes)
+        return [list(row) for row in zip(*requirements)], visa_matrix.best(passports, self.iso_codes)
+
+
+def build_block(departure_date, rows, counts, locations: Dict[str, dict], advisories,
+                series: Sequence[Optional[np.ndarray]]) -> PcpBlock:
+    """
+    Materialize a date's rows from the cheapest record per destination (rows), flight counts,
+    location info by destination, the advisory table, and each row's climate series or None.
+    """
+    block = PcpBlock()
+    block.departure_date = departure_date
+    block.destinations = [record.destination for record in rows]
+    block.iso_codes = [(locations.get(record.destination) or {}).get("iso_code") for record in rows]
+    block.price = np.array([_price(record) for record in rows], dtype=np.float64)
+    block.travel_days = np.array([record.travel_days for record in rows], dtype=np.int16)
+    block.return_dates = [record.return_date for record in rows]
+    block.flight_count = np.array(counts, dtype=np.int32)
+
+    block.temperature = np.full(len(rows), np.nan, dtype=np.float32)
+    block.climate = np.full(len(rows), UNKNOWN_CLIMATE, dtype=np.int8)
+    known = [i for i, values in enumerate(series) if values is not None]
+    if known:
+        temperature, dominant = climate_stats([series[i] for i in known])
+        block.temperature[known] = temperature
+        block.climate[known] = dominant
+
+    entries = [advisories.get(iso_code) if advisories else None for iso_code in block.iso_codes]
+    block.advisory = [entry.get("advice") if entry else None for entry in entries]
+    block.advisory_level = np.array([entry["level"] if entry else UNKNOWN_LEVEL for entry in entries],
+                                    dtype=np.int8)
+    return block
+
+
+class PcpCube:
+    """
+    PCP blocks by departure date. A changed date gets a new block rather than edits to its
+    columns, so readers can use a block without locking.
+    """
+
+    def __init__(self):
+        self._blocks: Dict[str, PcpBlock] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def __len__(self):
+        return sum(len(block) for block in self._blocks.values())
+
+    def get(self, departure_date) -> Optional[PcpBlock]:
+        return self._blocks.get(departure_date)
+
+    def dates(self) -> List[str]:
+        return sorted(self._blocks)
+
+    def refresh(self, departure_date, sources, inputs: Callable[[], tuple],
+                build: Callable[[tuple], PcpBlock]) -> bool:
+        """
+        Bring a date's block up to date and return whether it was rebuilt. sources are the
+        versions of the data the block derives from; only when they differ from the block's
+        are the date's actual inputs gathered with inputs(), and only when those differ is
+        the block rebuilt with build(inputs) and given a new version.
+        """
+        block = self._blocks.get(departure_date)
+        if block is not None and block.sources == sources:
+            return False
+        current = inputs()
+        with self._lock:
+            block = self._blocks.get(departure_date)
+            if block is not None and block.inputs == current:
+                block.sources = sources
+                return False
+            new_block = build(current)
+            new_block.sources, new_block.inputs = sources, current
+            self._generation += 1
+            new_block.version = self._generation
+            self._blocks[departure_date] = new_block
+            return True
+
+    def retain(self, departure_dates):
+        """
+        Drop blocks of dates not in departure_dates.
+        """
+        keep = set(departure_dates)
+        with self._lock:
+            for departure_date in [day for day in self._blocks if day not in keep]:
+                del self._blocks[departure_date]
+
+    def table(self, departure_dates=None):
+        """
+        Return the given dates' blocks (all by default) as one Arrow table.
+        """
+        import pyarrow as pa
+
+        blocks = [self._blocks[day] for day in (departure_dates or self.dates()) if day in self._blocks]
+
+        def column(name, dtype):
+            arrays = [getattr(block, name) for block in blocks]
+            return np.concatenate(arrays) if arrays else np.empty(0, dtype)
+
+        def strings(name):
+            return pa.array([value for block in blocks for value in getattr(block, name)], pa.string())
+
+        climate = column("climate", np.int8)
+        return pa.table({
+            "departure_date": pa.array(np.repeat(np.array([block.departure_date for block in blocks], "datetime64[D]"),
+                                                 [len(block) for block in blocks]), pa.date32()),
+            "destination": strings("destinations").dictionary_encode(),
+            "iso_code": strings("iso_codes").dictionary_encode(),
+            "price": column("price", np.float64),
+            "travel_days": column("travel_days", np.int16),
+            "return_date": strings("return_dates").cast(pa.date32()),
+            "flight_count": column("flight_count", np.int32),
+            "temperature": pa.array(column("temperature", np.float32), from_pandas=True),
+            "climate": pa.DictionaryArray.from_arrays(pa.array(climate, pa.int8(), mask=climate == UNKNOWN_CLIMATE),
+                                                      pa.array(CONDITIONS, pa.string())),
+            "advisory": strings("advisory").dictionary_encode(),
+            "advisory_level": column("advisory_level", np.int8),
+        })
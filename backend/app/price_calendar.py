@@ -0,0 +1,197 @@
+"""
+Flight Track API - Price Calendar Module
+
+This module keeps the cheapest fare of every (destination, departure date, trip length)
+combination in dense NumPy blocks, so a fare calendar over any date range is a few slices
+and a reduction instead of one flight-list request per day.
+
+Key Features:
+- One (destinations, trip-length buckets) block per departure date that has flights, so
+  memory follows the dates in the data rather than the span between the first and last
+- Each cell holds the lowest price and the travel days of the flight that has it
+- Built with one vectorized pass: records sorted by (cell, price), the first per cell kept
+- Range queries min-reduce the selected trip-length buckets with argmin, so the travel days
+  of each date's cheapest flight come along with its price
+- Deltas rebuild only the (destination, departure date) cells they touch, copying only the
+  blocks of the dates they touch; new destinations are appended to the destination axis.
+  Other blocks are shared with the previous calendar, which is left as it was, so readers
+  need no locks
+
+Core Classes:
+- PriceCalendar: Minimum-price blocks with range queries and incremental updates
+
+Core Functions:
+- trip_bucket: Bucket index of trip lengths
+"""
+
+from datetime import date
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Lower bounds (travel days) of the trip-length buckets; the last one is open-ended
+TRIP_BUCKETS = (0, 3, 5, 8, 11, 15, 22)
+
+
+def trip_bucket(travel_days):
+    """
+    Return the trip-length bucket index of travel_days (a number or an array).
+    """
+    return np.maximum(np.searchsorted(TRIP_BUCKETS, travel_days, "right") - 1, 0)
+
+
+def _bucket_labels():
+    bounds = TRIP_BUCKETS + (None,)
+    return [f"{lo}-{hi - 1}" if hi is not None else f"{lo}+" for lo, hi in zip(bounds, bounds[1:])]
+
+
+def _price(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _cheapest(cell, price, travel_days):
+    """
+    Return (cells, prices, travel days) of the cheapest flight per distinct cell.
+    """
+    # Sorted by cell, then price, then position: the first row of each cell is its cheapest
+    order = np.lexsort((np.arange(price.shape[0]), price, cell))
+    cell, price, travel_days = cell[order], price[order], travel_days[order]
+    first = np.flatnonzero(np.concatenate(([True], cell[1:] != cell[:-1])))
+    return cell[first], price[first], travel_days[first]
+
+
+class PriceCalendar:
+    """
+    Lowest price (inf where there is no flight) and its travel days per destination and
+    trip-length bucket, in one block per departure date ordinal. Row i of a block belongs to
+    destinations[i]; blocks built before a destination was added have fewer rows.
+    """
+
+    def __init__(self, destinations: Sequence[str], blocks: Dict[int, Tuple[np.ndarray, np.ndarray]]):
+        self.destinations = list(destinations)
+        self.destination_index = {code: i for i, code in enumerate(self.destinations)}
+        self.blocks = blocks
+        self.days = sorted(blocks)
+        self._sorted_rows = None
+
+    @classmethod
+    def build(cls, columns) -> "PriceCalendar":
+        """
+        Build the blocks from a snapshot's FlightColumns, whose prices, departure ordinals and
+        destination codes are already parsed.
+        """
+        labels = sorted(columns.destination_index, key=columns.destination_index.get)
+        valid = ~np.isnan(columns.price)
+        days, day_index = np.unique(columns.departure[valid], return_inverse=True)
+        shape = (len(days), len(labels), len(TRIP_BUCKETS))
+        price = np.full(shape, np.inf, dtype=np.float32)
+        travel_days = np.zeros(shape, dtype=np.int16)
+        if valid.any():
+            cell = np.ravel_multi_index((day_index, columns.destination[valid].astype(np.int64),
+                                         trip_bucket(columns.travel_days[valid])), shape)
+            cell, best_price, best_days = _cheapest(cell, columns.price[valid].astype(np.float32),
+                                                    columns.travel_days[valid].astype(np.int16))
+            price.flat[cell], travel_days.flat[cell] = best_price, best_days
+        return cls(labels, {int(day): (price[i], travel_days[i]) for i, day in enumerate(days.tolist())})
+
+    def updated(self, changed: Iterable, cell_records) -> "PriceCalendar":
+        """
+        Return a new calendar with the (destination, departure date) cells of the changed
+        records rebuilt from cell_records(destination, departure_date), the cell's current
+        records. Only the blocks of those dates are copied; self is not modified.
+        """
+        cells = {(record.destination, record.departure_date) for record in changed}
+        if not cells:
+            return self
+        destinations = self.destinations + sorted({destination for destination, _ in cells}
+                                                  - self.destination_index.keys())
+        calendar = PriceCalendar(destinations, dict(self.blocks))
+        rows = len(destinations)
+
+        touched = {}
+        for destination, departure_date in cells:
+            touched.setdefault(date.fromisoformat(departure_date).toordinal(), []).append(destination)
+        for day, day_destinations in touched.items():
+            price = np.full((rows, len(TRIP_BUCKETS)), np.inf, dtype=np.float32)
+            travel_days = np.zeros((rows, len(TRIP_BUCKETS)), dtype=np.int16)
+            if day in self.blocks:
+                old_price, old_days = self.blocks[day]
+                price[:old_price.shape[0]], travel_days[:old_days.shape[0]] = old_price, old_days
+
+            records = [record for destination in day_destinations
+                       for record in cell_records(destination, date.fromordinal(day).isoformat())]
+            prices = np.array([_price(record.price_total) for record in records], dtype=np.float64)
+            valid = ~np.isnan(prices)
+            destination_rows = np.array([calendar.destination_index[record.destination] for record in records],
+                                        dtype=np.int64)[valid]
+            record_days = np.array([record.travel_days for record in records], dtype=np.int16)[valid]
+
+            price[[calendar.destination_index[destination] for destination in day_destinations]] = np.inf
+            if valid.any():
+                cell = np.ravel_multi_index((destination_rows, trip_bucket(record_days)), price.shape)
+                cell, best_price, best_days = _cheapest(cell, prices[valid].astype(np.float32), record_days)
+                price.flat[cell], travel_days.flat[cell] = best_price, best_days
+            if np.isfinite(price).any():
+                calendar.blocks[day] = (price, travel_days)
+            else:
+                calendar.blocks.pop(day, None)
+        calendar.days = sorted(calendar.blocks)
+        return calendar
+
+    def _rows_by_code(self) -> np.ndarray:
+        if self._sorted_rows is None:
+            self._sorted_rows = np.argsort(np.array(self.destinations, dtype=object), kind="stable")
+        return self._sorted_rows
+
+    def query(self, start_date: date, end_date: date, destinations: Optional[Sequence[str]] = None,
+              min_days=None, max_days=None) -> dict:
+        """
+        Return the (destination x date) grid of the lowest price and its travel days for
+        departures in [start_date, end_date], with dates limited to those between the first
+        and last day with flights. Trip-length bounds select whole buckets, widened to the
+        buckets containing them. Destinations without a flight in the range are left out.
+        """
+        lo, hi = start_date.toordinal(), end_date.toordinal()
+        if self.days:
+            lo, hi = max(lo, self.days[0]), min(hi, self.days[-1])
+        first_bucket = int(trip_bucket(min_days)) if min_days is not None else 0
+        last_bucket = int(trip_bucket(max_days)) if max_days is not None else len(TRIP_BUCKETS) - 1
+        if not self.days or hi < lo or last_bucket < first_bucket:
+            return {"dates": [], "destinations": [], "price": [], "travel_days": [],
+                    "trip_buckets": _bucket_labels()[first_bucket:last_bucket + 1]}
+
+        rows = (self._rows_by_code() if not destinations else
+                np.array(sorted((self.destination_index[code] for code in set(destinations)
+                                 if code in self.destination_index), key=self.destinations.__getitem__),
+                         dtype=np.int64))
+        buckets = slice(first_bucket, last_bucket + 1)
+        best_price = np.full((len(rows), hi - lo + 1), np.inf, dtype=np.float32)
+        best_days = np.zeros((len(rows), hi - lo + 1), dtype=np.int16)
+        start = np.searchsorted(self.days, lo)
+        end = np.searchsorted(self.days, hi, "right")
+        for day in self.days[start:end]:
+            price, travel_days = self.blocks[day]
+            # Blocks built before a destination was added have no row for it
+            present = rows < price.shape[0]
+            block = price[rows[present], buckets]
+            cheapest = block.argmin(axis=1)[:, None]
+            best_price[present, day - lo] = np.take_along_axis(block, cheapest, 1)[:, 0]
+            best_days[present, day - lo] = np.take_along_axis(travel_days[rows[present], buckets], cheapest, 1)[:, 0]
+
+        found = np.isfinite(best_price)
+        keep = found.any(axis=1)
+        rows, missing = rows[keep], ~found[keep]
+        # Object arrays take None for empty cells without a Python loop over the grid
+        prices = np.round(best_price[keep].astype(np.float64), 2).astype(object)
+        days = best_days[keep].astype(object)
+        prices[missing] = days[missing] = None
+        return {
+            "dates": [date.fromordinal(day).isoformat() for day in range(lo, hi + 1)],
+            "destinations": [self.destinations[row] for row in rows.tolist()],
+            "price": prices.tolist(),
+            "travel_days": days.tolist(),
+            "trip_buckets": _bucket_labels()[first_bucket:last_bucket + 1],
+        }
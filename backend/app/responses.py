@@ -0,0 +1,173 @@
+"""
+Flight Track API - Response Module
+
+This module serializes API responses with orjson and keeps pre-encoded payloads for
+data-only endpoints, so repeated requests skip both building and encoding.
+
+Key Features:
+- orjson encoding (with NumPy support) instead of jsonable_encoder + json.dumps
+- Bounded LRU of encoded payloads keyed by endpoint arguments
+- Payloads invalidated when the version of their source data files changes
+- Strong ETags with If-None-Match handling, answering 304 without re-encoding
+- Newline-delimited JSON streaming for large listings
+- Arrow IPC stream responses for bulk consumers, cached and revalidated like JSON
+
+Core Classes:
+- EncodedPayload: Pre-encoded JSON body with its ETag
+- PayloadCache: Versioned LRU of encoded payloads
+
+Core Functions:
+- json_response: Encode any JSON-ready value into a Response
+- cached_json_response: Serve a versioned, pre-encoded payload with ETag support
+- ndjson_response: Stream an iterable as newline-delimited JSON
+- arrow_response / cached_arrow_response: Serve a pyarrow Table as an Arrow IPC stream
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, NamedTuple, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+from .columnar import ARROW_MEDIA_TYPE, stream_bytes
+from .metrics import count, span
+
+CACHE_CONTROL = "no-cache"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def encode(content) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def json_response(content, status_code=200) -> Response:
+    return Response(content=encode(content), status_code=status_code, media_type="application/json")
+
+
+class EncodedPayload(NamedTuple):
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes):
+        return cls(body, '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"')
+
+    @classmethod
+    def from_content(cls, content, encoder=encode):
+        return cls.from_body(encoder(content))
+
+
+class PayloadCache:
+    """
+    LRU of encoded payloads; an entry is reused only while its data version is unchanged.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Hashable, build: Callable[[], object],
+            encoder: Callable[[object], bytes] = encode) -> EncodedPayload:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                count("payload_cache.hit")
+                return entry[1]
+
+        count("payload_cache.miss")
+        with span("payload.build"):
+            content = build()
+        with span("payload.encode"):
+            payload = EncodedPayload.from_content(content, encoder)
+
+        with self._lock:
+            self._entries[key] = (version, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+payload_cache = PayloadCache()
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cached_json_response(request: Request, key: Hashable, version: Hashable,
+                         build: Callable[[], object], headers: Optional[dict] = None) -> Response:
+    """
+    Serve build()'s result from the payload cache, or 304 if the client's ETag still matches.
+    """
+    return _payload_response(request, payload_cache.get(key, version, build), "application/json", headers)
+
+
+def cached_arrow_response(request: Request, key: Hashable, version: Hashable,
+                          build: Callable[[], object], headers: Optional[dict] = None) -> Response:
+    """
+    Serve build()'s pyarrow Table as a cached Arrow IPC stream, with the same ETag handling.
+    """
+    payload = payload_cache.get(("arrow", key), version, build, encoder=stream_bytes)
+    return _payload_response(request, payload, ARROW_MEDIA_TYPE, headers)
+
+
+def _payload_response(request, payload, media_type, headers):
+    headers = {**(headers or {}), "ETag": payload.etag, "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type=media_type, headers=headers)
+
+
+def arrow_response(table) -> Response:
+    with span("payload.encode"):
+        body = stream_bytes(table)
+    return Response(content=body, media_type=ARROW_MEDIA_TYPE)
+
+
+def wants_arrow(request: Request, response_format: Optional[str]) -> bool:
+    if response_format:
+        return response_format.lower() == "arrow"
+    return ARROW_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def wants_ndjson(request: Request, response_format: Optional[str]) -> bool:
+    if response_format:
+        return response_format.lower() == "ndjson"
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+NDJSON_BATCH_LINES = 1000
+
+
+def ndjson_response(items: Iterable[object], headers: Optional[dict] = None) -> StreamingResponse:
+    """
+    Stream items as newline-delimited JSON, encoding one item at a time and sending them in
+    chunks of NDJSON_BATCH_LINES lines; each chunk of a sync iterator costs a threadpool hop.
+    """
+    def lines():
+        batch = []
+        for item in items:
+            batch.append(encode(item))
+            if len(batch) == NDJSON_BATCH_LINES:
+                yield b"\n".join(batch) + b"\n"
+                batch = []
+        if batch:
+            yield b"\n".join(batch) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,119 @@
+"""
+Flight Track API - Route Geometry Module
+
+This module precomputes great-circle geometry for every (origin, destination) route of a
+flight snapshot, so clients can draw arcs without computing them on each render.
+
+Key Features:
+- Distance and initial bearing computed for all routes at once with NumPy
+- Each route sampled along its great circle with as few points as a distance tolerance
+  allows: a chord between samples strays at most tolerance_km from the true path
+- Samples for every route built in one vectorized pass into flat, ragged arrays
+- Compact payload with routes as parallel columns and paths as flat [lat, lon, ...] lists
+
+Core Classes:
+- RouteGeometry: Distances, bearings and simplified paths for a set of routes
+
+Core Functions:
+- great_circle: Vectorized distance and initial bearing between coordinate arrays
+"""
+
+import math
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from .airport_index import EARTH_RADIUS_KM
+
+TOLERANCE_KM = 10.0
+MAX_SEGMENTS = 64
+
+
+def great_circle(latitudes1, longitudes1, latitudes2, longitudes2):
+    """
+    Return (distances_km, initial bearings in degrees from north) between point arrays in degrees.
+    """
+    lat1, lon1 = np.radians(latitudes1), np.radians(longitudes1)
+    lat2, lon2 = np.radians(latitudes2), np.radians(longitudes2)
+    dlon = lon2 - lon1
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    bearings = np.degrees(np.arctan2(np.sin(dlon) * np.cos(lat2),
+                                     np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)))
+    return distances, bearings % 360
+
+
+def _unit_vectors(latitudes, longitudes):
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    return np.stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)), axis=-1)
+
+
+class RouteGeometry:
+    """
+    Geometry of routes given as (origin, destination, origin lat, origin lon, dest lat, dest lon).
+    Route i's path is path_latitudes/path_longitudes[path_starts[i]:path_starts[i + 1]].
+    """
+
+    def __init__(self, routes: Iterable[Tuple[str, str, float, float, float, float]],
+                 tolerance_km=TOLERANCE_KM):
+        routes = sorted(routes)
+        self.tolerance_km = tolerance_km
+        self.origins = [route[0] for route in routes]
+        self.destinations = [route[1] for route in routes]
+        ends = np.array([route[2:] for route in routes], dtype=np.float64).reshape(-1, 4)
+        self.distance_km, self.bearing = great_circle(ends[:, 0], ends[:, 1], ends[:, 2], ends[:, 3])
+
+        # The chord over an arc of angle t departs from it by R(1 - cos(t / 2)), which bounds the step
+        max_step = 2 * math.acos(max(1 - tolerance_km / EARTH_RADIUS_KM, -1.0))
+        angles = self.distance_km / EARTH_RADIUS_KM
+        segments = np.clip(np.ceil(angles / max_step), 1, MAX_SEGMENTS).astype(np.int64)
+        counts = segments + 1
+        starts = np.concatenate(([0], np.cumsum(counts)))
+        self.path_starts = starts.tolist()
+
+        # Spherical interpolation of all samples of all routes at once
+        route_of = np.repeat(np.arange(len(routes)), counts)
+        fraction = (np.arange(starts[-1]) - starts[:-1][route_of]) / segments[route_of]
+        angle, sin_angle = angles[route_of], np.sin(angles[route_of])
+        short = sin_angle < 1e-9
+        sin_angle = np.where(short, 1.0, sin_angle)
+        weight1 = np.where(short, 1 - fraction, np.sin((1 - fraction) * angle) / sin_angle)
+        weight2 = np.where(short, fraction, np.sin(fraction * angle) / sin_angle)
+        points = (weight1[:, None] * _unit_vectors(ends[:, 0], ends[:, 1])[route_of]
+                  + weight2[:, None] * _unit_vectors(ends[:, 2], ends[:, 3])[route_of])
+        self.path_latitudes = np.degrees(np.arctan2(points[:, 2], np.hypot(points[:, 0], points[:, 1])))
+        self.path_longitudes = np.degrees(np.arctan2(points[:, 1], points[:, 0]))
+
+        # Endpoints exactly as given, free of interpolation rounding
+        self.path_latitudes[starts[:-1]], self.path_longitudes[starts[:-1]] = ends[:, 0], ends[:, 1]
+        self.path_latitudes[starts[1:] - 1], self.path_longitudes[starts[1:] - 1] = ends[:, 2], ends[:, 3]
+
+    def __len__(self):
+        return len(self.origins)
+
+    def path(self, i):
+        """
+        Return route i's path as [(latitude, longitude)].
+        """
+        start, end = self.path_starts[i], self.path_starts[i + 1]
+        return list(zip(self.path_latitudes[start:end].tolist(), self.path_longitudes[start:end].tolist()))
+
+    def payload(self, positions=None, precision=2) -> dict:
+        """
+        Build the compact response for the given routes (all by default): parallel columns,
+        with each path a flat [lat, lon, lat, lon, ...] list rounded to precision decimals.
+        """
+        positions = range(len(self)) if positions is None else positions
+        flat = np.empty((len(self.path_latitudes), 2))
+        flat[:, 0], flat[:, 1] = self.path_latitudes, self.path_longitudes
+        flat = np.round(flat, precision).tolist()
+        distances = np.round(self.distance_km, 1).tolist()
+        bearings = np.round(self.bearing, 1).tolist()
+        return {
+            "origin": [self.origins[i] for i in positions],
+            "destination": [self.destinations[i] for i in positions],
+            "distance_km": [distances[i] for i in positions],
+            "bearing": [bearings[i] for i in positions],
+            "path": [[value for point in flat[self.path_starts[i]:self.path_starts[i + 1]] for value in point]
+                     for i in positions],
+        }
@@ -0,0 +1,132 @@
+"""
+Flight Track API - Visa Matrix Module
+
+This module compiles the passport → destination visa requirements into a dense matrix
+once per data version, so multi-passport lookups are single NumPy index operations.
+
+Key Features:
+- Passport and destination ISO codes mapped to row and column indexes
+- Requirements stored as uint8 category codes with a shared category table
+- Missing pairs and unknown destinations resolve to "Unknown"
+- Categories ranked from easiest to hardest entry for "best passport" aggregates
+
+Core Classes:
+- VisaMatrix: Dense passport × destination requirement matrix
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+UNKNOWN = "Unknown"
+
+# Lower is easier; visa-free stays given in days rank after "visa free", longest first
+_REQUIREMENT_ORDER = {
+    -1: 0,
+    "visa free": 1,
+    "visa on arrival": 3,
+    "eta": 4,
+    "e-visa": 5,
+    "visa required": 6,
+    "no admission": 7,
+}
+
+
+def _requirement_key(value):
+    if isinstance(value, int) and value >= 0:
+        return 2, -value
+    return _REQUIREMENT_ORDER.get(value, 8), 0
+
+
+class VisaMatrix:
+    """
+    Dense passport × destination matrix of uint8 requirement categories.
+    """
+
+    def __init__(self, data: dict):
+        categories = {UNKNOWN: 0}
+        for requirements in data.values():
+            for value in requirements.values():
+                categories.setdefault(value, len(categories))
+        if len(categories) > 256:
+            raise ValueError("Too many visa requirement categories for uint8 codes")
+
+        self.passports = list(data)
+        self.passport_index = {code: i for i, code in enumerate(self.passports)}
+        self.destinations = sorted({iso for requirements in data.values() for iso in requirements})
+        self.destination_index = {iso: i for i, iso in enumerate(self.destinations)}
+
+        # The extra last column is all-Unknown and stands in for destinations without data
+        self.codes = np.zeros((len(self.passports), len(self.destinations) + 1), dtype=np.uint8)
+        for row, requirements in enumerate(data.values()):
+            columns = [self.destination_index[iso] for iso in requirements]
+            self.codes[row, columns] = [categories[value] for value in requirements.values()]
+
+        self._set_categories(categories)
+
+    @classmethod
+    def from_codes(cls, passports, passport_codes, destinations, destination_codes, values, value_codes):
+        """
+        Build the matrix from per-entry integer codes into passports, destinations and values,
+        as read from a columnar copy of the data, without building nested dicts.
+        """
+        categories = {UNKNOWN: 0}
+        for value in values:
+            categories.setdefault(value, len(categories))
+        if len(categories) > 256:
+            raise ValueError("Too many visa requirement categories for uint8 codes")
+
+        matrix = cls.__new__(cls)
+        matrix.passports = list(passports)
+        matrix.passport_index = {code: i for i, code in enumerate(matrix.passports)}
+        matrix.destinations = sorted(destinations)
+        matrix.destination_index = {iso: i for i, iso in enumerate(matrix.destinations)}
+
+        columns = np.array([matrix.destination_index[iso] for iso in destinations], dtype=np.intp)
+        category_codes = np.array([categories[value] for value in values], dtype=np.uint8)
+        matrix.codes = np.zeros((len(matrix.passports), len(matrix.destinations) + 1), dtype=np.uint8)
+        matrix.codes[passport_codes, columns[destination_codes]] = category_codes[value_codes]
+        matrix._set_categories(categories)
+        return matrix
+
+    def _set_categories(self, categories):
+        self.categories = np.empty(len(categories), dtype=object)
+        self.categories[:] = list(categories)
+        order = sorted(range(len(categories)), key=lambda code: _requirement_key(self.categories[code]))
+        self.category_rank = np.empty(len(categories), dtype=np.uint8)
+        self.category_rank[order] = np.arange(len(categories))
+
+    def known_passports(self, codes: Sequence[str]):
+        """
+        Normalize and de-duplicate passport codes, keeping only those with data, in input order.
+        """
+        normalized = dict.fromkeys(code.strip().upper() for code in codes)
+        return [code for code in normalized if code in self.passport_index]
+
+    def _columns(self, destination_isos: Sequence[Optional[str]]):
+        unknown = len(self.destinations)
+        return np.array([self.destination_index.get(iso, unknown) for iso in destination_isos], dtype=np.intp)
+
+    def lookup_codes(self, passports: Sequence[str], destination_isos: Sequence[Optional[str]]):
+        """
+        Return the (passports, destinations) uint8 category codes for known passports.
+        """
+        rows = np.array([self.passport_index[code] for code in passports], dtype=np.intp)
+        return self.codes[np.ix_(rows, self._columns(destination_isos))]
+
+    def lookup(self, passports: Sequence[str], destination_isos: Sequence[Optional[str]]):
+        """
+        Return requirement values as a (passports, destinations) nested list.
+        """
+        return self.categories[self.lookup_codes(passports, destination_isos)].tolist()
+
+    def best(self, passports: Sequence[str], destination_isos: Sequence[Optional[str]]):
+        """
+        Return (passport, requirement) with the easiest entry for each destination.
+        """
+        if not passports:
+            return [None] * len(destination_isos)
+        codes = self.lookup_codes(passports, destination_isos)
+        best_rows = self.category_rank[codes].argmin(axis=0)
+        best_codes = codes[best_rows, np.arange(codes.shape[1])]
+        return list(zip((passports[row] for row in best_rows.tolist()), self.categories[best_codes].tolist()))
@@ -0,0 +1,68 @@
+"""
+Flight Track API - Climate Cache Warm-up
+
+This module prefetches daily climate series for every destination in the flight data
+into the local climate cache, so weather endpoints answer without upstream requests.
+
+Usage:
+    python -m app.warm_climate_cache
+    python -m app.warm_climate_cache --start 2025-01-01 --end 2025-12-31
+
+By default the cached horizon spans the earliest departure to the latest return date
+in the flight data.
+"""
+
+import argparse
+import asyncio
+
+from .flight_service import get_airport_coords, get_flight_snapshot
+from .weather_service import climate_cache, close_weather_client, fetch_climate_batch
+
+BATCH_SIZE = 20
+
+
+async def warm(start_date=None, end_date=None, batch_size=BATCH_SIZE):
+    """
+    Fetch and store [start_date, end_date] for every destination; returns (cached, failed) counts.
+    """
+    snapshot = get_flight_snapshot()
+    start_date = start_date or min(record.departure_date for record in snapshot.records)
+    end_date = end_date or max(record.return_date for record in snapshot.records)
+
+    locations = {}
+    for destination in sorted(snapshot.by_destination):
+        coords = get_airport_coords(destination)
+        if coords:
+            locations.setdefault(climate_cache.key(*coords), coords)
+    pending = [coords for coords in locations.values()
+               if climate_cache.get(*coords, start_date, end_date) is None]
+
+    cached, failed = len(locations) - len(pending), 0
+    for i in range(0, len(pending), batch_size):
+        batch = pending[i:i + batch_size]
+        try:
+            series = await fetch_climate_batch(batch, start_date, end_date)
+        except Exception as e:
+            print(f"Failed to fetch {len(batch)} locations: {e}")
+            failed += len(batch)
+            continue
+        await asyncio.to_thread(climate_cache.put_many,
+                                [(*coords, start_date, values) for coords, values in zip(batch, series)])
+        cached += len(series)
+    await close_weather_client()
+    return cached, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prefetch climate data for all flight destinations.")
+    parser.add_argument("--start", help="First date to cache (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last date to cache (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Locations per upstream request")
+    args = parser.parse_args(argv)
+
+    cached, failed = asyncio.run(warm(args.start, args.end, args.batch_size))
+    print(f"Climate cache ready: {cached} locations cached, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
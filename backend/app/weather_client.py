@@ -0,0 +1,192 @@
+"""
+Flight Track API - Weather Client Module
+
+This module talks to the Open-Meteo APIs from the event loop, without blocking it.
+
+Key Features:
+- One pooled httpx.AsyncClient per event loop, keeping HTTP/1.1 connections alive
+- Retries with exponential backoff on connection errors, 429 and 5xx responses, within the
+  call's deadline
+- Optional governor (app.weather_governor) admitting each attempt and told its outcome
+- Single-flight coalescing: a location already being fetched for the same dates is not
+  requested again; concurrent callers share the in-flight upstream call
+- Upstream calls run as their own tasks, so a caller timing out or disconnecting does not
+  cancel a fetch other callers are waiting on
+- Responses decoded from Open-Meteo's FlatBuffers format
+
+The HTTP and FlatBuffers libraries are imported on first use, keeping them off the
+startup path.
+
+Core Classes:
+- WeatherClientError: Upstream request failed or returned an error
+- WeatherClient: Pooled, retrying, coalescing Open-Meteo client
+"""
+
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Sequence, Tuple
+
+from .metrics import count, span
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# Open-Meteo error messages inside a response stream start with "Unexpected"
+_STREAM_ERROR_PREFIX = 0x78656E55
+
+
+class WeatherClientError(Exception):
+    """
+    Raised when an upstream weather request fails after all retries.
+    """
+
+
+def decode_responses(data: bytes):
+    """
+    Split a FlatBuffers response body into one WeatherApiResponse per location.
+    """
+    from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+
+    responses = []
+    position = 0
+    while position < len(data):
+        length = int.from_bytes(data[position:position + 4], byteorder="little")
+        if length == _STREAM_ERROR_PREFIX:
+            raise WeatherClientError(data[position:].decode("utf-8", "replace"))
+        responses.append(WeatherApiResponse.GetRootAs(data, position + 4))
+        position += length + 4
+    return responses
+
+
+class WeatherClient:
+    """
+    Async Open-Meteo client keyed by (latitude, longitude, start_date, end_date).
+    """
+
+    def __init__(self, max_connections=8, retries=3, backoff_seconds=0.2, timeout_seconds=15.0,
+                 keepalive_seconds=30.0, governor=None):
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.governor = governor
+        self._http = None
+        self._loop = None
+        self._inflight: Dict[Tuple, Tuple[asyncio.Task, int]] = {}
+
+    def _client(self):
+        # Connections and tasks belong to one event loop; a new loop (e.g. a test client) gets new ones
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._loop is not loop:
+            import httpx
+
+            self._http = httpx.AsyncClient(
+                http1=True,
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections,
+                                    keepalive_expiry=self.keepalive_seconds),
+            )
+            self._loop = loop
+            self._inflight = {}
+        return self._http
+
+    def _admit(self, cost, deadline, max_wait):
+        if self.governor is None:
+            return nullcontext()
+        return self.governor.admit(cost, deadline, max_wait)
+
+    def _record(self, failed):
+        if self.governor is not None:
+            if failed:
+                self.governor.record_failure()
+            else:
+                self.governor.record_success()
+
+    async def _get(self, url, params, timeout, cost=1, max_wait=None):
+        import httpx
+
+        client = self._client()
+        deadline = time.monotonic() + (timeout or self.timeout_seconds)
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = self.backoff_seconds * 2 ** (attempt - 1)
+                if time.monotonic() + delay >= deadline:
+                    break
+                count("open_meteo.retries")
+                await asyncio.sleep(delay)
+            # Shedding raises out of the loop: a saturated or failing upstream gets no retries
+            async with self._admit(cost, deadline, max_wait):
+                try:
+                    response = await client.get(url, params=params, timeout=max(deadline - time.monotonic(), 0.001))
+                except httpx.TransportError as e:
+                    self._record(failed=True)
+                    error = WeatherClientError(f"Request to {url} failed: {e!r}")
+                    continue
+                self._record(failed=response.status_code in RETRY_STATUSES)
+            if response.status_code in RETRY_STATUSES:
+                error = WeatherClientError(f"{url} returned {response.status_code}")
+                continue
+            if response.status_code >= 400:
+                raise WeatherClientError(f"{url} returned {response.status_code}: {response.text[:200]}")
+            return response.content
+        raise error
+
+    async def _fetch(self, url, keys, variables, timeout, max_wait):
+        params = {
+            "latitude": ",".join(str(latitude) for latitude, _, _, _ in keys),
+            "longitude": ",".join(str(longitude) for _, longitude, _, _ in keys),
+            "start_date": keys[0][2],
+            "end_date": keys[0][3],
+            "daily": ",".join(variables),
+            "format": "flatbuffers",
+        }
+        count("open_meteo.calls")
+        count("open_meteo.locations", len(keys))
+        with span("open_meteo.fetch"):
+            responses = decode_responses(await self._get(url, params, timeout, len(keys), max_wait))
+        if len(responses) != len(keys):
+            raise WeatherClientError(f"Expected {len(keys)} locations, got {len(responses)}")
+        return responses
+
+    def _release(self, keys, task):
+        for key in keys:
+            if self._inflight.get(key, (None,))[0] is task:
+                del self._inflight[key]
+        # Nobody may be waiting any more; mark the failure as seen so it is not logged as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    async def fetch(self, url, coords: Sequence[Tuple[float, float]], start_date, end_date,
+                    variables: Sequence[str], timeout=None, max_wait=None) -> List:
+        """
+        Return one WeatherApiResponse per coordinate, in order. Locations already in flight for
+        the same dates are awaited instead of requested again; the rest go out in one request.
+        timeout bounds the whole call, retries included; max_wait bounds the time the governor
+        may hold it before sending.
+        """
+        self._client()
+        keys = [(latitude, longitude, start_date, end_date) for latitude, longitude in coords]
+
+        new_keys = [key for key in dict.fromkeys(keys) if key not in self._inflight]
+        if len(new_keys) < len(set(keys)):
+            count("open_meteo.coalesced", len(set(keys)) - len(new_keys))
+        if new_keys:
+            task = asyncio.ensure_future(self._fetch(url, new_keys, variables, timeout, max_wait))
+            for index, key in enumerate(new_keys):
+                self._inflight[key] = (task, index)
+            task.add_done_callback(lambda done, keys=new_keys: self._release(keys, done))
+
+        entries = [self._inflight[key] for key in keys]
+        tasks = list(dict.fromkeys(task for task, _ in entries))
+        results = dict(zip(tasks, await asyncio.gather(*(asyncio.shield(task) for task in tasks))))
+        return [results[task][index] for task, index in entries]
+
+    async def aclose(self):
+        """
+        Close pooled connections; a later fetch opens new ones.
+        """
+        if self._http is not None:
+            http, self._http, self._loop = self._http, None, None
+            await http.aclose()
@@ -0,0 +1,204 @@
+"""
+Flight Track API - Weather Governor Module
+
+This module decides whether an Open-Meteo call may go upstream now, later, or not at all,
+so a traffic spike turns into fast fallbacks instead of retry storms and growing queues.
+
+Key Features:
+- Token bucket in locations per second, matching how Open-Meteo weighs multi-location calls;
+  calls reserve tokens and wait for the refill only when it arrives within their deadline
+- Bounded admission: at most max_pending calls may be waiting or in flight, the rest are
+  shed at once
+- Circuit breaker: after consecutive upstream failures calls are shed for reset_seconds,
+  then a single probe call decides whether to close the circuit again
+- Shed calls raise UpstreamUnavailable with a retry-after hint, so callers can fall back
+  to cached data or answer without weather
+- State exposed as a metrics gauge, shed and throttled calls as counters
+
+Core Classes:
+- UpstreamUnavailable: A call was shed by the governor
+- TokenBucket: Rate limiter with reservations
+- CircuitBreaker: Closed / open / half-open failure tracking
+- WeatherGovernor: Admission control combining the three
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from .metrics import count
+from .weather_client import WeatherClientError
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class UpstreamUnavailable(WeatherClientError):
+    """
+    Raised when the governor sheds a call instead of sending it upstream.
+    """
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Open-Meteo call shed: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Refills rate tokens per second up to burst. Reservations may take the balance negative,
+    so waiting callers are served in the order they reserved.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost, now) -> float:
+        """
+        Seconds until cost tokens are available, without reserving them.
+        """
+        self._refill(now)
+        return max(0.0, (min(cost, self.burst) - self.tokens) / self.rate)
+
+    def reserve(self, cost, max_wait, now) -> Optional[float]:
+        """
+        Take cost tokens and return the seconds to wait before using them, or None, taking
+        nothing, when that wait would exceed max_wait. A cost above burst is charged as burst.
+        """
+        wait = self.wait_time(cost, now)
+        if wait > max_wait:
+            return None
+        self.tokens -= min(cost, self.burst)
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures; after reset_seconds lets one probe
+    through, closing on its success and reopening on its failure.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def allow(self, now) -> bool:
+        """
+        Return whether a call may go upstream; in the half-open state only one at a time.
+        """
+        if self.state == OPEN and now - self.opened_at >= self.reset_seconds:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def retry_after(self, now) -> float:
+        if self.state == OPEN:
+            return max(0.0, self.reset_seconds - (now - self.opened_at))
+        return 0.0
+
+    def record_success(self):
+        self.state, self.failures, self.probing = CLOSED, 0, False
+
+    def record_failure(self, now):
+        self.failures += 1
+        self.probing = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                count("open_meteo.circuit_opened")
+            self.state, self.opened_at = OPEN, now
+
+
+class WeatherGovernor:
+    """
+    Admission control for upstream weather calls. Use admit() around each upstream request
+    and report its outcome with record_success() / record_failure().
+    """
+
+    def __init__(self, rate_per_second=10.0, burst=20, max_pending=32, max_wait_seconds=2.0,
+                 failure_threshold=5, reset_seconds=30.0):
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self.max_pending = max_pending
+        self.max_wait_seconds = max_wait_seconds
+        self.pending = 0
+        self.inflight = 0
+
+    def _shed(self, reason, retry_after):
+        count(f"open_meteo.shed.{reason.replace(' ', '_')}")
+        raise UpstreamUnavailable(reason, retry_after)
+
+    @asynccontextmanager
+    async def admit(self, cost, deadline, max_wait=None):
+        """
+        Wait for cost tokens (locations) and enter, or raise UpstreamUnavailable at once when
+        the circuit is open, max_pending calls are already admitted, or the tokens would not
+        arrive within min(max_wait, time to deadline).
+        """
+        now = time.monotonic()
+        if not self.breaker.allow(now):
+            self._shed("circuit open", self.breaker.retry_after(now))
+        probe = self.breaker.state == HALF_OPEN
+        try:
+            if self.pending >= self.max_pending:
+                self._shed("queue full", self.bucket.wait_time(cost, now))
+            budget = min(self.max_wait_seconds if max_wait is None else max_wait, deadline - now)
+            wait = self.bucket.reserve(cost, budget, now)
+            if wait is None:
+                self._shed("rate limited", self.bucket.wait_time(cost, now))
+
+            self.pending += 1
+            try:
+                if wait:
+                    count("open_meteo.throttled")
+                    await asyncio.sleep(wait)
+                self.inflight += 1
+                try:
+                    yield
+                finally:
+                    self.inflight -= 1
+            finally:
+                self.pending -= 1
+        finally:
+            # A probe that ended without an outcome (shed, cancelled) frees the slot for the next one
+            if probe and self.breaker.state == HALF_OPEN:
+                self.breaker.probing = False
+
+    def record_success(self):
+        self.breaker.record_success()
+
+    def record_failure(self):
+        self.breaker.record_failure(time.monotonic())
+
+    def retry_after(self) -> float:
+        """
+        Seconds until a single-location call would be admitted again.
+        """
+        now = time.monotonic()
+        return max(self.breaker.retry_after(now), self.bucket.wait_time(1, now))
+
+    def state(self) -> dict:
+        now = time.monotonic()
+        self.bucket._refill(now)
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "retry_after_seconds": round(self.retry_after(), 3),
+            "tokens": round(self.bucket.tokens, 2),
+            "pending": self.pending,
+            "inflight": self.inflight,
+        }
@@ -0,0 +1,107 @@
+"""
+Flight Track API - Weather Service Module
+
+This module fetches daily climate series from the Open-Meteo climate API and serves
+them through the local climate cache.
+
+Key Features:
+- Shared async Open-Meteo client with pooled connections, retries and request coalescing
+- Multi-location requests for several coordinates at once
+- Read-through climate cache: only uncached (location, range) pairs go upstream
+- Upstream calls admitted by a governor (rate limit, bounded queue, circuit breaker);
+  when a call is shed or fails, callers may fall back to partially cached ranges
+
+Core Functions:
+- fetch_climate_batch: Fetch (variables, days) series for many coordinates
+- cached_climate_series: Return a cached series without any network I/O
+- get_climate_series: Return series for many coordinates, fetching only misses
+- close_weather_client: Close pooled upstream connections on shutdown
+"""
+
+import asyncio
+import os
+
+import numpy as np
+
+from .climate_cache import ClimateCache
+from .metrics import count, gauge
+from .weather_client import WeatherClient, WeatherClientError
+from .weather_governor import WeatherGovernor
+
+CLIMATE_URL = "https://climate-api.open-meteo.com/v1/climate"
+DAILY_VARIABLES = ["temperature_2m_mean", "cloud_cover_mean", "shortwave_radiation_sum", "rain_sum", "snowfall_sum"]
+
+CLIMATE_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "climate")
+
+climate_cache = ClimateCache(CLIMATE_CACHE_DIR, len(DAILY_VARIABLES))
+# Open-Meteo's free tier allows about 600 location-calls per minute per client IP. The
+# governor lives in each process, so serve.py's workers (WORKERS_ENV) split the budget
+WORKERS_ENV = "FLIGHT_TRACK_WORKERS"
+OPEN_METEO_CALLS_PER_SECOND = 10
+OPEN_METEO_BURST = 20
+_workers = max(int(os.environ.get(WORKERS_ENV, "1") or 1), 1)
+
+weather_governor = WeatherGovernor(rate_per_second=OPEN_METEO_CALLS_PER_SECOND / _workers,
+                                   burst=max(OPEN_METEO_BURST // _workers, 1), max_pending=32,
+                                   max_wait_seconds=2.0, failure_threshold=5, reset_seconds=30)
+weather_client = WeatherClient(max_connections=8, retries=3, backoff_seconds=0.2, governor=weather_governor)
+gauge("open_meteo.governor", weather_governor.state)
+
+
+async def close_weather_client():
+    """
+    Close the weather client's pooled upstream connections.
+    """
+    await weather_client.aclose()
+
+
+async def fetch_climate_batch(coords, start_date, end_date, timeout=None, max_wait=None):
+    """
+    Fetch daily climate series for several coordinates in one multi-location request.
+    Returns one (variables, days) float32 array per coordinate, in order.
+    """
+    responses = await weather_client.fetch(CLIMATE_URL, coords, start_date, end_date, DAILY_VARIABLES, timeout,
+                                           max_wait=max_wait)
+
+    series = []
+    for response in responses:
+        daily = response.Daily()
+        series.append(np.vstack([
+            daily.Variables(i).ValuesAsNumpy() for i in range(len(DAILY_VARIABLES))
+        ]).astype(np.float32, copy=False))
+    return series
+
+
+def cached_climate_series(coords, start_date, end_date):
+    latitude, longitude = coords
+    series = climate_cache.get(latitude, longitude, start_date, end_date)
+    count("climate_cache.miss" if series is None else "climate_cache.hit")
+    return series
+
+
+async def get_climate_series(coords, start_date, end_date, timeout=None, partial=False, max_wait=None):
+    """
+    Return one (variables, days) series per coordinate, fetching uncached ones upstream.
+    With partial=True an upstream failure or shed call does not raise: uncached coordinates
+    get whatever days of the range are cached (fewer columns), or None.
+    """
+    results = [cached_climate_series(c, start_date, end_date) for c in coords]
+    missing = [i for i, series in enumerate(results) if series is None]
+    if missing:
+        try:
+            fetched = await fetch_climate_batch([coords[i] for i in missing], start_date, end_date,
+                                                timeout=timeout, max_wait=max_wait)
+        except WeatherClientError:
+            if not partial:
+                raise
+            count("climate_cache.fallback", len(missing))
+            for i in missing:
+                latitude, longitude = coords[i]
+                results[i] = climate_cache.get_partial(latitude, longitude, start_date, end_date)
+            return results
+        for i, series in zip(missing, fetched):
+            results[i] = series
+        # Tile writes are disk I/O; keep them off the event loop
+        await asyncio.to_thread(climate_cache.put_many,
+                                [(*coords[i], start_date, series) for i, series in zip(missing, fetched)])
+    return results
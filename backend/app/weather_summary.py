@@ -0,0 +1,100 @@
+"""
+Flight Track API - Weather Summary Module
+
+This module turns daily climate series into the weather summaries returned by the
+weather endpoints, processing every destination of a response in one NumPy pass.
+
+Key Features:
+- Series of different lengths stacked into one NaN-padded (destinations, variables, days) array
+- Means, condition-day counts and dominant climate computed with batched array operations
+- NaN/inf sanitized to 0 for all values at once
+- Daily lists emitted with ndarray.tolist() rather than per-element conversion
+
+Core Functions:
+- summarize_many: Summaries for many (variables, days) series, in order
+- summarize: Summary for a single series
+- climate_stats: Mean temperature and dominant condition only, for many series
+"""
+
+import numpy as np
+
+TEMPERATURE, CLOUD_COVER, RADIATION, RAIN, SNOWFALL = range(5)
+CONDITIONS = ("Rainy", "Snowy", "Sunny", "Cloudy", "Partly Clouded")
+
+
+def _stack(series_list):
+    lengths = np.array([series.shape[1] for series in series_list], dtype=np.int64)
+    values = np.full((len(series_list), 5, int(lengths.max(initial=0))), np.nan, dtype=np.float32)
+    for i, series in enumerate(series_list):
+        values[i, :, :series.shape[1]] = series
+    return values, lengths
+
+
+def _climate_stats(values, lengths):
+    temperature, cloud_cover, radiation, rain, snowfall = values.transpose(1, 0, 2)
+    valid = np.arange(values.shape[2]) < lengths[:, None]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # NaN compares False, so padding never counts towards any condition
+        counts = np.stack([
+            rain > 1.0,
+            snowfall > 0.1,
+            (cloud_cover < 20) & (radiation > 15),
+            cloud_cover > 50,
+            (cloud_cover >= 20) & (cloud_cover <= 50),
+        ], axis=1).sum(axis=2)
+        mean_temperature = np.where(valid, temperature, 0).sum(axis=1, dtype=np.float64) / lengths
+
+    mean_temperature = np.where(np.isfinite(mean_temperature), mean_temperature, 0.0)
+    return mean_temperature, counts, counts.argmax(axis=1)
+
+
+def climate_stats(series_list):
+    """
+    Return (mean temperatures, dominant condition indexes into CONDITIONS) as arrays, one entry
+    per (variables, days) series, without building the summary dicts.
+    """
+    mean_temperature, _, dominant = _climate_stats(*_stack(series_list))
+    return mean_temperature, dominant
+
+
+def summarize_many(series_list):
+    """
+    Build one weather summary dict per (variables, days) series.
+    """
+    if not series_list:
+        return []
+
+    values, lengths = _stack(series_list)
+    mean_temperature, counts, dominant = _climate_stats(values, lengths)
+    mean_temperature = mean_temperature.tolist()
+    dominant = dominant.tolist()
+    counts = counts.tolist()
+    clean = np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0)
+
+    summaries = []
+    for i, total_days in enumerate(lengths.tolist()):
+        daily = clean[i, :, :total_days].tolist()
+        summaries.append({
+            "average_temperature": round(mean_temperature[i], 1),
+            "dominant_climate": CONDITIONS[dominant[i]],
+            "daily_temperature": daily[TEMPERATURE],
+            "daily_cloud_cover": daily[CLOUD_COVER],
+            "daily_radiation_sum": daily[RADIATION],
+            "daily_rain_sum": daily[RAIN],
+            "daily_snowfall_sum": daily[SNOWFALL],
+            "weather_breakdown": {
+                condition: {
+                    "days": days,
+                    "percentage": round(days / total_days * 100, 1)
+                } for condition, days in zip(CONDITIONS, counts[i]) if days > 0
+            }
+        })
+    return summaries
+
+
+def summarize(series):
+    """
+    Build the weather summary dict for a single (variables, days) series.
+    """
+    return summarize_many([series])[0]
@@ -0,0 +1,13 @@
+"""
+Flight Track API - Benchmarks
+
+Reproducible, in-process benchmarks of every API endpoint against synthetic flight
+datasets and a local Open-Meteo stand-in. Run from the backend folder:
+
+    python -m benchmarks.run --scales 1 10 100
+
+Modules:
+- datasets: Synthetic flight-destination feeds at a multiple of Lon-other.json
+- fake_climate: Local HTTP server answering climate requests in Open-Meteo's format
+- run: Request mixes, measurement and JSON results
+"""
@@ -0,0 +1,78 @@
+"""
+Flight Track API - Synthetic Flight Datasets
+
+This module writes synthetic flight-destination feeds at a multiple of Lon-other.json.
+Scale 1 is the original feed; each further copy keeps the original departure dates
+(so the PCP and Globe requests stay representative) but flies to another airport from
+the airport database, with a jittered price and trip length.
+
+Core Functions:
+- synthetic_feed: Build a feed dict at the given scale
+- write_synthetic_feed: Write a feed to a JSON file and return its record count
+"""
+
+import json
+import random
+from datetime import date, timedelta
+
+from app.airport_resolver import read_airport_db
+from app.flight_service import AIRPORT_DB_PATH, FLIGHT_DATA_PATH
+
+AMADEUS_URL = "https://test.api.amadeus.com"
+
+
+def _links(destination, departure_date, return_date):
+    return {
+        "flightDates": f"{AMADEUS_URL}/v1/shopping/flight-dates?origin=LON&destination={destination}"
+                       f"&departureDate={departure_date}&oneWay=false&duration=1,15&nonStop=false&viewBy=DURATION",
+        "flightOffers": f"{AMADEUS_URL}/v2/shopping/flight-offers?originLocationCode=LON"
+                        f"&destinationLocationCode={destination}&departureDate={departure_date}"
+                        f"&returnDate={return_date}&adults=1&nonStop=false",
+    }
+
+
+def synthetic_feed(scale, seed=0, source_path=FLIGHT_DATA_PATH, airport_db_path=AIRPORT_DB_PATH):
+    """
+    Return a feed dict holding the source entries plus scale - 1 synthetic copies of each.
+    """
+    with open(source_path, "r", encoding="utf-8") as file:
+        source = json.load(file)
+    entries = source.get("data") or []
+    if scale <= 1:
+        return source
+
+    rng = random.Random(seed)
+    known = {entry["destination"] for entry in entries}
+    # Original destinations first, then other airports with coordinates, in a fixed order
+    airports = sorted(info.iata for info in read_airport_db(airport_db_path)
+                      if info.latitude is not None and info.iata not in known)
+    pool = sorted(known) + airports[:len(known) * (scale - 1)]
+
+    data = list(entries)
+    for copy in range(1, scale):
+        for i, entry in enumerate(entries):
+            destination = pool[(i * scale + copy) % len(pool)]
+            departure = date.fromisoformat(entry["departureDate"])
+            trip_days = (date.fromisoformat(entry["returnDate"]) - departure).days
+            return_date = (departure + timedelta(days=max(1, trip_days + rng.randint(-2, 2)))).isoformat()
+            price = float(entry["price"]["total"]) * rng.uniform(0.7, 1.5)
+            data.append({
+                "type": entry.get("type", "flight-destination"),
+                "origin": entry["origin"],
+                "destination": destination,
+                "departureDate": entry["departureDate"],
+                "returnDate": return_date,
+                "price": {"total": f"{price:.2f}"},
+                "links": _links(destination, entry["departureDate"], return_date),
+            })
+    return {**source, "data": data}
+
+
+def write_synthetic_feed(path, scale, seed=0):
+    """
+    Write a synthetic feed at the given scale to path and return its number of entries.
+    """
+    feed = synthetic_feed(scale, seed)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(feed, file)
+    return len(feed["data"])
@@ -0,0 +1,150 @@
+"""
+Flight Track API - Fake Climate Server
+
+This module runs a local HTTP server that answers Open-Meteo climate requests with
+deterministic data in the API's FlatBuffers wire format, so the weather endpoints can be
+benchmarked without network access and with a controlled upstream latency.
+
+Key Features:
+- Multi-location requests (repeated or comma-separated latitude/longitude)
+- Values seeded from the coordinates and day, identical on every run
+- Configurable per-request latency standing in for the real round trip
+- Request and location counters for checking upstream fan-out
+
+Core Classes:
+- FakeClimateServer: Threaded local server, usable as a context manager
+"""
+
+import threading
+import time
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import flatbuffers
+import numpy as np
+
+# Plausible daily ranges for temperature_2m_mean, cloud_cover_mean, shortwave_radiation_sum,
+# rain_sum and snowfall_sum, in DAILY_VARIABLES order; extra variables get the last range
+VARIABLE_RANGES = ((-5.0, 32.0), (0.0, 100.0), (1.0, 30.0), (0.0, 6.0), (0.0, 0.4))
+
+SECONDS_PER_DAY = 86400
+
+
+def _values(latitude, longitude, start, days, variable_count):
+    seed = int(round(latitude * 100)) * 100003 + int(round(longitude * 100)) + start.toordinal() * 7919
+    rng = np.random.default_rng(abs(seed))
+    return [rng.uniform(*VARIABLE_RANGES[min(i, len(VARIABLE_RANGES) - 1)], days).astype(np.float32)
+            for i in range(variable_count)]
+
+
+def encode_response(latitude, longitude, start, days, variable_count) -> bytes:
+    """
+    Encode one location's daily series as a size-prefixed WeatherApiResponse message.
+    """
+    builder = flatbuffers.Builder(64 + days * variable_count * 4)
+    variables = []
+    for i, values in enumerate(_values(latitude, longitude, start, days, variable_count)):
+        vector = builder.CreateNumpyVector(values)
+        builder.StartObject(4)
+        builder.PrependUOffsetTRelativeSlot(3, vector, 0)
+        builder.PrependUint8Slot(0, i, 0)
+        variables.append(builder.EndObject())
+
+    builder.StartVector(4, len(variables), 4)
+    for variable in reversed(variables):
+        builder.PrependUOffsetTRelative(variable)
+    vector = builder.EndVector()
+
+    begin = int(datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp())
+    builder.StartObject(4)
+    builder.PrependUOffsetTRelativeSlot(3, vector, 0)
+    builder.PrependInt64Slot(0, begin, 0)
+    builder.PrependInt64Slot(1, begin + days * SECONDS_PER_DAY, 0)
+    builder.PrependInt32Slot(2, SECONDS_PER_DAY, 0)
+    daily = builder.EndObject()
+
+    builder.StartObject(11)
+    builder.PrependFloat32Slot(0, latitude, 0.0)
+    builder.PrependFloat32Slot(1, longitude, 0.0)
+    builder.PrependUOffsetTRelativeSlot(10, daily, 0)
+    builder.Finish(builder.EndObject())
+
+    message = bytes(builder.Output())
+    return len(message).to_bytes(4, "little") + message
+
+
+def _floats(values):
+    return [float(part) for value in values for part in value.split(",") if part]
+
+
+class FakeClimateServer:
+    """
+    Local stand-in for the Open-Meteo climate API on 127.0.0.1 and an ephemeral port.
+    """
+
+    def __init__(self, latency_ms=0.0):
+        self.latency = latency_ms / 1000
+        self.requests = 0
+        self.locations = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/climate"
+
+    def _handle(self, query):
+        params = parse_qs(query)
+        latitudes, longitudes = _floats(params["latitude"]), _floats(params["longitude"])
+        start = date.fromisoformat(params["start_date"][0])
+        days = (date.fromisoformat(params["end_date"][0]) - start).days + 1
+        variable_count = len([name for value in params.get("daily", []) for name in value.split(",") if name])
+        with self._lock:
+            self.requests += 1
+            self.locations += len(latitudes)
+        return b"".join(encode_response(latitude, longitude, start, days, variable_count)
+                        for latitude, longitude in zip(latitudes, longitudes))
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if fake.latency:
+                    time.sleep(fake.latency)
+                try:
+                    body, status = fake._handle(urlsplit(self.path).query), 200
+                except (KeyError, ValueError):
+                    body, status = b'{"error": true, "reason": "Invalid request"}', 400
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream" if status == 200 else "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,388 @@
+"""
+Flight Track API - Benchmark Runner
+
+This module drives every endpoint of the flight router through the ASGI app in-process,
+against synthetic flight datasets and a local fake climate server, and writes the
+results as JSON so runs can be compared across commits.
+
+For each dataset scale the runner:
+- writes the synthetic feed and points the flight store at it
+- points the weather service at a FakeClimateServer and an empty climate cache
+- times every scenario in isolation (cold first request, then warm requests)
+- measures each scenario's peak Python allocation with tracemalloc in a separate pass
+- replays a weighted mix of PCP, Globe and search sessions
+
+Usage:
+    python -m benchmarks.run --scales 1 10 100 --output before.json
+    python -m benchmarks.run --scales 1 --compare before.json
+
+Core Functions:
+- run_scale: Benchmark every scenario and the session mix at one dataset scale
+- compare: Print p50/p99/throughput changes against an earlier results file
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta, timezone
+from statistics import quantiles
+from typing import Callable, NamedTuple
+
+from fastapi.testclient import TestClient
+
+from app import flight_service, weather_service
+from app.climate_cache import ClimateCache
+from app.flight_store import FlightStore
+from app.metrics import metrics
+from app.weather_governor import WeatherGovernor
+from main import app
+
+from .datasets import write_synthetic_feed
+from .fake_climate import FakeClimateServer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+class Scenario(NamedTuple):
+    """
+    A named request shape against one endpoint; path builds a request path from (rng, context).
+    """
+    name: str
+    endpoint: str
+    path: Callable
+
+
+class Context(NamedTuple):
+    """
+    Sample values drawn from the loaded data for building request paths.
+    """
+    departure_dates: list
+    destinations: list
+    passports: list
+    country_codes: list
+
+
+def _passports(rng, context):
+    return ",".join(rng.sample(context.passports, rng.randint(1, 3)))
+
+
+def _return_date(departure_date, days):
+    return (date.fromisoformat(departure_date) + timedelta(days=days)).isoformat()
+
+
+SCENARIOS = [
+    Scenario("flights.list", "GET /api/flights/forlondon",
+             lambda rng, c: "/api/flights/forlondon"),
+    Scenario("flights.list.page", "GET /api/flights/forlondon",
+             lambda rng, c: "/api/flights/forlondon?limit=100"),
+    Scenario("flights.list.filtered", "GET /api/flights/forlondon",
+             lambda rng, c: f"/api/flights/forlondon?destination={rng.choice(c.destinations)}"),
+    Scenario("flights.list.ndjson", "GET /api/flights/forlondon",
+             lambda rng, c: f"/api/flights/forlondon?format=ndjson&departure_date={rng.choice(c.departure_dates)}"),
+    Scenario("flights.search", "GET /api/flights/search",
+             lambda rng, c: f"/api/flights/search?max_price={rng.randint(50, 400)}&min_days={rng.randint(1, 4)}"
+                            f"&departure_from={rng.choice(c.departure_dates)}&limit=50"),
+    Scenario("flights.search.by_destination", "GET /api/flights/search",
+             lambda rng, c: f"/api/flights/search?group_by=destination&max_price={rng.randint(100, 600)}&limit=100"),
+    Scenario("advisory", "GET /api/advisory/{country_code}",
+             lambda rng, c: f"/api/advisory/{rng.choice(c.country_codes)}"),
+    Scenario("advisories", "GET /api/advisories",
+             lambda rng, c: "/api/advisories"),
+    Scenario("visa", "GET /api/visa",
+             lambda rng, c: f"/api/visa?country_codes={_passports(rng, c)}"),
+    Scenario("pcpvisa", "GET /api/pcpvisa",
+             lambda rng, c: f"/api/pcpvisa?country_codes={_passports(rng, c)}"
+                            f"&departure_date={rng.choice(c.departure_dates)}"),
+    Scenario("travel_advisory", "GET /api/destinations/travel-advisory",
+             lambda rng, c: "/api/destinations/travel-advisory"),
+    Scenario("airports.nearest", "GET /api/airports/nearest",
+             lambda rng, c: f"/api/airports/nearest?lat={rng.uniform(-60, 70):.3f}&lon={rng.uniform(-180, 180):.3f}"
+                            f"&k={rng.choice((1, 5, 20))}"),
+    Scenario("destinations.nearby", "GET /api/destinations/nearby",
+             lambda rng, c: f"/api/destinations/nearby?iata={rng.choice(c.destinations)}"
+                            f"&radius_km={rng.choice((500, 2000, 5000))}"),
+    Scenario("destinations.regions", "GET /api/destinations/regions",
+             lambda rng, c: f"/api/destinations/regions?cell_degrees={rng.choice((5, 10, 20))}"),
+    Scenario("routes", "GET /api/routes",
+             lambda rng, c: rng.choice(("/api/routes", f"/api/routes?destination={rng.choice(c.destinations)}"))),
+    Scenario("calendar", "GET /api/calendar",
+             lambda rng, c: (lambda day: f"/api/calendar?start_date={day}&end_date={_return_date(day, 30)}")(
+                 rng.choice(c.departure_dates))),
+    Scenario("weather", "GET /api/weather/{iata_code}",
+             lambda rng, c: (lambda day: f"/api/weather/{rng.choice(c.destinations)}?departure_date={day}"
+                                         f"&return_date={_return_date(day, rng.randint(2, 7))}")(
+                 rng.choice(c.departure_dates))),
+    Scenario("neooneweather", "GET /api/neooneweather",
+             lambda rng, c: f"/api/neooneweather?departure_date={rng.choice(c.departure_dates)}"),
+    Scenario("pcp", "GET /api/pcp",
+             lambda rng, c: f"/api/pcp?departure_date={rng.choice(c.departure_dates)}&passports={_passports(rng, c)}"),
+    Scenario("dashboard", "GET /api/dashboard",
+             lambda rng, c: f"/api/dashboard?departure_date={rng.choice(c.departure_dates)}"
+                            f"&passports={_passports(rng, c)}"),
+]
+SCENARIOS_BY_NAME = {scenario.name: scenario for scenario in SCENARIOS}
+
+
+def _pcp_session(rng, context):
+    # PCP view: pick passports and a date, then change the date once; the weather card follows
+    passports = _passports(rng, context)
+    first, second = rng.sample(context.departure_dates, 2)
+    return [
+        ("dashboard", f"/api/dashboard?departure_date={first}&passports={passports}"),
+        ("neooneweather", f"/api/neooneweather?departure_date={first}"),
+        ("dashboard", f"/api/dashboard?departure_date={second}&passports={passports}"),
+        ("neooneweather", f"/api/neooneweather?departure_date={second}"),
+    ]
+
+
+def _globe_session(rng, context):
+    # Globe view: every advisory once, then a few countries looked at individually
+    return [("advisories", "/api/advisories")] + [
+        ("advisory", f"/api/advisory/{code}") for code in rng.sample(context.country_codes, 3)
+    ]
+
+
+def _search_session(rng, context):
+    return [(name, SCENARIOS_BY_NAME[name].path(rng, context))
+            for name in ("flights.search", "flights.search.by_destination", "flights.list.filtered",
+                         "flights.list.page")]
+
+
+SESSIONS = [(_pcp_session, 5), (_globe_session, 3), (_search_session, 2)]
+
+
+def _summary(latencies_ms, elapsed_s):
+    ordered = sorted(latencies_ms)
+    cuts = quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else ordered * 99
+    return {
+        "requests": len(ordered),
+        "throughput_rps": round(len(ordered) / elapsed_s, 1) if elapsed_s else None,
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "p50_ms": round(cuts[49], 3),
+        "p99_ms": round(cuts[98], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def _request(client, path):
+    start = time.perf_counter()
+    response = client.get(path)
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {path} returned {response.status_code}: {response.text[:200]}")
+    return elapsed, len(response.content)
+
+
+def _peak_allocation(client, paths):
+    peak = 0
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for path in paths:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            client.get(path)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _context():
+    snapshot = flight_service.get_flight_snapshot()
+    advisories = flight_service.load_advisory_table()
+    return Context(
+        departure_dates=list(snapshot.departure_dates),
+        destinations=sorted(snapshot.by_destination),
+        passports=sorted(flight_service.load_visa_matrix().passport_index),
+        country_codes=sorted(advisories.subset()),
+    )
+
+
+def benchmark_scenario(client, scenario, context, args, rng):
+    cold_ms, _ = _request(client, scenario.path(rng, context))
+    for _ in range(args.warmup):
+        _request(client, scenario.path(rng, context))
+
+    latencies, sizes = [], []
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        elapsed, size = _request(client, scenario.path(rng, context))
+        latencies.append(elapsed)
+        sizes.append(size)
+    result = _summary(latencies, time.perf_counter() - start)
+
+    paths = [scenario.path(rng, context) for _ in range(args.memory_requests)]
+    result.update(
+        endpoint=scenario.endpoint,
+        cold_ms=round(cold_ms, 3),
+        mean_response_bytes=round(sum(sizes) / len(sizes)),
+        peak_alloc_kb=round(_peak_allocation(client, paths) / 1024, 1),
+    )
+    return result
+
+
+def benchmark_mix(client, context, args, rng):
+    builders, weights = zip(*SESSIONS)
+    by_scenario = {}
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(args.sessions):
+        for name, path in rng.choices(builders, weights)[0](rng, context):
+            elapsed, _ = _request(client, path)
+            latencies.append(elapsed)
+            by_scenario.setdefault(name, []).append(elapsed)
+    result = _summary(latencies, time.perf_counter() - start)
+    result["sessions"] = args.sessions
+    result["scenarios"] = {name: _summary(values, sum(values) / 1000) for name, values in sorted(by_scenario.items())}
+    return result
+
+
+def run_scale(scale, args, workdir):
+    """
+    Benchmark every selected scenario and the session mix against a feed of the given scale.
+    """
+    data_path = os.path.join(workdir, f"flights-{scale}x.json")
+    records = write_synthetic_feed(data_path, scale, seed=args.seed)
+    rng = random.Random(args.seed)
+
+    with ExitStack() as stack:
+        server = stack.enter_context(FakeClimateServer(latency_ms=args.upstream_latency_ms))
+        saved = (flight_service.flight_store, weather_service.CLIMATE_URL, weather_service.climate_cache,
+                 weather_service.weather_client.governor)
+        stack.callback(_restore, *saved)
+        # The fake upstream has no rate limit: keep the admission path but never throttle or shed
+        weather_service.weather_client.governor = WeatherGovernor(rate_per_second=1e9, burst=1e9, max_pending=1 << 30)
+        flight_service.flight_store = FlightStore(data_path)
+        weather_service.CLIMATE_URL = server.url
+        weather_service.climate_cache = ClimateCache(os.path.join(workdir, f"climate-{scale}x"),
+                                                     len(weather_service.DAILY_VARIABLES))
+        metrics.reset()
+
+        load_start = time.perf_counter()
+        client = stack.enter_context(TestClient(app))
+        load_ms = (time.perf_counter() - load_start) * 1000
+        context = _context()
+
+        scenarios = {}
+        for scenario in SCENARIOS:
+            if args.only and scenario.name not in args.only:
+                continue
+            print(f"  {scale}x {scenario.name}", file=sys.stderr)
+            scenarios[scenario.name] = benchmark_scenario(client, scenario, context, args, rng)
+
+        mix = benchmark_mix(client, context, args, rng) if args.sessions and not args.only else None
+        snapshot = metrics.snapshot()
+
+    result = {
+        "records": records,
+        "startup_ms": round(load_ms, 1),
+        "scenarios": scenarios,
+        "mix": mix,
+        "upstream": {"requests": server.requests, "locations": server.locations},
+        "counters": snapshot["counters"],
+        "cache_hit_ratios": snapshot["cache_hit_ratios"],
+    }
+    if resource is not None:
+        # High-water mark of the whole process so far, so it never decreases across scales
+        per_mb = 1024 * 1024 if sys.platform == "darwin" else 1024
+        result["process_peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / per_mb, 1)
+    return result
+
+
+def _restore(flight_store, climate_url, climate_cache, governor):
+    flight_service.flight_store = flight_store
+    weather_service.CLIMATE_URL = climate_url
+    weather_service.climate_cache = climate_cache
+    weather_service.weather_client.governor = governor
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current):
+    """
+    Print per-scenario p50, p99 and throughput of current relative to previous.
+    """
+    print(f"{'scale':>6} {'scenario':<32} {'p50 ms':>18} {'p99 ms':>18} {'req/s':>18}")
+    for scale, results in current["scales"].items():
+        before = previous.get("scales", {}).get(scale)
+        if before is None:
+            continue
+        rows = dict(results["scenarios"])
+        if results.get("mix") and before.get("mix"):
+            rows["(mix)"] = results["mix"]
+        for name, row in rows.items():
+            old = before["mix"] if name == "(mix)" else before["scenarios"].get(name)
+            if old is None:
+                continue
+            cells = []
+            for key in ("p50_ms", "p99_ms", "throughput_rps"):
+                change = f"{(row[key] / old[key] - 1) * 100:+.0f}%" if old[key] else "n/a"
+                cells.append(f"{row[key]:>10} {change:>7}")
+            print(f"{scale + 'x':>6} {name:<32} {' '.join(cells)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every API endpoint in-process.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100],
+                        help="Dataset sizes as multiples of Lon-other.json")
+    parser.add_argument("--requests", type=int, default=50, help="Timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed requests per scenario after the cold one")
+    parser.add_argument("--memory-requests", type=int, default=5, help="Requests per scenario traced for memory")
+    parser.add_argument("--sessions", type=int, default=100, help="Sessions replayed in the request mix (0 to skip)")
+    parser.add_argument("--upstream-latency-ms", type=float, default=50.0,
+                        help="Latency the fake climate server adds to every request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS_BY_NAME), help="Run only these scenarios")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<git revision>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    revision = _git_revision()
+    results = {
+        "meta": {
+            "revision": revision,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "arguments": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="flight-track-bench-") as workdir:
+        for scale in args.scales:
+            results["scales"][str(scale)] = run_scale(scale, args, workdir)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{revision or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            compare(json.load(file), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Flight Track API - Startup Benchmark
+
+This module measures cold start in fresh interpreters: the time to import the app and the
+time until it is ready to serve (import plus preload of every reference dataset). It exits
+with status 1 when the median import time is above the target, so it can gate CI.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --target-ms 600 --profile
+
+Core Functions:
+- measure: Import and ready times of one fresh interpreter
+- slowest_imports: Modules with the largest cumulative import time
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importing main, FastAPI included; FastAPI and pydantic alone account for most of it
+IMPORT_TARGET_MS = 750
+
+_PROBE = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from app.flight_service import preload
+preload()
+ready = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "ready_ms": (ready - start) * 1000}))
+"""
+
+
+def measure():
+    """
+    Return {"import_ms", "ready_ms"} measured in a new interpreter started in the backend folder.
+    """
+    output = subprocess.run([sys.executable, "-c", _PROBE], cwd=BACKEND_DIR, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(limit=15):
+    """
+    Return (module, cumulative ms) for the slowest imports of main, from python -X importtime.
+    """
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=BACKEND_DIR,
+                            capture_output=True, text=True, check=True).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules.append((name.strip(), int(cumulative) / 1000))
+    return sorted(modules, key=lambda module: module[1], reverse=True)[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure API cold-start time in fresh interpreters.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=IMPORT_TARGET_MS,
+                        help="Fail when the median import time is above this")
+    parser.add_argument("--profile", action="store_true", help="Also list the slowest imports")
+    args = parser.parse_args(argv)
+
+    runs = [measure() for _ in range(args.runs)]
+    import_ms = median(run["import_ms"] for run in runs)
+    ready_ms = median(run["ready_ms"] for run in runs)
+    print(f"import: {import_ms:.0f} ms (target {args.target_ms:.0f} ms), ready: {ready_ms:.0f} ms, "
+          f"median of {args.runs}")
+
+    if args.profile:
+        for name, ms in slowest_imports():
+            print(f"  {ms:8.1f} ms  {name}")
+
+    return 0 if import_ms <= args.target_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,20 +7,90 @@ communication, and configures the API routes.
 
 Key Components:
 - FastAPI application initialization
+- Startup preloading of the flight store, airport resolver, visa and advisory tables
+- Background polling of data/feeds for new flight feeds, applied without a restart
+- Background materialization of the PCP cube, including climate series it is missing
+- Under serve.py only one worker runs those jobs; the others follow the feeds it applied
+  and the climate tiles it wrote (see BACKGROUND_JOBS_ENV)
 - CORS middleware configuration for frontend integration
 - API route registration for flight data and weather information
 - Root endpoint for API health check
+- Request metrics middleware and /metrics endpoint; ?profile=1 adds a Server-Timing breakdown
 
 The application exposes RESTful api endpoints under the '/api' prefix for flight
 tracking and weather advisory data operations.
 """
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from app.flight_controller import router as flight_router
+from app.flight_service import fill_pcp_climate, ingest_feeds, pcp_cube, preload, refresh_pcp_cube
+from app import weather_service
+from app.weather_service import close_weather_client
+from app.metrics import MetricsMiddleware, metrics
 from fastapi.middleware.cors import CORSMiddleware
 
 
+FEED_POLL_SECONDS = 60
+PCP_REFRESH_SECONDS = 300
+# "0" in worker processes that leave feed polling and climate fills to another worker
+BACKGROUND_JOBS_ENV = "FLIGHT_TRACK_BACKGROUND_JOBS"
+
+
+async def poll_feeds(interval):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(ingest_feeds)
+        except Exception as e:
+            print(f"Feed ingestion failed: {e}")
+
+
+async def materialize_pcp(interval):
+    while True:
+        try:
+            await asyncio.to_thread(refresh_pcp_cube)
+            for departure_date in pcp_cube.dates():
+                await fill_pcp_climate(departure_date)
+        except Exception as e:
+            print(f"PCP materialization failed: {e}")
+        await asyncio.sleep(interval)
+
+
+async def follow_background_jobs(interval):
+    """
+    In workers without the background jobs: apply the feeds the polling worker applied and
+    pick up the climate tiles it wrote, without scanning feeds or calling Open-Meteo.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(ingest_feeds, True)
+            if weather_service.climate_cache.sync():
+                await asyncio.to_thread(refresh_pcp_cube)
+        except Exception as e:
+            print(f"Following background jobs failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build reference data once per process instead of on the first request; a no-op in
+    # workers forked by serve.py, which inherit it already built
+    preload()
+    if os.environ.get(BACKGROUND_JOBS_ENV, "1") != "0":
+        tasks = [asyncio.create_task(poll_feeds(FEED_POLL_SECONDS)),
+                 asyncio.create_task(materialize_pcp(PCP_REFRESH_SECONDS))]
+    else:
+        tasks = [asyncio.create_task(follow_background_jobs(FEED_POLL_SECONDS))]
+    yield
+    for task in tasks:
+        task.cancel()
+    await close_weather_client()
+
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Include the flight router
 app.include_router(flight_router, prefix="/api")
@@ -31,6 +101,15 @@ async def root():
     return {"message": "Welcome to the Flight Data and Weather API!"}
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Per-endpoint latency histograms, stage timings, cache hit ratios and upstream call counts
+    for this worker process.
+    """
+    return metrics.snapshot()
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -42,4 +121,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-)
\ No newline at end of file
+    expose_headers=["ETag", "X-Next-Cursor", "Server-Timing"],
+)
+
+# Outermost, so the recorded latency covers CORS handling as well
+app.add_middleware(MetricsMiddleware)
\ No newline at end of file
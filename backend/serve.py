@@ -0,0 +1,166 @@
+"""
+Flight Track API - Production Serving Entry Point
+
+This module runs the API with several uvicorn workers that share one preloaded copy of
+the reference data. The master process imports the app, builds the flight store, airport
+resolver, visa matrix and advisory table, freezes them out of the garbage collector and
+only then forks. Workers therefore share those pages copy-on-write instead of each
+building its own copy; NumPy buffers in particular are never written and stay shared
+for the life of the worker.
+
+Background jobs (feed polling, PCP climate fills) run in one designated worker only; the
+others follow the feeds it applied and the climate tiles it wrote. When the designated
+worker dies, its replacement takes the role over. The Open-Meteo rate limit is enforced per
+process, so every worker gets an equal share of it.
+
+Usage:
+    python serve.py --workers 4 --port 8001
+    python serve.py --workers 1 --no-preload
+
+Platforms without os.fork (Windows) fall back to uvicorn's own multi-process mode,
+where each worker loads its own data and runs its own background jobs.
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+# A worker that exits within QUICK_EXIT_SECONDS of starting counts as a failed start.
+# Replacements after consecutive failed starts are delayed exponentially, and the master
+# gives up after MAX_QUICK_EXITS in a row instead of forking in a tight loop
+QUICK_EXIT_SECONDS = 5.0
+RESPAWN_BACKOFF_SECONDS = 0.5
+RESPAWN_MAX_BACKOFF_SECONDS = 10.0
+MAX_QUICK_EXITS = 8
+
+
+def _bind(host, port):
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock, args, background):
+    # Children must not run the master's signal handlers
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    from main import BACKGROUND_JOBS_ENV
+    os.environ[BACKGROUND_JOBS_ENV] = "1" if background else "0"
+    config = uvicorn.Config(app, log_level=args.log_level, timeout_keep_alive=args.keep_alive)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(app, sock, args, background=False):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _run_worker(app, sock, args, background)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def serve_forked(app, args):
+    """
+    Bind once, fork args.workers children over the shared socket and restart any that die,
+    backing off when they keep dying at startup.
+    """
+    sock = _bind(args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} workers (master pid {os.getpid()})")
+
+    background = _spawn(app, sock, args, background=True)
+    workers = {pid: time.monotonic() for pid in
+               [background] + [_spawn(app, sock, args) for _ in range(args.workers - 1)]}
+    stopping = False
+    quick_exits = 0
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while workers:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = workers.pop(pid, None)
+        if stopping or started is None:
+            continue
+        quick_exits = quick_exits + 1 if time.monotonic() - started < QUICK_EXIT_SECONDS else 0
+        if quick_exits >= MAX_QUICK_EXITS:
+            print(f"Workers failed to start {quick_exits} times in a row, shutting down")
+            stop(None, None)
+            continue
+        delay = 0
+        if quick_exits:
+            delay = min(RESPAWN_BACKOFF_SECONDS * 2 ** (quick_exits - 1), RESPAWN_MAX_BACKOFF_SECONDS)
+        print(f"Worker {pid} exited, starting a replacement" + (f" in {delay:.1f}s" if delay else ""))
+        deadline = time.monotonic() + delay
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(min(0.1, delay))
+        if stopping:
+            continue
+        replacement = _spawn(app, sock, args, background=pid == background)
+        if pid == background:
+            background = replacement
+        workers[replacement] = time.monotonic()
+    sock.close()
+    if quick_exits >= MAX_QUICK_EXITS:
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Flight Track API with preloaded, shared data.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8001)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        help="Let each worker load reference data itself on startup")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--keep-alive", type=int, default=5, help="Keep-alive timeout in seconds")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # Read when app.weather_service is imported: each worker takes its share of the Open-Meteo budget
+    os.environ["FLIGHT_TRACK_WORKERS"] = str(max(args.workers, 1))
+    from main import app
+
+    if args.preload:
+        from app.flight_service import preload
+        preload()
+        # Keep the collector from touching (and so un-sharing) the preloaded objects in workers
+        gc.collect()
+        gc.freeze()
+
+    if args.workers <= 1:
+        uvicorn.run(app, host=args.host, port=args.port, log_level=args.log_level,
+                    timeout_keep_alive=args.keep_alive)
+    elif hasattr(os, "fork"):
+        serve_forked(app, args)
+    else:
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers,
+                    log_level=args.log_level, timeout_keep_alive=args.keep_alive)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from datetime import date
+
+from app.flight_search import FlightColumns
+from app.flight_store import FlightRecord, FlightSnapshot
+
+
+def _record(destination, price):
+    return FlightRecord("flight-destination", "MAD", destination, "2025-03-01", "2025-03-08", price,
+                        None, None, 7)
+
+
+def _columns():
+    records = [_record("PAR", "120.50"), _record("ROM", "n/a"), _record("LON", "80.00"), _record("BER", None)]
+    return FlightColumns(FlightSnapshot(records, 1))
+
+
+def _positions(columns, rows):
+    return [columns.position[row] for row in rows.tolist()]
+
+
+def test_unfiltered_search_keeps_unparsable_prices():
+    columns = _columns()
+    assert len(columns.search()) == 4
+
+
+def test_min_price_alone_skips_unparsable_prices():
+    columns = _columns()
+    assert _positions(columns, columns.search(min_price=50)) == [2, 0]
+    assert _positions(columns, columns.search(min_price=100)) == [0]
+    assert len(columns.search(min_price=1000)) == 0
+
+
+def test_cheapest_per_destination_with_min_price_skips_unparsable_prices():
+    columns = _columns()
+    rows = columns.search(min_price=0, departure_from=date(2025, 3, 1))
+    assert columns.cheapest_per_destination(rows).tolist() == [2, 0]
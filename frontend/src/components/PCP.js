@@ -57,8 +57,9 @@ const ParallelCoordinates = ( {onFilterChange, passportIsoCode, departureDate} )
     useEffect(() => {
         const fetchSourceCountry = async () => {
             try {
-                const response = await fetch(`${API_URL}/api/flights/forlondon?departure_date=${departureDate}`);
-                const result = await response.json();
+                const response = await fetch(`${API_URL}/api/dashboard?departure_date=${departureDate}&passports=${passportIsoCode.join(',')}`);
+                const dashboard = await response.json();
+                const result = dashboard.flights;
                 setOriginalFlightData(result);
                 
                 const isoCodes = result.map(item => item.destination_info.iso_code);
@@ -66,8 +67,7 @@ const ParallelCoordinates = ( {onFilterChange, passportIsoCode, departureDate} )
                 const departureDates = result.map(item => item.departureDate);
                 const returnDates = result.map(item => item.returnDate);
 
-                const weatherResponse = await fetch(`${API_URL}/api/neooneweather?departure_date=${departureDate}`);
-                const allWeatherData = await weatherResponse.json();
+                const allWeatherData = dashboard.weather;
                 
                 const weatherData = iataCodes.map(iataCode => {
                 const destinationWeather = allWeatherData.destinations[iataCode];
@@ -86,8 +86,7 @@ const ParallelCoordinates = ( {onFilterChange, passportIsoCode, departureDate} )
                 };
             });
 
-                const advisoryResponse = await fetch(`${API_URL}/api/destinations/travel-advisory/`);
-                const advisoryData = await advisoryResponse.json();
+                const advisoryData = dashboard.advisories;
 
                 const advisoryInfo = iataCodes.map(iataCode => {
                     if (!advisoryData.advisories || !advisoryData.advisories[iataCode]) {
@@ -104,8 +103,7 @@ const ParallelCoordinates = ( {onFilterChange, passportIsoCode, departureDate} )
                 });
 
 
-                const visaResponse = await fetch(`${API_URL}/api/pcpvisa?country_codes=${passportIsoCode.join(',')}&departure_date=${departureDate}`);
-                const allVisaData = await visaResponse.json();
+                const allVisaData = dashboard.visa;
 
                 const visaData = iataCodes.map(iataCode => {
                     const destinationRequirements = allVisaData.destination_requirements[iataCode] || {};
@@ -61,14 +61,14 @@ const ColorLegend = ({ colorScheme }) => {
   );
 };
 
-const fetchAdvisory = async (country_code) => {
+const fetchAdvisories = async () => {
   try {
-    const response = await fetch(`${API_URL}/api/advisory/${country_code}`);
+    const response = await fetch(`${API_URL}/api/advisories`);
     if (!response.ok) throw new Error("Network response was not ok");
     const data = await response.json();
-    return data;
+    return data.advisories;
   } catch (error) {
-    console.error(`Fetching advisory for ${country_code} failed:`, error);
+    console.error("Fetching advisories failed:", error);
     return null;
   }
 };
@@ -267,13 +267,10 @@ const GlobeGL = ({ data = [], onSelectedDestination, selectedDestination }) => {
       try {
         if (countries.length > 0) {
           const countryCodes = countries.map((d) => d.id);
-          const advisoryPromises = countryCodes.map(async (code) => {
-            const data = await fetchAdvisory(code);
-            return { code, data };
-          });
-          const advisoryResults = await Promise.all(advisoryPromises);
+          const advisories = (await fetchAdvisories()) || {};
           const advisoryMap = {};
-          advisoryResults.forEach(({ code, data }) => {
+          countryCodes.forEach((code) => {
+            const data = code && advisories[code.toLowerCase()];
             if (data) {
               advisoryMap[code] = data;
             }